@@ -0,0 +1,62 @@
+"""Compare the serialization of request bodies.
+
+Time, per request body, the old path of ``get_*_params``, dumping to JSON,
+loading it back and letting requests dump it again, with
+:meth:`~decanter.core.core_api.body_obj.CoreBodyObj.to_wire` on each
+backend.
+
+Usage::
+
+    python benchmarks/bench_wire.py [--columns 200] [--number 2000]
+"""
+import argparse
+import json
+import timeit
+
+from decanter.core.core_api import CoreBody
+from decanter.core.core_api import body_obj
+
+
+def make_setup_body(columns):
+    """Build a setup body with columns data columns."""
+    return CoreBody.SetupBody.create(
+        data_source=CoreBody.Accessor.create(uri="/data/train.csv", format="csv"),
+        data_columns=[
+            CoreBody.Column.create(id="col_%d" % i, data_type="numerical")
+            for i in range(columns)
+        ],
+        data_id="5e2cb9d8f7a9a4ab2c6a1d1f",
+    )
+
+
+def params_path(body):
+    """Today's path: dumps, loads, then requests dumps it again."""
+    params = json.loads(json.dumps(body.jsonable(), cls=CoreBody.ComplexEncoder))
+    return json.dumps(params).encode("utf-8")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--columns", type=int, default=200)
+    parser.add_argument("--number", type=int, default=2000)
+    args = parser.parse_args()
+
+    body = make_setup_body(args.columns)
+    cases = [("dumps -> loads -> dumps", lambda: params_path(body))]
+    cases.append(("to_wire(json)", lambda: body.to_wire(backend="json")))
+    if body_obj.orjson is not None:
+        cases.append(("to_wire(orjson)", lambda: body.to_wire(backend="orjson")))
+
+    print("%d columns, %d bodies each" % (args.columns, args.number))
+    baseline = None
+    for name, func in cases:
+        seconds = min(timeit.repeat(func, number=args.number, repeat=3))
+        baseline = baseline or seconds
+        print(
+            "%-24s %8.1f us/body  %5.1fx"
+            % (name, seconds / args.number * 1e6, baseline / seconds)
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -13,7 +13,24 @@ requires = [
     "numpy>=1.21.0",
 ]
 
-dev_requirements = ["twine", "tox", "pytest", "responses", "flake8", "pylint-quotes"]
+async_requirements = ["aiohttp>=3.7.4"]
+zstd_requirements = ["zstandard>=0.15"]
+parquet_requirements = ["pyarrow"]
+orjson_requirements = ["orjson>=3.6"]
+
+dev_requirements = [
+    "twine",
+    "tox",
+    "pytest",
+    "responses",
+    "flake8",
+    "pylint-quotes",
+] + (
+    async_requirements
+    + zstd_requirements
+    + parquet_requirements
+    + orjson_requirements
+)
 
 setuptools.setup(
     name="decanter-ai-core-sdk",
@@ -28,7 +45,13 @@ setuptools.setup(
     packages=setuptools.find_packages(where="src"),
     package_dir={"": "src"},
     install_requires=requires,
-    extras_require={"dev": dev_requirements},
+    extras_require={
+        "dev": dev_requirements,
+        "async": async_requirements,
+        "zstd": zstd_requirements,
+        "parquet": parquet_requirements,
+        "orjson": orjson_requirements,
+    },
     test_suite="tests",
     classifiers=[
         "Programming Language :: Python :: 3",
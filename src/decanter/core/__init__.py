@@ -9,6 +9,7 @@ import sys
 
 from .context import Context
 from .client import CoreClient
+from .leaderboard import Leaderboard, LeaderboardIndex
 from .plot import show_model_attr
 
 core_logger = logging.getLogger(__name__)
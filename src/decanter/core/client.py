@@ -1,11 +1,17 @@
 # pylint: disable=too-many-arguments
 """Function for user handle the use of Decanter Core API."""
-import io
+import asyncio
+import datetime
 import logging
+from functools import partial
 
+import numpy as np
 import pandas as pd
 
 from decanter.core import Context
+from decanter.core.context import contextmethod, state_of
+from decanter.core.core_api.api import MULTIPART_PART_SIZE
+from decanter.core.core_api.predict_input import PredictTemplate
 from decanter.core.jobs import (
     DataUpload,
     DataSetup,
@@ -14,12 +20,20 @@ from decanter.core.jobs import (
     ExperimentCluster,
     PredictResult,
     PredictTSResult,
+    RateLimiter,
 )
 from decanter.core.enums.evaluators import Evaluator
 from decanter.core.enums import check_is_enum
+from decanter.core.extra.micro_batch import MicroBatcher
+from decanter.core.extra.stream import DataFrameCSVReader
+from decanter.core.extra.utils import check_response
+from decanter.core.extra.upload_cache import content_hash
 
 logger = logging.getLogger(__name__)
 
+# strftime format of the timestamp_format batch predict is sent with.
+SCORE_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
 
 class CoreClient(Context):
     """Handle client side actions.
@@ -36,7 +50,21 @@ class CoreClient(Context):
 
     """
 
-    def __init__(self, username, password, host):
+    def __init__(
+        self,
+        username,
+        password,
+        host,
+        async_transport=False,
+        max_connections=100,
+        task_poller=None,
+        poll_policy=None,
+        metadata_cache=None,
+        transport=None,
+        scheduler=None,
+        loop_monitor=None,
+        isolated=False,
+    ):
         super().__init__()
         """Create context instance and init neccessary variable and objects.
 
@@ -48,12 +76,61 @@ class CoreClient(Context):
             username (str): User name for login Decanter Core server
             password (str): Password name for login Decanter Core server
             host (str): Decanter Core server URL.
+            async_transport (:obj:`bool`, optional): Poll tasks with the
+                asyncio native transport. Defaults to False.
+            max_connections (:obj:`int`, optional): Connection pool size of
+                the asyncio native transport. Defaults to 100.
+            task_poller (:class:`~decanter.core.jobs.poller.TaskPoller`,
+                optional): Shared poller refreshing all pending tasks
+                together. Defaults to None.
+            poll_policy (:class:`~decanter.core.jobs.poll_policy.PollPolicy`,
+                optional): Override the default adaptive interval between
+                polls of tasks. Defaults to None.
+            metadata_cache
+                (:class:`~decanter.core.core_api.metadata_cache.MetadataCache`,
+                optional): Local cache of finished experiments, models and
+                data metadata. Defaults to None.
+            transport
+                (:class:`~decanter.core.core_api.transport.TransportSettings`,
+                optional): Pool size, requests per host, keep-alive and
+                timeouts of the client's session. Defaults to None.
+            scheduler (:class:`~decanter.core.jobs.scheduler.JobScheduler`,
+                optional): Bound the tasks running at the same time, overall
+                and per task type. Defaults to None.
+            loop_monitor
+                (:class:`~decanter.core.extra.loop_monitor.LoopLagMonitor`,
+                optional): Sample the event loop lag while running jobs,
+                logging stalls. Defaults to None.
+            isolated (:obj:`bool`, optional): Keep the credentials, host,
+                event loop and jobs in this client instead of the
+                :class:`~decanter.core.context.Context` shared by the
+                process, so that clients of different users or hosts can be
+                used side by side. Defaults to False.
         """
-        Context.create(username=username, password=password, host=host)
-        self.api = Context.api
-
-    @staticmethod
-    def setup(setup_input, name=None):
+        settings = dict(
+            username=username,
+            password=password,
+            host=host,
+            async_transport=async_transport,
+            max_connections=max_connections,
+            task_poller=task_poller,
+            poll_policy=poll_policy,
+            metadata_cache=metadata_cache,
+            transport=transport,
+            scheduler=scheduler,
+            loop_monitor=loop_monitor,
+        )
+        if isolated:
+            self.isolated = True
+            self.JOBS = []
+            self.CORO_TASKS = []
+            Context.setup(self, **settings)
+        else:
+            Context.create(**settings)
+        self.api = state_of(self).api
+
+    @contextmethod
+    def setup(self, setup_input, name=None, timeout=None, priority=0):
         """Setup data reference.
 
         Create a DataSetup Job and scheduled the execution in CORO_TASKS list.
@@ -64,6 +141,11 @@ class CoreClient(Context):
                 (:class:`~decanter.core.core_api.setup_input.SetupInput`):
                 stores the settings for training.
             name (:obj:`str`, optional): name for setup action.
+            timeout (float, optional): Seconds the job may take, waiting
+                for prerequired jobs included, before it stops itself and
+                its task on Decanter Core. Defaults to None, no deadline.
+            priority (int, optional): Jobs with a lower priority start
+                first when the context's scheduler queues them. Defaults to 0.
 
         Returns:
             :class:`~decanter.core.jobs.data_setup.DataSetup` object
@@ -76,29 +158,73 @@ class CoreClient(Context):
 
         data = DataSetup(setup_input=setup_input, name=name)
 
+        data.use_context(self)
+        data.set_deadline(timeout)
+        data.priority = priority
         try:
-            if Context.LOOP is None:
+            if self.LOOP is None:
                 raise AttributeError("[Core] event loop is 'NoneType'")
-            task = Context.LOOP.create_task(data.wait())
-            Context.CORO_TASKS.append(task)
-            Context.JOBS.append(data)
+            task = self.LOOP.create_task(data.wait())
+            self.CORO_TASKS.append(task)
+            self.JOBS.append(data)
         except AttributeError:
             logger.error("[Core] Context not created")
             raise
         return data
 
-    @staticmethod
-    def upload(file, name=None, eda=True):
+    @contextmethod
+    def upload(
+        self,
+        file,
+        name=None,
+        eda=True,
+        chunk_rows=50000,
+        compression=None,
+        compression_level=None,
+        multipart_threshold=None,
+        part_size=MULTIPART_PART_SIZE,
+        cache=None,
+        timeout=None,
+        priority=0,
+    ):
         """Upload csv file or pandas dataframe.
 
         Create a DataUpload Job and scheduled the execution in CORO_TASKS list.
         Record the Job in JOBS list.
 
+        If a cache is given and the content was uploaded to the host before,
+        return the DataUpload of the existing data without sending any
+        bytes. Entries whose data no longer exists are dropped and the data
+        is uploaded again.
+
         Args:
             file (csv-file, :obj:`pandas.DataFrame`): File uploaded to
                 core server.
             name (str, optional): Name for upload action.
             eda (bool, optional): Whether to perform eda on data upload
+            chunk_rows (int, optional): Rows of the DataFrame serialized to
+                csv at a time while uploading, keeping memory around one
+                chunk.
+            compression (str, optional): Compress the upload on the fly
+                with ``gzip`` or ``zstd``, the ratio achieved is stored in
+                ``data.task.compression_ratio``. Defaults to None.
+            compression_level (int, optional): Level of the compression
+                codec. Defaults to the codec's default.
+            multipart_threshold (int, optional): Upload files larger than
+                this many bytes in parts of part_size sent concurrently, a
+                failed part is retried alone. Needs the chunked upload
+                endpoint of Decanter Core. Defaults to None, uploading at
+                once.
+            part_size (int, optional): Bytes of each part of the chunked
+                upload.
+            cache (:class:`~decanter.core.extra.upload_cache.UploadCache`,
+                optional): Cache of data ids keyed by the hash of the
+                content, its file name and eda. Defaults to None.
+            timeout (float, optional): Seconds the job may take, waiting
+                for prerequired jobs included, before it stops itself and
+                its task on Decanter Core. Defaults to None, no deadline.
+            priority (int, optional): Jobs with a lower priority start
+                first when the context's scheduler queues them. Defaults to 0.
 
         Returns:
             :class:`~decanter.core.jobs.data_upload.DataUpload` object
@@ -115,25 +241,80 @@ class CoreClient(Context):
             logger.error("[Core] upload file is 'NoneType'")
             raise Exception
         if isinstance(file, pd.DataFrame):
-            file = file.to_csv(index=False)
-            file = io.StringIO(file)
-            file.name = "no_name"
-
-        data = DataUpload(file=file, name=name, eda=eda)
+            file = DataFrameCSVReader(file, name="no_name", chunk_rows=chunk_rows)
+
+        key = None
+        if cache is not None:
+            options = {"eda": eda, "filename": getattr(file, "name", None)}
+            key = content_hash(file, options=options)
+        if key is not None:
+            data = CoreClient._get_cached_upload(self, cache, key, name)
+            if data is not None:
+                self.JOBS.append(data)
+                return data
+
+        data = DataUpload(
+            file=file,
+            name=name,
+            eda=eda,
+            compression=compression,
+            compression_level=compression_level,
+            multipart_threshold=multipart_threshold,
+            part_size=part_size,
+        )
         # check context validation
+        data.use_context(self)
+        data.set_deadline(timeout)
+        data.priority = priority
         try:
-            if Context.LOOP is None:
+            if self.LOOP is None:
                 raise AttributeError("[Core] event loop is 'NoneType'")
-            task = Context.LOOP.create_task(data.wait())
-            Context.CORO_TASKS.append(task)
-            Context.JOBS.append(data)
+            if key is not None:
+                task = self.LOOP.create_task(
+                    CoreClient._wait_and_cache(self, data, cache, key)
+                )
+            else:
+                task = self.LOOP.create_task(data.wait())
+            self.CORO_TASKS.append(task)
+            self.JOBS.append(data)
         except AttributeError:
             logger.error("[Core] Context not created")
             raise
         return data
 
     @staticmethod
-    def train(train_input, select_model_by=Evaluator.auto, name=None):
+    def _get_cached_upload(state, cache, key, name):
+        """Get the DataUpload of cached content, if its data still exists."""
+        data_id = cache.get(state.HOST, key, user=state.USERNAME)
+        if data_id is None:
+            return None
+        try:
+            data = DataUpload.create(data_id, name=name, cached=False, context=state)
+        except Exception as err:  # pylint: disable=broad-except
+            logger.info("[Core] drop stale upload cache of %s: %s", data_id, err)
+            cache.discard(state.HOST, key, user=state.USERNAME)
+            return None
+        logger.info("[Core] upload cache hit, use data %s", data_id)
+        return data
+
+    @staticmethod
+    async def _wait_and_cache(state, data, cache, key):
+        """Wait for the upload and record the data id of its content."""
+        await data.wait()
+        if data.is_success():
+            cache.put(
+                state.HOST, key, data.id, name=data.name, user=state.USERNAME
+            )
+
+    @contextmethod
+    def train(
+        self,
+        train_input,
+        select_model_by=Evaluator.auto,
+        name=None,
+        timeout=None,
+        priority=0,
+    ):
         """Train model with data.
 
         Create a Experiment Job and scheduled the execution in CORO_TASKS list.
@@ -147,6 +328,11 @@ class CoreClient(Context):
                 (:class:`~decanter.core.enums.evaluators.Evaluator`):
                 if predict by trained experiment, how should we select best model
             name (:obj:`str`, optional): name for train action.
+            timeout (float, optional): Seconds the job may take, waiting
+                for prerequired jobs included, before it stops itself and
+                its task on Decanter Core. Defaults to None, no deadline.
+            priority (int, optional): Jobs with a lower priority start
+                first when the context's scheduler queues them. Defaults to 0.
 
         Returns:
             :class:`~decanter.core.jobs.experiment.Experiment` object
@@ -160,19 +346,29 @@ class CoreClient(Context):
         exp = Experiment(
             train_input=train_input, select_model_by=select_model_by, name=name
         )
+        exp.use_context(self)
+        exp.set_deadline(timeout)
+        exp.priority = priority
         try:
-            if Context.LOOP is None:
+            if self.LOOP is None:
                 raise AttributeError("[Core] event loop is 'NoneType'")
-            task = Context.LOOP.create_task(exp.wait())
-            Context.CORO_TASKS.append(task)
-            Context.JOBS.append(exp)
+            task = self.LOOP.create_task(exp.wait())
+            self.CORO_TASKS.append(task)
+            self.JOBS.append(exp)
         except AttributeError:
             logger.error("[Core] Context not created")
             raise
         return exp
 
-    @staticmethod
-    def train_ts(train_input, select_model_by=Evaluator.auto, name=None):
+    @contextmethod
+    def train_ts(
+        self,
+        train_input,
+        select_model_by=Evaluator.auto,
+        name=None,
+        timeout=None,
+        priority=0,
+    ):
         """Train time series model with data.
 
         Create a Time Series Experiment Job and scheduled the execution
@@ -186,6 +382,11 @@ class CoreClient(Context):
                 (:class:`~decanter.core.enums.evaluators.Evaluator`):
                 if predict by trained experiment, how should we select best model
             name (:obj:`str`, optional): name for train time series action.
+            timeout (float, optional): Seconds the job may take, waiting
+                for prerequired jobs included, before it stops itself and
+                its task on Decanter Core. Defaults to None, no deadline.
+            priority (int, optional): Jobs with a lower priority start
+                first when the context's scheduler queues them. Defaults to 0.
 
         Returns:
             :class:`~decanter.core.jobs.experiment.ExperimentTS` object
@@ -199,19 +400,22 @@ class CoreClient(Context):
         exp_ts = ExperimentTS(
             train_input=train_input, select_model_by=select_model_by, name=name
         )
+        exp_ts.use_context(self)
+        exp_ts.set_deadline(timeout)
+        exp_ts.priority = priority
         try:
-            if Context.LOOP is None:
+            if self.LOOP is None:
                 raise AttributeError("[Core] event loop is 'NoneType'")
-            task = Context.LOOP.create_task(exp_ts.wait())
-            Context.CORO_TASKS.append(task)
-            Context.JOBS.append(exp_ts)
+            task = self.LOOP.create_task(exp_ts.wait())
+            self.CORO_TASKS.append(task)
+            self.JOBS.append(exp_ts)
         except AttributeError:
             logger.error("[Core] Context not created")
             raise
         return exp_ts
 
-    @staticmethod
-    def train_cluster(train_input, name=None):
+    @contextmethod
+    def train_cluster(self, train_input, name=None, timeout=None, priority=0):
         """Train cluster model with data.
 
         Create a Cluster Experiment Job and scheduled the execution
@@ -222,6 +426,11 @@ class CoreClient(Context):
                 (:class:`~decanter.core.core_api.train_input.TrainClusterInput`):
                 Settings for training.
             name (:obj:`str`, optional): name for train time series action.
+            timeout (float, optional): Seconds the job may take, waiting
+                for prerequired jobs included, before it stops itself and
+                its task on Decanter Core. Defaults to None, no deadline.
+            priority (int, optional): Jobs with a lower priority start
+                first when the context's scheduler queues them. Defaults to 0.
 
         Returns:
             :class:`~decanter.core.jobs.experiment.ExperimentTS` object
@@ -234,19 +443,22 @@ class CoreClient(Context):
         exp = ExperimentCluster(
             train_input=train_input, select_model_by=Evaluator.tot_withinss, name=name
         )
+        exp.use_context(self)
+        exp.set_deadline(timeout)
+        exp.priority = priority
         try:
-            if Context.LOOP is None:
+            if self.LOOP is None:
                 raise AttributeError("[Core] event loop is 'NoneType'")
-            task = Context.LOOP.create_task(exp.wait())
-            Context.CORO_TASKS.append(task)
-            Context.JOBS.append(exp)
+            task = self.LOOP.create_task(exp.wait())
+            self.CORO_TASKS.append(task)
+            self.JOBS.append(exp)
         except AttributeError:
             logger.error("[Core] Context not created")
             raise
         return exp
 
-    @staticmethod
-    def predict(predict_input, name=None):
+    @contextmethod
+    def predict(self, predict_input, name=None, timeout=None, priority=0):
         """Predict model with test data.
 
         Create a PredictResult Job and scheduled the execution
@@ -257,6 +469,11 @@ class CoreClient(Context):
                 (:class:`~decanter.core.core_api.predict_input.PredictInput`):
                 stores the settings for prediction.
             name (:obj:`str`, optional): string, name for predict action.
+            timeout (float, optional): Seconds the job may take, waiting
+                for prerequired jobs included, before it stops itself and
+                its task on Decanter Core. Defaults to None, no deadline.
+            priority (int, optional): Jobs with a lower priority start
+                first when the context's scheduler queues them. Defaults to 0.
 
         Returns:
             :class:`~decanter.core.jobs.predict_result.PredictResult` object
@@ -264,23 +481,104 @@ class CoreClient(Context):
         Raises:
             AttributeError: If the function is called without
                 :class:`~decanter.core.context.Context` created
+            TypeError: If predict_input is a
+                :class:`~decanter.core.core_api.predict_input.PredictTemplate`,
+                which has no test data, see :func:`predict_batch`.
 
         """
+        if isinstance(predict_input, PredictTemplate):
+            logger.error("[Core] Predict with a template of no test data")
+            raise TypeError(
+                "[Core] PredictTemplate has no test data, use predict_batch"
+            )
+        return CoreClient._create_predict(
+            self, predict_input, name=name, timeout=timeout, priority=priority
+        )
+
+    @staticmethod
+    def _create_predict(state, predict_input, name, timeout, priority):
+        """Create a PredictResult Job and schedule it in the state's loop."""
         logger.debug("[Core] Create Predict Job")
         predict_res = PredictResult(predict_input=predict_input, name=name)
+        predict_res.use_context(state)
+        predict_res.set_deadline(timeout)
+        predict_res.priority = priority
         try:
-            if Context.LOOP is None:
+            if state.LOOP is None:
                 raise AttributeError("[Core] event loop is 'NoneType'")
-            task = Context.LOOP.create_task(predict_res.wait())
-            Context.CORO_TASKS.append(task)
-            Context.JOBS.append(predict_res)
+            task = state.LOOP.create_task(predict_res.wait())
+            state.CORO_TASKS.append(task)
+            state.JOBS.append(predict_res)
         except AttributeError:
             logger.error("[Core] Context not created")
             raise
         return predict_res
 
-    @staticmethod
-    def predict_ts(predict_input, name=None):
+    @contextmethod
+    def predict_batch(
+        self,
+        template,
+        data,
+        name=None,
+        rate=None,
+        burst=1,
+        timeout=None,
+        priority=0,
+    ):
+        """Predict one model on many test data.
+
+        Create a PredictResult Job per test data sharing the settings of
+        template, so the model is selected and the request body serialized
+        once for all of them, only ``data_id`` differs.
+
+        Example:
+            .. code-block:: python
+
+                template = PredictTemplate(experiment=exp, keep_columns=['id'])
+                results = client.predict_batch(template, test_data, rate=5)
+                client.run()
+
+        Args:
+            template
+                (:class:`~decanter.core.core_api.predict_input.PredictTemplate`):
+                stores the settings shared by the predictions.
+            data (list(:class:`~decanter.core.jobs.data_upload.DataUpload`)):
+                Test data to predict.
+            name (:obj:`str`, optional): Prefix of the names of the predict
+                actions, numbered by test data.
+            rate (:obj:`float`, optional): Predict tasks sent per second,
+                None to send them as soon as they are ready. Defaults to None.
+            burst (:obj:`int`, optional): Predict tasks sent at once before
+                rate applies. Defaults to 1.
+            timeout (float, optional): Seconds each job may take, see
+                :func:`predict`. Defaults to None, no deadline.
+            priority (int, optional): Jobs with a lower priority start
+                first when the context's scheduler queues them. Defaults to 0.
+
+        Returns:
+            list(:class:`~decanter.core.jobs.predict_result.PredictResult`)
+
+        Raises:
+            AttributeError: If the function is called without
+                :class:`~decanter.core.context.Context` created
+        """
+        limiter = None if rate is None else RateLimiter(rate, burst)
+        results = []
+        for i, test_data in enumerate(data):
+            predict_res = CoreClient._create_predict(
+                self,
+                template.bind(test_data),
+                name=None if name is None else "%s_%d" % (name, i),
+                timeout=timeout,
+                priority=priority,
+            )
+            predict_res.rate_limiter = limiter
+            results.append(predict_res)
+        logger.debug("[Core] Create %s Predict Jobs from template", len(results))
+        return results
+
+    @contextmethod
+    def predict_ts(self, predict_input, name=None, timeout=None, priority=0):
         """Predict time series model with test data.
 
         Create a Time Series PredictResult Job and scheduled the execution
@@ -291,6 +589,11 @@ class CoreClient(Context):
                 (:class:`~decanter.core.core_api.predict_input.PredictTSInput`):
                 stores the settings for prediction.
             name (:obj:`str`, optional): name for predict time series action.
+            timeout (float, optional): Seconds the job may take, waiting
+                for prerequired jobs included, before it stops itself and
+                its task on Decanter Core. Defaults to None, no deadline.
+            priority (int, optional): Jobs with a lower priority start
+                first when the context's scheduler queues them. Defaults to 0.
 
         Returns:
             :class:`~decanter.core.jobs.predict_result.PredictTSResult`
@@ -302,14 +605,217 @@ class CoreClient(Context):
         """
         logger.debug("[Core] Create Predict Job")
         predict_ts_res = PredictTSResult(predict_input=predict_input, name=name)
+        predict_ts_res.use_context(self)
+        predict_ts_res.set_deadline(timeout)
+        predict_ts_res.priority = priority
         try:
-            if Context.LOOP is None:
+            if self.LOOP is None:
                 raise AttributeError("[Core] event loop is 'NoneType'")
-            task = Context.LOOP.create_task(predict_ts_res.wait())
-            Context.CORO_TASKS.append(task)
-            Context.JOBS.append(predict_ts_res)
+            task = self.LOOP.create_task(predict_ts_res.wait())
+            self.CORO_TASKS.append(task)
+            self.JOBS.append(predict_ts_res)
         except AttributeError:
             logger.error("[Core] Context not created")
             raise
 
         return predict_ts_res
+
+    @contextmethod
+    def score(
+        self,
+        model,
+        rows,
+        threshold=None,
+        timeout=None,
+        max_batch_size=256,
+        max_latency=0.005,
+        max_concurrency=4,
+    ):
+        """Score rows in memory with a model, without data upload.
+
+        Send the rows to the batch predict api of the model. Rows scored
+        at the same time by other threads are sent in the same request,
+        up to max_batch_size rows each, with several requests running at
+        once over the pooled connections of the client. The batching
+        arguments apply when the first rows of a model and threshold are
+        scored, until the client is closed.
+
+        Example:
+            .. code-block:: python
+
+                scores = client.score(exp.best_model, [{'Sex': 'male'}])
+                scores['prediction']
+
+        Args:
+            model (:class:`~decanter.core.core_api.model.Model` or str):
+                Model or its id.
+            rows (:class:`pandas.DataFrame` or list(dict)): Features of
+                the rows to score, missing values are left out.
+            threshold (:obj:`float`, optional): Prediction threshold for
+                binary classification models. Defaults to None.
+            timeout (:obj:`float`, optional): Seconds to wait for the
+                scores. Defaults to None, no limit.
+            max_batch_size (:obj:`int`, optional): Most rows sent in one
+                request. Defaults to 256.
+            max_latency (:obj:`float`, optional): Seconds a row may wait for
+                the rows of other callers. Defaults to 0.005.
+            max_concurrency (:obj:`int`, optional): Requests of the model
+                running at once. Defaults to 4.
+
+        Returns:
+            :class:`pandas.DataFrame`: ``predict_status`` and the result of
+            each row, such as ``prediction`` and the probability of each
+            class, indexed as rows.
+
+        Raises:
+            concurrent.futures.TimeoutError: If timeout passes.
+        """
+        batcher = CoreClient._get_batcher(
+            self, model, threshold, max_batch_size, max_latency, max_concurrency
+        )
+        records = _score_records(rows)
+        results = batcher.submit(records).result(timeout)
+        return _score_frame(results, rows)
+
+    @contextmethod
+    async def score_async(
+        self,
+        model,
+        rows,
+        threshold=None,
+        max_batch_size=256,
+        max_latency=0.005,
+        max_concurrency=4,
+    ):
+        """Score rows in memory from a coroutine.
+
+        As :meth:`score`, awaiting the scores instead of blocking the event
+        loop. Wrap it in :func:`asyncio.wait_for` to limit the time.
+
+        Returns:
+            :class:`pandas.DataFrame`
+        """
+        batcher = CoreClient._get_batcher(
+            self, model, threshold, max_batch_size, max_latency, max_concurrency
+        )
+        records = _score_records(rows)
+        results = await asyncio.wrap_future(batcher.submit(records))
+        return _score_frame(results, rows)
+
+    @staticmethod
+    def _get_batcher(
+        state, model, threshold, max_batch_size, max_latency, max_concurrency
+    ):
+        """Get the micro-batcher scoring with model and threshold."""
+        model_id = getattr(model, "id", model)
+        key = (model_id, threshold)
+        if state.batchers is None:
+            raise AttributeError("[Core] Context not created")
+        batcher = state.batchers.get(key)
+        if batcher is None:
+            logger.debug("[Core] Create batcher scoring model %s", model_id)
+            batcher = state.batchers.setdefault(
+                key,
+                MicroBatcher(
+                    partial(_batch_predict, state.api, model_id, threshold),
+                    max_batch_size=max_batch_size,
+                    max_latency=max_latency,
+                    max_concurrency=max_concurrency,
+                ),
+            )
+        return batcher
+
+
+def _batch_predict(api, model_id, threshold, records):
+    """Score records with one request to the batch predict api.
+
+    Args:
+        api (:class:`~decanter.core.core_api.api.CoreAPI`): Api of the
+            context.
+        model_id (str): Model id.
+        threshold (float): Prediction threshold, None for the default.
+        records (list(dict)): Features of each row.
+
+    Returns:
+        list(dict): Result of each row, in order.
+
+    Raises:
+        ValueError: If the results don't map one to one to records by
+            their ``index``.
+    """
+    kwargs = {"featuresList": records}
+    if threshold is not None:
+        kwargs["threshold"] = threshold
+    results = check_response(api.batch_predict(model_id, **kwargs)).json()
+    if isinstance(results, dict):
+        results = results.get("data", results)
+    if len(results) != len(records):
+        raise ValueError(
+            "[Core] batch predict got %s results of %s rows"
+            % (len(results), len(records))
+        )
+    if not all(isinstance(res, dict) and "index" in res for res in results):
+        raise ValueError("[Core] batch predict results without index")
+    results = sorted(results, key=lambda res: res["index"])
+    if [res["index"] for res in results] != list(range(len(records))):
+        raise ValueError("[Core] batch predict results of unknown rows")
+    return results
+
+
+def _score_records(rows):
+    """Turn rows to score into the features list of batch predict.
+
+    Args:
+        rows (:class:`pandas.DataFrame` or list(dict)): Rows to score.
+
+    Returns:
+        list(dict): Features of each row, without missing values.
+    """
+    if isinstance(rows, pd.DataFrame):
+        rows = rows.to_dict("records")
+    records = []
+    for row in rows:
+        record = {}
+        for key, val in row.items():
+            val = _score_value(val)
+            if val is not None and val == val:
+                record[key] = val
+        records.append(record)
+    return records
+
+
+def _score_value(val):
+    """Turn a feature value into one the json encoder of requests accepts.
+
+    Datetimes are formatted as the ``timestamp_format`` batch predict is
+    sent with, other NumPy and pandas scalars become Python values.
+    """
+    if isinstance(val, np.datetime64):
+        val = pd.Timestamp(val)
+    if val is pd.NaT:
+        return None
+    if isinstance(val, (datetime.datetime, datetime.date)):
+        return val.strftime(SCORE_TIMESTAMP_FORMAT)
+    if isinstance(val, pd.Timedelta):
+        return val.isoformat()
+    if isinstance(val, np.generic):
+        return val.item()
+    return val
+
+
+def _score_frame(results, rows):
+    """Gather the results of batch predict into a DataFrame.
+
+    Args:
+        results (list(dict)): Result of each row, in order.
+        rows (:class:`pandas.DataFrame` or list(dict)): The scored rows.
+
+    Returns:
+        :class:`pandas.DataFrame`: One row of result per scored row.
+    """
+    index = rows.index if isinstance(rows, pd.DataFrame) else None
+    frame = pd.DataFrame.from_records(
+        [res.get("result") or {} for res in results], index=index
+    )
+    frame.insert(0, "predict_status", [res.get("predict_status") for res in results])
+    return frame
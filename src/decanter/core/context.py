@@ -1,10 +1,13 @@
 """Initialization for running SDK."""
 import asyncio
+import functools
 import logging
+import types
 
 import pandas as pd
 
-from decanter.core.core_api import CoreAPI, worker
+from decanter.core.core_api import AsyncCoreAPI, CoreAPI, api, worker
+from decanter.core.core_api.transport import create_session, session_metrics
 from decanter.core.extra import CoreStatus
 
 logger = logging.getLogger(__name__)
@@ -20,6 +23,36 @@ def get_or_create_eventloop():
             return asyncio.get_event_loop()
 
 
+class contextmethod:  # pylint: disable=invalid-name,too-few-public-methods
+    """Method getting the state of the context it is called on as self.
+
+    A context owning its state (see :attr:`Context.isolated`) gets itself,
+    any other call, including on the class, gets the :class:`Context` class
+    holding the state shared by the process.
+    """
+
+    def __init__(self, func):
+        self.func = func
+        functools.update_wrapper(self, func)
+
+    def __get__(self, obj, objtype=None):
+        return types.MethodType(self.func, state_of(obj))
+
+
+def state_of(context):
+    """Get the holder of a context's state.
+
+    Args:
+        context (:class:`Context`): Context instance, the class, or None.
+
+    Returns:
+        The context if it owns its state, else the :class:`Context` class.
+    """
+    if context is not None and context.__dict__.get("isolated"):
+        return context
+    return Context
+
+
 class Context:
     """Init the connection to decanter core server and functionality for running SDK.
 
@@ -47,12 +80,44 @@ class Context:
     JOBS = []
     # CoreX API endpoint
     api = None
+    # Awaitable CoreX API endpoint, used for polling tasks if selected.
+    async_api = None
+    # Shared poller refreshing all pending tasks together, if selected.
+    task_poller = None
+    # Policy deciding the interval between polls of a task.
+    poll_policy = None
+    # Cache of finished experiments, models and data metadata, if selected.
+    metadata_cache = None
+    # Requests session applying the transport settings, if given.
+    session = None
+    # Scheduler bounding the tasks running at the same time, if selected.
+    scheduler = None
+    # Monitor sampling the event loop lag while running, if selected.
+    loop_monitor = None
+    # Micro-batchers of in-memory scoring by model, created on first use.
+    batchers = None
+    # True for an instance owning all the state above, so that several
+    # clients can run side by side in one process.
+    isolated = False
 
     def __init__(self):
         pass
 
     @classmethod
-    def create(cls, username, password, host):
+    def create(
+        cls,
+        username,
+        password,
+        host,
+        async_transport=False,
+        max_connections=100,
+        task_poller=None,
+        poll_policy=None,
+        metadata_cache=None,
+        transport=None,
+        scheduler=None,
+        loop_monitor=None,
+    ):
         """Create context instance and init necessary variable and objects.
 
         Setting the user, password, and host for the funture connection when
@@ -63,6 +128,35 @@ class Context:
             username (str): User name for login Decanter Core server
             password (str): Password name for login Decanter Core server
             host (str): Decanter Core server URL.
+            async_transport (:obj:`bool`, optional): Poll tasks with
+                :class:`~decanter.core.core_api.async_api.AsyncCoreAPI` on
+                the event loop instead of the thread-pool executor.
+                Requires aiohttp. Defaults to False.
+            max_connections (:obj:`int`, optional): Size of the connection
+                pool of the async transport. Defaults to 100.
+            task_poller (:class:`~decanter.core.jobs.poller.TaskPoller`,
+                optional): Refresh all pending tasks with one request per
+                tick instead of one request per task. Defaults to None.
+            poll_policy (:class:`~decanter.core.jobs.poll_policy.PollPolicy`,
+                optional): Policy deciding the interval between polls of
+                tasks. Defaults to None, using the
+                :class:`~decanter.core.jobs.poll_policy.AdaptivePollPolicy`.
+            metadata_cache
+                (:class:`~decanter.core.core_api.metadata_cache.MetadataCache`,
+                optional): Serve finished experiments, models and data
+                metadata from a local cache. Defaults to None.
+            transport
+                (:class:`~decanter.core.core_api.transport.TransportSettings`,
+                optional): Pool size, requests per host, keep-alive and
+                timeouts of a session of this context. Defaults to None,
+                using the session shared by the module.
+            scheduler (:class:`~decanter.core.jobs.scheduler.JobScheduler`,
+                optional): Bound the tasks running at the same time, overall
+                and per task type. Defaults to None, running all at once.
+            loop_monitor
+                (:class:`~decanter.core.extra.loop_monitor.LoopLagMonitor`,
+                optional): Sample the event loop lag during :func:`run`.
+                Defaults to None.
 
         Returns:
             :class:`~decanter.core.context.Context>`
@@ -70,46 +164,108 @@ class Context:
         """
         context = cls()
         context.close()
-        Context.USERNAME = username
-        Context.PASSWORD = password
-        Context.HOST = host
-
-        # get the current event loop
-        # it will create a new event loop if it does not exist
-        Context.LOOP = get_or_create_eventloop()
-
-        # if the current loop is closed create a new one
-        if Context.LOOP.is_closed():
-            asyncio.set_event_loop(asyncio.new_event_loop())
-            Context.LOOP = get_or_create_eventloop()
-            logger.debug("[Context] create and set new event loop")
-        context.healthy()
-        Context.api = CoreAPI()
+        Context.setup(
+            Context,
+            username=username,
+            password=password,
+            host=host,
+            async_transport=async_transport,
+            max_connections=max_connections,
+            task_poller=task_poller,
+            poll_policy=poll_policy,
+            metadata_cache=metadata_cache,
+            transport=transport,
+            scheduler=scheduler,
+            loop_monitor=loop_monitor,
+        )
         return context
 
     @staticmethod
-    def run():
+    def setup(
+        state,
+        username,
+        password,
+        host,
+        async_transport=False,
+        max_connections=100,
+        task_poller=None,
+        poll_policy=None,
+        metadata_cache=None,
+        transport=None,
+        scheduler=None,
+        loop_monitor=None,
+    ):
+        """Set the credentials, event loop and transport of a context's state.
+
+        The :class:`Context` class gets the current event loop of the
+        thread, an isolated context gets an event loop of its own. Arguments
+        are as :func:`create`.
+
+        Args:
+            state: The :class:`Context` class or an isolated context.
+        """
+        state.USERNAME = username
+        state.PASSWORD = password
+        state.HOST = host
+        # always assigned, an isolated context must not fall back to the
+        # session or async api of the Context class
+        state.session = create_session(transport) if transport is not None else None
+
+        if state.isolated:
+            state.LOOP = asyncio.new_event_loop()
+        else:
+            # get the current event loop
+            # it will create a new event loop if it does not exist
+            state.LOOP = get_or_create_eventloop()
+
+            # if the current loop is closed create a new one
+            if state.LOOP.is_closed():
+                asyncio.set_event_loop(asyncio.new_event_loop())
+                state.LOOP = get_or_create_eventloop()
+                logger.debug("[Context] create and set new event loop")
+        state.healthy()
+        state.api = CoreAPI(context=state)
+        state.async_api = (
+            AsyncCoreAPI(max_connections=max_connections, context=state)
+            if async_transport
+            else None
+        )
+        state.task_poller = task_poller
+        if task_poller is not None:
+            task_poller.use_context(state)
+        state.poll_policy = poll_policy
+        state.metadata_cache = metadata_cache
+        state.scheduler = scheduler
+        if scheduler is not None:
+            scheduler.use_context(state)
+        state.loop_monitor = loop_monitor
+        state.batchers = {}
+
+    @contextmethod
+    def run(self):
         """Start execute the tasks in CORO_TASKs.
 
         Gather all tasks and execute.  It will block on all tasks until all
         have been finished.
 
         """
-        logger.info("Run %s coroutines", len(Context.CORO_TASKS))
+        logger.info("Run %s coroutines", len(self.CORO_TASKS))
 
-        if Context.LOOP is None:
+        if self.LOOP is None:
             logger.error("[Context] create context before run")
             raise Exception()
 
-        loop_running = Context.LOOP.is_running()
+        loop_running = self.LOOP.is_running()
         logger.info("[Context] Context.LOOP.is_running(): {})".format(loop_running))
         if loop_running is False:
-            groups = asyncio.gather(*Context.CORO_TASKS)
-            Context.LOOP.run_until_complete(groups)
-            Context.CORO_TASKS = []
-
-    @staticmethod
-    def close():
+            groups = asyncio.gather(*self.CORO_TASKS)
+            if self.loop_monitor is not None:
+                groups = self.loop_monitor.watch(groups)
+            self.LOOP.run_until_complete(groups)
+            self.CORO_TASKS = []
+
+    @contextmethod
+    def close(self):
         """Close the event loop and reset JOBS and CORO_TASKS.
 
         Close the event loop if it's not running (will not close in
@@ -117,20 +273,35 @@ class Context:
 
         """
         logger.debug("[Context] try to close context")
-        if Context.LOOP is not None:
-            Context.LOOP = get_or_create_eventloop()
-            if Context.LOOP.is_running() is False:
-                Context.LOOP.close()
+        if self.LOOP is not None:
+            if not self.isolated:
+                self.LOOP = get_or_create_eventloop()
+            if self.LOOP.is_running() is False:
+                if self.async_api is not None:
+                    self.LOOP.run_until_complete(self.async_api.close())
+                self.LOOP.close()
                 logger.info("[Context] close event loop successfully")
         else:
             logger.info("[Context] no event loop to close")
-        logger.debug("[Context] remain CORO TASKS %s", len(Context.CORO_TASKS))
-        Context.JOBS = []
-        Context.CORO_TASKS = []
-        Context.USERNAME = Context.PASSWORD = Context.HOST = None
-
-    @staticmethod
-    def healthy():
+        logger.debug("[Context] remain CORO TASKS %s", len(self.CORO_TASKS))
+        for batcher in (self.batchers or {}).values():
+            batcher.close()
+        self.batchers = None
+        self.JOBS = []
+        self.CORO_TASKS = []
+        self.USERNAME = self.PASSWORD = self.HOST = None
+        self.async_api = None
+        self.task_poller = None
+        self.poll_policy = None
+        self.metadata_cache = None
+        self.scheduler = None
+        self.loop_monitor = None
+        if self.session is not None:
+            self.session.close()
+            self.session = None
+
+    @contextmethod
+    def healthy(self):
         """Check the connection between Decanter Core server.
 
         Send a fake request to determine if there's connection or
@@ -138,7 +309,7 @@ class Context:
 
         """
         try:
-            res = worker.Worker().get_status()
+            res = worker.Worker(context=self).get_status()
             if res.status_code // 100 != 2:
                 raise Exception()
         except Exception as err:
@@ -147,18 +318,28 @@ class Context:
         else:
             logger.info("[Context] connect healthy :)")
 
-    @staticmethod
-    def get_all_jobs():
+    @contextmethod
+    def transport_metrics(self):
+        """Get the counters of requests and pooled connections per host.
+
+        Returns:
+            dict: See
+            :meth:`~decanter.core.core_api.transport.MeteredHTTPAdapter.metrics`.
+        """
+        return session_metrics(self.session or api.requests_session)
+
+    @contextmethod
+    def get_all_jobs(self):
         """Get a list of Jobs that have been or waiting to be executed.
 
         Returns:
             list(:class:`~decanter.core.jobs.job.Job`)
 
         """
-        return Context.JOBS
+        return self.JOBS
 
-    @staticmethod
-    def get_jobs_status(sort_by_status=False, status=None):
+    @contextmethod
+    def get_jobs_status(self, sort_by_status=False, status=None):
         """Get a dataframe of jobs and its corresponding status. Return
         all jobs and its status if no arguments passed.
 
@@ -175,7 +356,7 @@ class Context:
 
         """
         jobs_status = {"Job": [], "status": []}
-        for job in Context.JOBS:
+        for job in self.JOBS:
             jobs_status["Job"].append(job.name)
             jobs_status["status"].append(job.status)
 
@@ -191,8 +372,8 @@ class Context:
 
         return jobs_df
 
-    @staticmethod
-    def get_jobs_by_name(names):
+    @contextmethod
+    def get_jobs_by_name(self, names):
         """Get the Job instances by its name.
 
         Args:
@@ -203,7 +384,7 @@ class Context:
 
         """
         res = []
-        for job in Context.JOBS:
+        for job in self.JOBS:
             if job.name in names:
                 res.append(job)
 
@@ -220,9 +401,9 @@ class Context:
         for job in jobs_list:
             job.stop()
 
-    @staticmethod
-    def stop_all_jobs():
+    @contextmethod
+    def stop_all_jobs(self):
         """Stop all Jobs which status is still in pending or running"""
-        for job in Context.JOBS:
+        for job in self.JOBS:
             if job.status not in ["done", "fail", "invalid"]:
                 job.stop()
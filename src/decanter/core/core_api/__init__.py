@@ -1,8 +1,11 @@
 """Init core_api package"""
 from . import body_obj as CoreBody
 from .api import CoreAPI
+from .async_api import AsyncCoreAPI, AsyncResponse
+from .metadata_cache import MetadataCache
+from .transport import TransportSettings
 from .model import Model, MultiModel
-from .predict_input import PredictInput, PredictTSInput
+from .predict_input import PredictInput, PredictTSInput, PredictTemplate
 from .train_input import TrainInput, TrainTSInput, TrainClusterInput
 from .setup_input import SetupInput
 from .worker import Worker
@@ -8,39 +8,66 @@
 :meta private:
 """
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
-from requests.adapters import HTTPAdapter
 from requests.auth import HTTPBasicAuth
 from requests_toolbelt import MultipartEncoder
-from urllib3.util.retry import Retry
 
 import decanter.core as core
+from decanter.core.core_api.transport import create_session
+from decanter.core.extra.utils import check_response
 
 logger = logging.getLogger(__name__)
 requests.packages.urllib3.disable_warnings()
 
-# Retry when having temporary connection issue with CoreX
-# ref: https://stackoverflow.com/a/35504626
-requests_session = requests.Session()
-retries = Retry(total=5, backoff_factor=0.1, status_forcelist=[500, 502, 503, 504])
+# Session of the clients created without transport settings
+requests_session = create_session()
 
-requests_session.mount("http://", HTTPAdapter(max_retries=retries))
-requests_session.mount("https://", HTTPAdapter(max_retries=retries))
+# Parts of chunked upload, parts in flight are held in memory
+MULTIPART_PART_SIZE = 16 * 1024 * 1024
+MULTIPART_WORKERS = 4
 
 
 class CoreAPI:
-    """Handle sending Decanter Core API requests."""
-
-    def __init__(self):
+    """Handle sending Decanter Core API requests.
+
+    Args:
+        context (:class:`~decanter.core.context.Context`): (opt) Context
+            holding the credentials, host and session, defaults to the
+            :class:`~decanter.core.context.Context` shared by the process.
+        timeout (float or tuple): (opt) Seconds, or (connect, read) seconds,
+            to wait for each request, defaults to the timeout of the
+            transport settings.
+    """
+
+    def __init__(self, context=None, timeout=None):
         self._corex_headers = {"user": "sdk"}
+        self._context = context
+        self.timeout = timeout
 
     @property
     def corex_headers(self):
         return self._corex_headers
 
-    @staticmethod
-    def requests_(http, url, json=None, data=None, files=None, headers=None):
+    @property
+    def context(self):
+        """Context the requests are sent with."""
+        return self._context if self._context is not None else core.Context
+
+    def requests_(
+        self,
+        http,
+        url,
+        json=None,
+        data=None,
+        files=None,
+        headers=None,
+        stream=False,
+        timeout=None,
+    ):
         """Handle request sending to Decanter Core.
 
         Send corresponding Basic Auth request by argument and handle
@@ -57,6 +84,10 @@ class CoreAPI:
             headers: (opt) dictionary, particular headers that decanter ai support,
                 {'user': 'sdk'} for decanter to know task source is from
                 decanter-ai-core-sdk.
+            stream: (opt) bool, don't download the body of GET response
+                until it's read.
+            timeout: (opt) float or (connect, read) tuple, seconds to wait
+                for the server, defaults to :attr:`timeout`.
 
         Returns:
             class:`Response <Response>` object
@@ -65,13 +96,23 @@ class CoreAPI:
             Exception: Occurred when raises RequestException
                     or calling wrong http method.
         """
-        basic_auth = HTTPBasicAuth(core.Context.USERNAME, core.Context.PASSWORD)
-        url = core.Context.HOST + url
+        context = self.context
+        basic_auth = HTTPBasicAuth(context.USERNAME, context.PASSWORD)
+        url = context.HOST + url
+        session = context.session or requests_session
+        timeout = self.timeout if timeout is None else timeout
         try:
             if http == "GET":
-                return requests_session.get(url=url, auth=basic_auth, verify=False)
+                return session.get(
+                    url=url,
+                    auth=basic_auth,
+                    verify=False,
+                    headers=headers,
+                    stream=stream,
+                    timeout=timeout,
+                )
             if http == "POST":
-                return requests_session.post(
+                return session.post(
                     url=url,
                     json=json,
                     data=data,
@@ -79,9 +120,10 @@ class CoreAPI:
                     auth=basic_auth,
                     verify=False,
                     headers=headers,
+                    timeout=timeout,
                 )
             if http == "PUT":
-                return requests_session.put(
+                return session.put(
                     url=url,
                     json=json,
                     data=data,
@@ -89,15 +131,17 @@ class CoreAPI:
                     auth=basic_auth,
                     verify=False,
                     headers=headers,
+                    timeout=timeout,
                 )
             if http == "DELETE":
-                return requests_session.delete(
+                return session.delete(
                     url=url,
                     json=json,
                     data=data,
                     files=files,
                     auth=basic_auth,
                     verify=False,
+                    timeout=timeout,
                 )
 
             raise Exception("[Core] No such HTTP Method.")
@@ -106,6 +150,26 @@ class CoreAPI:
             logger.error("[Core] Request Failed :(")
             raise Exception(err)
 
+    def get_metadata_(self, url, cached=True):
+        """Get metadata through the context's metadata cache, if any.
+
+        Args:
+            url: string, url endpoint.
+            cached: (opt) bool, False to skip the cache, ex. to check the
+                resource still exists.
+
+        Returns:
+            class:`Response <Response>` object
+        """
+        cache = self.context.metadata_cache
+        if cache is None or not cached:
+            return self.requests_(http="GET", url=url)
+        return cache.get(
+            self.context.HOST + url,
+            lambda headers: self.requests_(http="GET", url=url, headers=headers),
+            user=self.context.USERNAME,
+        )
+
     def get_info(self):
         """Get list of available time series algorithms
 
@@ -127,25 +191,38 @@ class CoreAPI:
         """
         return self.requests_(http="GET", url="/data")
 
-    def get_data_by_id(self, data_id):
+    def get_data_by_id(self, data_id, cached=True):
         """Get data metadata.
 
         Endpoint: /data/{data_id}
 
+        Args:
+            cached: (opt) bool, False to skip the metadata cache.
+
         Returns:
             class:`Response <Response>` object
         """
-        return self.requests_(http="GET", url="/data/%s" % data_id)
+        return self.get_metadata_(url="/data/%s" % data_id, cached=cached)
 
-    def get_data_file_by_id(self, data_id):
+    def get_data_file_by_id(self, data_id, stream=False, headers=None):
         """Download csv file of data.
 
         Endpoint: /data/{data_id}/file
 
+        Args:
+            stream: (opt) bool, read the file content in chunks.
+            headers: (opt) dictionary, ex. {'Range': 'bytes=1024-'} to
+                resume a download.
+
         Returns:
             class:`Response <Response>` object
         """
-        return self.requests_(http="GET", url="/v2/data/%s/file" % data_id)
+        return self.requests_(
+            http="GET",
+            url="/v2/data/%s/file" % data_id,
+            headers=headers,
+            stream=stream,
+        )
 
     def post_data_delete(self, **kwargs):
         """Batch delete data.
@@ -162,6 +239,11 @@ class CoreAPI:
 
         Endpoint: /v2/upload
 
+        Keyword Arguments:
+            compressor (:class:`~decanter.core.extra.stream.Compressor`):
+                (opt) Compress the request body on the fly, sent with
+                chunked transfer encoding and the Content-Encoding header.
+
         Returns:
             class:`Response <Response>` object
         """
@@ -175,8 +257,188 @@ class CoreAPI:
         url = "/v2/upload"
         if "eda" in kwargs and not kwargs["eda"]:
             url = url + "?eda=true"
+        compressor = kwargs.get("compressor")
+        if compressor is not None:
+            headers = dict(headers, **{"Content-Encoding": compressor.content_encoding})
+            csv = compressor.compress_stream(csv)
         return self.requests_(http="POST", url=url, data=csv, headers=headers)
 
+    def post_upload_multipart_init(self, **kwargs):
+        """Start a chunked upload.
+
+        Endpoint: /v2/upload/multipart
+
+        Returns:
+            class:`Response <Response>` object with the ``upload_id``.
+        """
+        return self.requests_(
+            http="POST",
+            url="/v2/upload/multipart",
+            json=kwargs,
+            headers=self.corex_headers,
+        )
+
+    def put_upload_part(self, upload_id, part_number, data):
+        """Send one part of a chunked upload.
+
+        Endpoint: /v2/upload/multipart/{upload_id}/parts/{part_number}
+
+        Returns:
+            class:`Response <Response>` object with the ``etag`` of part.
+        """
+        headers = dict(
+            self.corex_headers, **{"Content-Type": "application/octet-stream"}
+        )
+        return self.requests_(
+            http="PUT",
+            url="/v2/upload/multipart/%s/parts/%d" % (upload_id, part_number),
+            data=data,
+            headers=headers,
+        )
+
+    def post_upload_multipart_complete(self, upload_id, parts):
+        """Commit the sent parts of a chunked upload and setup data.
+
+        Endpoint: /v2/upload/multipart/{upload_id}/complete
+
+        Returns:
+            class:`Response <Response>` object of the upload task.
+        """
+        return self.requests_(
+            http="POST",
+            url="/v2/upload/multipart/%s/complete" % upload_id,
+            json={"parts": parts},
+            headers=self.corex_headers,
+        )
+
+    def delete_upload_multipart(self, upload_id):
+        """Abort a chunked upload and drop its parts.
+
+        Endpoint: /v2/upload/multipart/{upload_id}
+
+        Returns:
+            class:`Response <Response>` object
+        """
+        return self.requests_(http="DELETE", url="/v2/upload/multipart/%s" % upload_id)
+
+    def post_upload_chunked(self, **kwargs):
+        """Upload csv file in parts sent concurrently, then setup data.
+
+        Split the file into parts of ``part_size`` bytes and send them from
+        ``max_workers`` threads over the pooled connections. A part failing
+        to send is retried alone, so a broken connection never restarts the
+        upload from the first byte. The upload is committed after all parts
+        are sent, or aborted if a part runs out of retries.
+
+        Endpoint: /v2/upload/multipart
+
+        Keyword Arguments:
+            filename (str): Name of the csv file.
+            file (file-like): Object with read(size), read sequentially.
+            size (int): (opt) Size of the file in bytes.
+            eda (bool): (opt) Whether to perform eda on data upload.
+            part_size (int): (opt) Bytes of each part.
+            max_workers (int): (opt) Parts sent at the same time.
+            max_retries (int): (opt) Retries of each part.
+            backoff_factor (float): (opt) Sleep backoff_factor * 2 ** retry
+                seconds before retrying a part.
+
+        Returns:
+            class:`Response <Response>` object of the upload task.
+
+        Raises:
+            Exception: If a part fails after all retries.
+        """
+        part_size = kwargs.get("part_size", MULTIPART_PART_SIZE)
+        init = {"filename": kwargs["filename"], "part_size": part_size}
+        if kwargs.get("size") is not None:
+            init["size"] = kwargs["size"]
+        if "eda" in kwargs:
+            init["eda"] = kwargs["eda"]
+        upload_id = check_response(
+            self.post_upload_multipart_init(**init), key="upload_id"
+        ).json()["upload_id"]
+
+        file = kwargs["file"]
+        lock = threading.Lock()
+        next_part = [1]
+        failed = threading.Event()
+
+        def read_part():
+            with lock:
+                if failed.is_set():
+                    return None, b""
+                data = file.read(part_size)
+                part_number = next_part[0]
+                next_part[0] += 1
+            if isinstance(data, str):
+                data = data.encode("utf-8")
+            return part_number, data
+
+        def send_parts():
+            parts = []
+            while True:
+                part_number, data = read_part()
+                if not data:
+                    return parts
+                try:
+                    etag = self._put_part_with_retry(
+                        upload_id,
+                        part_number,
+                        data,
+                        kwargs.get("max_retries", 3),
+                        kwargs.get("backoff_factor", 0.5),
+                    )
+                except Exception:
+                    failed.set()
+                    raise
+                parts.append({"part_number": part_number, "etag": etag})
+
+        max_workers = kwargs.get("max_workers", MULTIPART_WORKERS)
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [executor.submit(send_parts) for _ in range(max_workers)]
+                parts = [part for future in futures for part in future.result()]
+        except Exception:
+            logger.error("[Core] Abort chunked upload %s", upload_id)
+            self.delete_upload_multipart(upload_id)
+            raise
+
+        parts.sort(key=lambda part: part["part_number"])
+        logger.debug(
+            "[Core] Commit chunked upload %s of %d parts", upload_id, len(parts)
+        )
+        return self.post_upload_multipart_complete(upload_id, parts)
+
+    def _put_part_with_retry(
+        self, upload_id, part_number, data, max_retries, backoff_factor
+    ):
+        """Send a part until it succeeds or retries run out.
+
+        Returns:
+            str: The etag of part, None if the server doesn't return one.
+        """
+        for retry in range(max_retries + 1):
+            try:
+                resp = check_response(
+                    self.put_upload_part(upload_id, part_number, data)
+                )
+                etag = resp.headers.get("ETag")
+                if etag is None and resp.content:
+                    etag = resp.json().get("etag")
+                return etag
+            except Exception as err:  # pylint: disable=broad-except
+                if retry == max_retries:
+                    raise Exception(
+                        "[Core] Part %d of upload %s failed: %s"
+                        % (part_number, upload_id, err)
+                    )
+                logger.warning(
+                    "[Core] Retry part %d of upload %s: %s", part_number, upload_id, err
+                )
+                time.sleep(backoff_factor * 2 ** retry)
+        return None
+
     def get_tasks_by_id(self, task_id):
         """Get the task by task_id.
 
@@ -197,6 +459,18 @@ class CoreAPI:
         """
         return self.requests_(http="GET", url="/tasks")
 
+    def post_tasks_bulk(self, url, task_ids):
+        """Get many tasks with one request to a bulk endpoint.
+
+        Endpoint: configured by caller, body {"ids": [task_id...]}
+
+        Returns:
+            class:`Response <Response>` object
+        """
+        return self.requests_(
+            http="POST", url=url, json={"ids": task_ids}, headers=self.corex_headers
+        )
+
     def put_tasks_stop_by_id(self, task_id):
         """Stop a running or pending task.
 
@@ -209,89 +483,108 @@ class CoreAPI:
             http="PUT", url="/v2/tasks/%s/stop" % task_id, headers=self.corex_headers
         )
 
-    def post_tasks_setup(self, **kwargs):
+    def post_task_(self, url, wire=None, **kwargs):
+        """Post the request body of a task.
+
+        Args:
+            url: string, url endpoint.
+            wire: (opt) bytes, JSON request body already serialized, e.g.
+                by :meth:`~decanter.core.core_api.body_obj.CoreBodyObj.to_wire`.
+            kwargs: Request body as JSON Python object, if wire isn't given.
+
+        Returns:
+            class:`Response <Response>` object
+        """
+        if wire is None:
+            return self.requests_(
+                http="POST", url=url, json=kwargs, headers=self.corex_headers
+            )
+        headers = dict(self.corex_headers, **{"Content-Type": "application/json"})
+        return self.requests_(http="POST", url=url, data=wire, headers=headers)
+
+    def post_tasks_setup(self, wire=None, **kwargs):
         """Setup data reference.
 
         Endpoint: /v2/tasks/setup
 
+        Args:
+            wire: (opt) bytes, serialized request body sent instead of
+                kwargs.
+
         Returns:
             class:`Response <Response>` object
         """
-        return self.requests_(
-            http="POST", url="/v2/tasks/setup", json=kwargs, headers=self.corex_headers
-        )
+        return self.post_task_("/v2/tasks/setup", wire, **kwargs)
 
-    def post_tasks_train(self, **kwargs):
+    def post_tasks_train(self, wire=None, **kwargs):
         """Train model from data reference.
 
         Endpoint: /v2/task/train
 
+        Args:
+            wire: (opt) bytes, serialized request body sent instead of
+                kwargs.
+
         Returns:
             class:`Response <Response>` object
         """
-        return self.requests_(
-            http="POST", url="/v2/tasks/train", json=kwargs, headers=self.corex_headers
-        )
+        return self.post_task_("/v2/tasks/train", wire, **kwargs)
 
-    def post_tasks_cluster_train(self, **kwargs):
+    def post_tasks_cluster_train(self, wire=None, **kwargs):
         """Train model from data reference.
 
         Endpoint: /v2/tasks/cluster_train
 
+        Args:
+            wire: (opt) bytes, serialized request body sent instead of
+                kwargs.
+
         Returns:
             class:`Response <Response>` object
         """
-        return self.requests_(
-            http="POST",
-            url="/v2/tasks/cluster_train",
-            json=kwargs,
-            headers=self.corex_headers,
-        )
+        return self.post_task_("/v2/tasks/cluster_train", wire, **kwargs)
 
-    def post_tasks_auto_ts_train(self, **kwargs):
+    def post_tasks_auto_ts_train(self, wire=None, **kwargs):
         """Train time series forecast multi model from data reference.
 
         Endpoint: /v2/tasks/auto_ts/train
 
+        Args:
+            wire: (opt) bytes, serialized request body sent instead of
+                kwargs.
+
         Returns:
             class:`Response <Response>` object
         """
-        return self.requests_(
-            http="POST",
-            url="/v2/tasks/auto_ts/train",
-            json=kwargs,
-            headers=self.corex_headers,
-        )
+        return self.post_task_("/v2/tasks/auto_ts/train", wire, **kwargs)
 
-    def post_tasks_predict(self, **kwargs):
+    def post_tasks_predict(self, wire=None, **kwargs):
         """Predict from model.
 
         Endpoint: /v2/tasks/predict
 
+        Args:
+            wire: (opt) bytes, serialized request body sent instead of
+                kwargs.
+
         Returns:
             class:`Response <Response>` object
         """
-        return self.requests_(
-            http="POST",
-            url="/v2/tasks/predict",
-            json=kwargs,
-            headers=self.corex_headers,
-        )
+        return self.post_task_("/v2/tasks/predict", wire, **kwargs)
 
-    def post_tasks_auto_ts_predict(self, **kwargs):
+    def post_tasks_auto_ts_predict(self, wire=None, **kwargs):
         """Predict from time series forecast model.
 
         Endpoint: /v2/tasks/auto_ts/predict
 
+        Args:
+            wire: (opt) bytes, serialized request body sent instead of
+                kwargs.
+
         Returns:
             class:`Response <Response>` object
         """
-        return self.requests_(
-            http="POST",
-            url="/v2/tasks/auto_ts/predict",
-            json=kwargs,
-            headers=self.corex_headers,
-        )
+        return self.post_task_("/v2/tasks/auto_ts/predict", wire, **kwargs)
 
     def batch_predict(self, model_id, **kwargs):
         """
@@ -305,6 +598,10 @@ class CoreAPI:
             timestamp_format (string) (optional)
         Returns (json):
         ---------------
+            list of one result per feature, in any order, each with
+            index (int), the position of its feature in featuresList,
+            predict_status (string) and result (dict), or these results
+            under data.
         """
         url = "/v2/models/%s/batch_predict" % model_id
         if "timestamp_format" not in kwargs:
@@ -322,7 +619,7 @@ class CoreAPI:
         Returns:
             class:`Response <Response>` object
         """
-        return self.requests_(http="GET", url="/v2/experiments/%s" % exp_id)
+        return self.get_metadata_(url="/v2/experiments/%s" % exp_id)
 
     def get_models_by_id(self, exp_id, model_id):
         """Get model metadata.
@@ -332,8 +629,8 @@ class CoreAPI:
         Returns:
             class:`Response <Response>` object
         """
-        return self.requests_(
-            http="GET", url="/v2/experiments/%s/models/%s" % (exp_id, model_id)
+        return self.get_metadata_(
+            url="/v2/experiments/%s/models/%s" % (exp_id, model_id)
         )
 
     def get_models_download_by_id(self, model_id):
@@ -354,8 +651,8 @@ class CoreAPI:
         Returns:
             class:`Response <Response>` object
         """
-        return self.requests_(
-            http="GET", url="/v2/auto_ts/experiments/%s/models/%s" % (exp_id, model_id)
+        return self.get_metadata_(
+            url="/v2/auto_ts/experiments/%s/models/%s" % (exp_id, model_id)
         )
 
     def get_worker_count(self):
@@ -0,0 +1,362 @@
+# pylint: disable=invalid-overridden-method,arguments-differ
+"""Handle sending Decanter Core API requests on the event loop.
+
+Every endpoint of :class:`~decanter.core.core_api.api.CoreAPI` is available
+as an awaitable, sharing one bounded connection pool instead of pushing
+blocking requests into the default thread-pool executor.
+
+  Basic Usage::
+
+    core_service = AsyncCoreAPI(max_connections=100)
+    response = await core_service.get_tasks_by_id(task_id)
+    await core_service.close()
+
+Requires the optional ``aiohttp`` package
+(``pip install decanter-ai-core-sdk[async]``).
+:meta private:
+"""
+import asyncio
+import base64
+import json as json_
+import logging
+
+from requests.structures import CaseInsensitiveDict
+from requests_toolbelt import MultipartEncoder
+from urllib3.util.retry import Retry
+
+from decanter.core.core_api.api import (
+    MULTIPART_PART_SIZE,
+    MULTIPART_WORKERS,
+    CoreAPI,
+)
+from decanter.core.core_api.transport import (
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_READ_TIMEOUT,
+)
+from decanter.core.extra.utils import check_response
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None
+
+logger = logging.getLogger(__name__)
+
+# Same retry policy as the urllib3 Retry mounted on the requests session.
+RETRY_TOTAL = 5
+RETRY_BACKOFF_FACTOR = 0.1
+RETRY_STATUS = [500, 502, 503, 504]
+# Methods retried once the request may have reached the server, as urllib3,
+# so a POST of a task is never sent twice.
+RETRY_METHODS = Retry.DEFAULT_ALLOWED_METHODS
+
+
+async def iterate_in_executor(iterator):
+    """Yield the items of a blocking iterator, advanced in the default
+    executor so reading and compressing never stall the event loop."""
+    loop = asyncio.get_event_loop()
+    while True:
+        item = await loop.run_in_executor(None, next, iterator, None)
+        if item is None:
+            return
+        yield item
+
+
+class AsyncResponse:
+    """Fully read response of :class:`AsyncCoreAPI`.
+
+    Exposes the part of :class:`requests.Response` used by the SDK, so
+    :func:`~decanter.core.extra.utils.check_response` handles both.
+
+    Attributes:
+        status_code (int): HTTP status code.
+        content (bytes): Response body.
+        headers (dict): Response headers, case-insensitive.
+    """
+
+    def __init__(self, status_code, content, headers=None):
+        self.status_code = status_code
+        self.content = content
+        self.headers = CaseInsensitiveDict(headers or {})
+
+    @property
+    def text(self):
+        """str: Response body decoded as UTF-8."""
+        return self.content.decode("utf-8")
+
+    def json(self):
+        """Return the JSON-decoded body."""
+        return json_.loads(self.content)
+
+
+class AsyncCoreAPI(CoreAPI):
+    """Handle sending Decanter Core API requests with asyncio.
+
+    Inherit every endpoint from :class:`~decanter.core.core_api.api.CoreAPI`,
+    the endpoints return coroutines since :func:`requests_` is a coroutine.
+
+    Args:
+        max_connections (int): Max open connections of the pool.
+        max_connections_per_host (int): Max open connections to the same
+            host, 0 for no limit.
+        context (:class:`~decanter.core.context.Context`): (opt) Context
+            holding the credentials and host.
+        timeout (float or tuple): (opt) Seconds, or (connect, read) seconds,
+            to wait for each request. Defaults to the timeout of
+            :class:`~decanter.core.core_api.transport.TransportSettings`.
+    """
+
+    def __init__(
+        self,
+        max_connections=100,
+        max_connections_per_host=0,
+        context=None,
+        timeout=(DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT),
+    ):
+        if aiohttp is None:
+            raise ImportError(
+                "[Core] AsyncCoreAPI requires aiohttp, "
+                "install with 'pip install decanter-ai-core-sdk[async]'"
+            )
+        super().__init__(context=context, timeout=timeout)
+        self.max_connections = max_connections
+        self.max_connections_per_host = max_connections_per_host
+        self._session = None
+
+    def _get_session(self):
+        """Create the client session lazily on the running event loop."""
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.max_connections_per_host,
+                ssl=False,
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    async def close(self):
+        """Close the client session and release pooled connections."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    @staticmethod
+    def _client_timeout(timeout):
+        """Turn seconds or a (connect, read) tuple into aiohttp's timeout."""
+        if timeout is None:
+            return aiohttp.ClientTimeout(total=None)
+        if isinstance(timeout, tuple):
+            connect, read = timeout
+            return aiohttp.ClientTimeout(sock_connect=connect, sock_read=read)
+        return aiohttp.ClientTimeout(sock_connect=timeout, sock_read=timeout)
+
+    async def requests_(
+        self, http, url, json=None, data=None, headers=None, stream=False, timeout=None
+    ):
+        """Handle request sending to Decanter Core.
+
+        Args:
+            http: string, http method.
+            url: string, url endpoint.
+            json: (opt) JSON Python object to send in the request body.
+            data: (opt) bytes, or :class:`aiohttp.FormData` to send in the
+                body of request.
+            headers: (opt) dictionary, particular headers that decanter ai
+                support.
+            stream: (opt) bool, accepted for compatibility, the body is
+                always read before returning.
+            timeout: (opt) float or (connect, read) tuple, seconds to wait
+                for the server, defaults to :attr:`timeout`.
+
+        Returns:
+            class:`AsyncResponse <AsyncResponse>` object
+
+        Raises:
+            Exception: Occurred when raises ClientError
+                    or calling wrong http method.
+        """
+        if http not in ["GET", "POST", "PUT", "DELETE"]:
+            raise Exception("[Core] No such HTTP Method.")
+
+        basic_auth = "%s:%s" % (self.context.USERNAME, self.context.PASSWORD)
+        basic_auth = "Basic " + base64.b64encode(basic_auth.encode("latin1")).decode()
+        headers = dict(headers or {}, Authorization=basic_auth)
+        url = self.context.HOST + url
+        session = self._get_session()
+        timeout = self._client_timeout(self.timeout if timeout is None else timeout)
+        idempotent = http in RETRY_METHODS
+        for retry in range(RETRY_TOTAL + 1):
+            try:
+                async with session.request(
+                    http, url, json=json, data=data, headers=headers, timeout=timeout
+                ) as resp:
+                    content = await resp.read()
+                    if (
+                        not idempotent
+                        or resp.status not in RETRY_STATUS
+                        or retry == RETRY_TOTAL
+                    ):
+                        return AsyncResponse(resp.status, content, dict(resp.headers))
+            except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+                # a request failing to connect never reached the server
+                connect_error = isinstance(err, aiohttp.ClientConnectorError)
+                if retry == RETRY_TOTAL or not (idempotent or connect_error):
+                    logger.error("[Core] Request Failed :(")
+                    raise Exception(err)
+            await asyncio.sleep(RETRY_BACKOFF_FACTOR * (2 ** retry))
+        return None
+
+    def get_metadata_(self, url, cached=True):
+        """Get metadata without the context's metadata cache.
+
+        Returns:
+            Awaitable of class:`AsyncResponse <AsyncResponse>` object
+        """
+        return self.requests_(http="GET", url=url)
+
+    async def post_upload(self, **kwargs):
+        """Upload csv file and setup data.
+
+        Endpoint: /v2/upload
+
+        Keyword Arguments:
+            compressor (:class:`~decanter.core.extra.stream.Compressor`):
+                (opt) Compress the request body on the fly, the file is
+                read and compressed in the default executor.
+
+        Returns:
+            class:`AsyncResponse <AsyncResponse>` object
+        """
+        url = "/v2/upload"
+        if "eda" in kwargs and not kwargs["eda"]:
+            url = url + "?eda=true"
+        compressor = kwargs.get("compressor")
+        if compressor is not None:
+            csv = MultipartEncoder(
+                fields={
+                    "csv": (kwargs["filename"], kwargs["file"], kwargs["encoding"])
+                }
+            )
+            headers = dict(
+                self.corex_headers,
+                **{
+                    "Content-Type": csv.content_type,
+                    "Content-Encoding": compressor.content_encoding,
+                }
+            )
+            body = iterate_in_executor(compressor.compress_stream(csv))
+            return await self.requests_(
+                http="POST", url=url, data=body, headers=headers
+            )
+        csv = aiohttp.FormData()
+        csv.add_field(
+            "csv",
+            kwargs["file"],
+            filename=kwargs["filename"],
+            content_type=kwargs["encoding"],
+        )
+        return await self.requests_(
+            http="POST", url=url, data=csv, headers=self.corex_headers
+        )
+
+    async def post_upload_chunked(self, **kwargs):
+        """Upload csv file in parts sent concurrently, then setup data.
+
+        As :func:`~decanter.core.core_api.api.CoreAPI.post_upload_chunked`,
+        with ``max_workers`` coroutines sending the parts over the pooled
+        connections, and the file read in the default executor.
+
+        Returns:
+            class:`AsyncResponse <AsyncResponse>` object of the upload task.
+
+        Raises:
+            Exception: If a part fails after all retries.
+        """
+        part_size = kwargs.get("part_size", MULTIPART_PART_SIZE)
+        init = {"filename": kwargs["filename"], "part_size": part_size}
+        if kwargs.get("size") is not None:
+            init["size"] = kwargs["size"]
+        if "eda" in kwargs:
+            init["eda"] = kwargs["eda"]
+        resp = await self.post_upload_multipart_init(**init)
+        upload_id = check_response(resp, key="upload_id").json()["upload_id"]
+
+        file = kwargs["file"]
+        loop = asyncio.get_event_loop()
+        lock = asyncio.Lock()
+        next_part = [1]
+
+        async def read_part():
+            async with lock:
+                data = await loop.run_in_executor(None, file.read, part_size)
+                part_number = next_part[0]
+                next_part[0] += 1
+            if isinstance(data, str):
+                data = data.encode("utf-8")
+            return part_number, data
+
+        async def send_parts():
+            parts = []
+            while True:
+                part_number, data = await read_part()
+                if not data:
+                    return parts
+                etag = await self._put_part_with_retry(
+                    upload_id,
+                    part_number,
+                    data,
+                    kwargs.get("max_retries", 3),
+                    kwargs.get("backoff_factor", 0.5),
+                )
+                parts.append({"part_number": part_number, "etag": etag})
+
+        senders = [
+            asyncio.ensure_future(send_parts())
+            for _ in range(kwargs.get("max_workers", MULTIPART_WORKERS))
+        ]
+        try:
+            results = await asyncio.gather(*senders)
+        except Exception:
+            for sender in senders:
+                sender.cancel()
+            logger.error("[Core] Abort chunked upload %s", upload_id)
+            await self.delete_upload_multipart(upload_id)
+            raise
+
+        parts = sorted(
+            (part for result in results for part in result),
+            key=lambda part: part["part_number"],
+        )
+        logger.debug(
+            "[Core] Commit chunked upload %s of %d parts", upload_id, len(parts)
+        )
+        return await self.post_upload_multipart_complete(upload_id, parts)
+
+    async def _put_part_with_retry(
+        self, upload_id, part_number, data, max_retries, backoff_factor
+    ):
+        """Send a part until it succeeds or retries run out.
+
+        Returns:
+            str: The etag of part, None if the server doesn't return one.
+        """
+        for retry in range(max_retries + 1):
+            try:
+                resp = check_response(
+                    await self.put_upload_part(upload_id, part_number, data)
+                )
+                etag = resp.headers.get("ETag")
+                if etag is None and resp.content:
+                    etag = resp.json().get("etag")
+                return etag
+            except Exception as err:  # pylint: disable=broad-except
+                if retry == max_retries:
+                    raise Exception(
+                        "[Core] Part %d of upload %s failed: %s"
+                        % (part_number, upload_id, err)
+                    )
+                logger.warning(
+                    "[Core] Retry part %d of upload %s: %s", part_number, upload_id, err
+                )
+                await asyncio.sleep(backoff_factor * 2 ** retry)
+        return None
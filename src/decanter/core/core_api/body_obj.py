@@ -11,6 +11,11 @@ import json
 
 from decanter.core.extra.decorators import corex_obj
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
 
 class ComplexEncoder(json.JSONEncoder):
     """Extending JSONEncoder
@@ -29,25 +34,134 @@ class ComplexEncoder(json.JSONEncoder):
         return json.JSONEncoder.default(self, obj)
 
 
+def _jsonable(obj):
+    """Turn objects orjson doesn't know into what json would encode."""
+    if hasattr(obj, "jsonable"):
+        return obj.jsonable()
+    # named tuples, encoded as arrays by json
+    if isinstance(obj, tuple):
+        return list(obj)
+    raise TypeError("Object of type %s is not JSON serializable" % type(obj).__name__)
+
+
+def dumps(obj, backend=None):
+    """Serialize obj, CoreX Objects nested included, to JSON bytes.
+
+    Args:
+        obj: Object to serialize.
+        backend (str): ``orjson`` or ``json``, defaults to orjson if it is
+            installed.
+
+    Returns:
+        bytes: UTF-8 JSON, without whitespace.
+    """
+    if backend is None:
+        backend = "orjson" if orjson is not None else "json"
+    if backend == "orjson":
+        return orjson.dumps(obj, default=_jsonable, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, cls=ComplexEncoder, separators=(",", ":")).encode("utf-8")
+
+
+def _compile(cls):
+    """Generate the __init__ and jsonable methods of a CoreX Object.
+
+    The fields are unrolled into straight-line code once per class. The
+    arrays of CoreX Objects listed in ``_object_arrays`` are turned into
+    dicts right away, sparing the JSON encoder a callback for each object
+    of wide request bodies.
+
+    Returns:
+        dict: The methods by name.
+    """
+    fields = cls._fields
+    lines = ["def __init__(self, *, %s):" % ", ".join("%s=None" % f for f in fields)]
+    lines += ["    self.%s = %s" % (field, field) for field in fields] or ["    pass"]
+    lines += ["def jsonable(self):", "    body = {}"]
+    for field in fields:
+        lines += ["    val = self.%s" % field, "    if val is not None:"]
+        if field in cls._object_arrays:
+            lines.append(
+                "        val = [item.jsonable() if isinstance(item, CoreBodyObj)"
+                " else item for item in val]"
+            )
+        lines.append("        body[%r] = val" % field)
+    lines.append("    return body")
+    methods = {}
+    # pylint: disable=exec-used
+    exec("\n".join(lines), {"CoreBodyObj": CoreBodyObj}, methods)
+    for name, method in methods.items():
+        method.__qualname__ = "%s.%s" % (cls.__name__, name)
+        method.__doc__ = getattr(CoreBodyObj, name).__doc__
+    return methods
+
+
 class CoreBodyObj:
     """Base class of all CoreX Object.
 
+    Each CoreX Object declares its fields in ``__slots__``, so objects
+    hold no ``__dict__`` and unknown fields are rejected when created.
+    Fields left None are omitted from the request body.
+
     Has the jsonable function to return the Dictionary of object.
 
     """
 
+    __slots__ = ()
+    _object_arrays = ()
+
+    def __init_subclass__(cls, **kwargs):
+        """Collect the fields and compile the methods of a CoreX Object."""
+        super().__init_subclass__(**kwargs)
+        if "__slots__" not in cls.__dict__:
+            raise TypeError("CoreX Object %s must declare __slots__" % cls.__name__)
+        fields = tuple(
+            field
+            for klass in reversed(cls.__mro__)
+            for field in klass.__dict__.get("__slots__", ())
+        )
+        cls._fields = fields
+        for name, method in _compile(cls).items():
+            setattr(cls, name, method)
+
     def __init__(self, **kwargs):
         """Add the argument pass in as attributes."""
-        self.__dict__.update((k, v) for k, v in kwargs.items() if v is not None)
+
+    def __repr__(self):
+        return "%s(%s)" % (
+            self.__class__.__name__,
+            ", ".join("%s=%r" % item for item in self.jsonable().items()),
+        )
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return all(
+            getattr(self, field) == getattr(other, field) for field in self._fields
+        )
+
+    __hash__ = None
 
     def jsonable(self):
         """Reutrn the Dictionary of Object"""
-        return self.__dict__
+        return {}
+
+    def to_wire(self, backend=None):
+        """Return the JSON bytes of the request body, serialized once.
+
+        Args:
+            backend (str): (opt) See :func:`dumps`.
+
+        Returns:
+            bytes
+        """
+        return dumps(self, backend=backend)
 
 
 class CVTrain(CoreBodyObj):
     """Specification for the train fold"""
 
+    __slots__ = ("start", "end")
+
     @classmethod
     @corex_obj(required={"start", "end"})
     def create(cls, **kwargs):
@@ -58,8 +172,10 @@ class CVTrain(CoreBodyObj):
 class CVObject(CoreBodyObj):
     """The specifications for the cross validation folds"""
 
+    __slots__ = ("train", "test")
+
     @classmethod
-    @corex_obj(required={"cvTrain", "cvTest"})
+    @corex_obj(required={"train", "test"})
     def create(cls, **kwargs):
         """Return CVObject object with passed kwargs as attributes"""
         return cls(**kwargs)
@@ -68,6 +184,8 @@ class CVObject(CoreBodyObj):
 class Column(CoreBodyObj):
     """The column names of the data"""
 
+    __slots__ = ("id", "data_type", "nullable")
+
     @classmethod
     @corex_obj(required={"id", "data_type"})
     def create(cls, **kwargs):
@@ -79,6 +197,9 @@ class TimeSeriesSplit(CoreBodyObj):
     """The specifications for the folds in time series cross validation.
     Cannot be used if nfold is specified"""
 
+    __slots__ = ("split_by", "cv", "train", "test")
+    _object_arrays = ("cv",)
+
     @classmethod
     @corex_obj(required={"split_by", "cv", "train"})
     def create(cls, **kwargs):
@@ -90,6 +211,32 @@ class TrainBody(CoreBodyObj):
     """The specifications for the folds in time series cross validation.
     Cannot be used if nfold is specified"""
 
+    __slots__ = (
+        "target",
+        "train_data_id",
+        "algos",
+        "callback",
+        "test_base_id",
+        "test_data_id",
+        "evaluator",
+        "features",
+        "feature_types",
+        "max_run_time",
+        "max_model",
+        "tolerance",
+        "nfold",
+        "time_series_split",
+        "seed",
+        "balance_class",
+        "max_after_balance",
+        "sampling_factors",
+        "validation_percentage",
+        "holdout_percentage",
+        "apu",
+        "preprocessing",
+        "version",
+    )
+
     @classmethod
     @corex_obj(required={"target", "train_data_id", "algos"})
     def create(cls, **kwargs):
@@ -100,6 +247,16 @@ class TrainBody(CoreBodyObj):
 class ClusterTrainBody(CoreBodyObj):
     """ClusterTrainBody"""
 
+    __slots__ = (
+        "train_data_id",
+        "callback",
+        "features",
+        "feature_types",
+        "seed",
+        "k",
+        "version",
+    )
+
     @classmethod
     @corex_obj(required={"train_data_id"})
     def create(cls, **kwargs):
@@ -110,6 +267,17 @@ class ClusterTrainBody(CoreBodyObj):
 class ModelBuildControl(CoreBodyObj):
     """Model build control"""
 
+    __slots__ = (
+        "tolerance",
+        "validation_percentage",
+        "max_model",
+        "seed",
+        "evaluator",
+        "max_run_time",
+        "nfold",
+        "algos",
+    )
+
     @classmethod
     @corex_obj(required=None)
     def create(cls, **kwargs):
@@ -120,6 +288,8 @@ class ModelBuildControl(CoreBodyObj):
 class GeneticAlgorithmParams(CoreBodyObj):
     """The Genetic Algorithm parameters to be used in Auto Time Series"""
 
+    __slots__ = ("max_iteration", "generation_size", "mutation_rate", "crossover_rate")
+
     @classmethod
     @corex_obj(required=None)
     def create(cls, **kwargs):
@@ -144,6 +314,19 @@ class GeneticAlgorithmParams(CoreBodyObj):
 class BuildControl(CoreBodyObj):
     """Model build control."""
 
+    __slots__ = (
+        "genetic_algorithm",
+        "tolerance",
+        "validation_percentage",
+        "max_model",
+        "seed",
+        "evaluator",
+        "max_run_time",
+        "nfold",
+        "algos",
+        "train_fusion_model",
+    )
+
     @classmethod
     @corex_obj(required={"genetic_algorithm"})
     def create(cls, **kwargs):
@@ -154,6 +337,14 @@ class BuildControl(CoreBodyObj):
 class ModelSpec(CoreBodyObj):
     """The model specification"""
 
+    __slots__ = (
+        "endogenous_features",
+        "exogenous_features",
+        "feature_types",
+        "time_groups",
+        "max_window_for_feature_derivation",
+    )
+
     @classmethod
     @corex_obj(required={"endogenous_features"})
     def create(cls, **kwargs):
@@ -164,6 +355,8 @@ class ModelSpec(CoreBodyObj):
 class TSGroupBy(CoreBodyObj):
     """Time series group by."""
 
+    __slots__ = ("time_unit", "numerical_groupby_method", "categorical_groupby_method")
+
     @classmethod
     @corex_obj(required=None)
     def create(cls, **kwargs):
@@ -174,6 +367,21 @@ class TSGroupBy(CoreBodyObj):
 class InputSpec(CoreBodyObj):
     """The input specification"""
 
+    __slots__ = (
+        "train_data_id",
+        "target",
+        "endogenous_features",
+        "exogenous_features",
+        "datetime_column",
+        "forecast_horizon",
+        "gap",
+        "feature_types",
+        "time_groups",
+        "max_window_for_feature_derivation",
+        "group_by",
+        "holdout_percentage",
+    )
+
     @classmethod
     @corex_obj(
         required={
@@ -192,6 +400,19 @@ class InputSpec(CoreBodyObj):
 class BuildSpec(CoreBodyObj):
     """Attribute for TrainAutoTSBody."""
 
+    __slots__ = (
+        "tolerance",
+        "validation_percentage",
+        "max_model",
+        "seed",
+        "evaluator",
+        "max_run_time",
+        "genetic_algorithm",
+        "nfold",
+        "algos",
+        "train_fusion_model",
+    )
+
     @classmethod
     @corex_obj(required={"genetic_algorithm"})
     def create(cls, **kwargs):
@@ -202,6 +423,8 @@ class BuildSpec(CoreBodyObj):
 class TrainAutoTSBody(CoreBodyObj):
     """Body for auto time series train api."""
 
+    __slots__ = ("callback", "version", "build_spec", "input_spec")
+
     @classmethod
     @corex_obj(required={"build_spec", "input_spec"})
     def create(cls, **kwargs):
@@ -212,6 +435,15 @@ class TrainAutoTSBody(CoreBodyObj):
 class PredictBody(CoreBodyObj):
     """Body for predict api."""
 
+    __slots__ = (
+        "data_id",
+        "model_id",
+        "callback",
+        "keep_columns",
+        "threshold",
+        "version",
+    )
+
     @classmethod
     @corex_obj(required={"data_id", "model_id"})
     def create(cls, **kwargs):
@@ -222,6 +454,8 @@ class PredictBody(CoreBodyObj):
 class PredictBodyTSModel(CoreBodyObj):
     """Body for predict time series forecast model api."""
 
+    __slots__ = ("data_id", "model_id", "callback", "threshold_max_by", "version")
+
     @classmethod
     @corex_obj(required={"data_id", "model_id"})
     def create(cls, **kwargs):
@@ -232,6 +466,17 @@ class PredictBodyTSModel(CoreBodyObj):
 class SetupBody(CoreBodyObj):
     """Body for setup api."""
 
+    __slots__ = (
+        "data_source",
+        "data_id",
+        "callback",
+        "eda",
+        "data_columns",
+        "preprocessing",
+        "version",
+    )
+    _object_arrays = ("data_columns",)
+
     @classmethod
     @corex_obj(required={"data_source", "data_columns"})
     def create(cls, **kwargs):
@@ -242,6 +487,8 @@ class SetupBody(CoreBodyObj):
 class Accessor(CoreBodyObj):
     """Data accessor"""
 
+    __slots__ = ("uri", "format")
+
     @classmethod
     @corex_obj(required={"uri", "format"})
     def create(cls, **kwargs):
@@ -272,7 +519,7 @@ def cv_obj_array(cv):
         cv_objs = []
         for cv_obj in cv:
             try:
-                cv_objs.append(Column(train=cv_obj["train"], test=cv_obj["test"]))
+                cv_objs.append(CVObject(train=cv_obj["train"], test=cv_obj["test"]))
             except KeyError as err:
                 raise ValueError("missing required value in cv types %s" % err)
         return cv_objs
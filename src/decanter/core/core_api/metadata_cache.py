@@ -0,0 +1,197 @@
+"""Cache metadata of finished experiments, models and data.
+
+Metadata whose ``status`` is done can't change anymore, so it is served
+from the cache without any request. Other responses with an ``ETag`` are
+kept to be revalidated with ``If-None-Match``, answered by a 304 without
+body if unchanged.
+
+  Basic Usage::
+
+    context = Context.create(
+        username='usr', password='pwd', host='decantercoreserver',
+        metadata_cache=MetadataCache(maxsize=4096, path='~/.decanter/meta'))
+"""
+import collections
+import hashlib
+import json
+import logging
+import os
+import threading
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+from decanter.core.extra import CoreStatus
+
+logger = logging.getLogger(__name__)
+
+
+class MetadataCache:
+    """Bounded LRU of metadata responses with optional on-disk store.
+
+    Args:
+        maxsize (int): Entries kept in memory, the least recently used one
+            is evicted first.
+        path (str): (opt) Directory storing entries on disk, read when an
+            entry isn't in memory, e.g. after restarting the process.
+
+    Attributes:
+        hits (int): Responses served from the cache, including revalidated.
+        misses (int): Responses fetched from Decanter Core.
+        revalidated (int): Hits confirmed by a 304 Not Modified.
+    """
+
+    def __init__(self, maxsize=1024, path=None):
+        self.maxsize = maxsize
+        self.path = os.path.expanduser(path) if path is not None else None
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self._entries = collections.OrderedDict()
+        self._lock = threading.Lock()
+        if self.path is not None:
+            os.makedirs(self.path, exist_ok=True)
+
+    @staticmethod
+    def is_immutable(body):
+        """Whether the metadata can't change anymore.
+
+        True for a done ``status``, or no status but a ``completed_at``
+        time such as models.
+        """
+        if not isinstance(body, dict):
+            return False
+        if body.get("status") in CoreStatus.DONE_STATUS:
+            return True
+        return "status" not in body and bool(body.get("completed_at"))
+
+    @staticmethod
+    def entry_key(url, user=None):
+        """Get the key of the entry of url seen by user.
+
+        Users may be allowed to see different metadata on the same host,
+        so entries of each user are kept apart.
+        """
+        return url if user is None else "%s %s" % (user, url)
+
+    def _file(self, key):
+        name = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.path, name + ".json")
+
+    def _remember(self, key, entry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def lookup(self, key):
+        """Get the entry of key from memory, else from disk.
+
+        Returns:
+            dict: ``content``, ``etag`` and ``immutable`` of the entry, None
+            if it isn't cached.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+        if self.path is None or not os.path.isfile(self._file(key)):
+            return None
+        try:
+            with open(self._file(key), "r", encoding="utf-8") as file:
+                entry = json.load(file)
+        except (OSError, ValueError) as err:
+            logger.debug("[MetadataCache] skip unreadable entry: %s", err)
+            return None
+        with self._lock:
+            self._remember(key, entry)
+        return entry
+
+    def store(self, key, resp):
+        """Keep a successful response if immutable or revalidatable."""
+        try:
+            body = resp.json()
+        except ValueError:
+            return
+        entry = {
+            "content": resp.text,
+            "etag": resp.headers.get("ETag"),
+            "immutable": self.is_immutable(body),
+        }
+        if not entry["immutable"] and entry["etag"] is None:
+            return
+        with self._lock:
+            self._remember(key, entry)
+        if self.path is not None:
+            tmp_path = "%s.%d.tmp" % (self._file(key), os.getpid())
+            with open(tmp_path, "w", encoding="utf-8") as file:
+                json.dump(entry, file)
+            os.replace(tmp_path, self._file(key))
+
+    @staticmethod
+    def _response(url, entry):
+        resp = requests.Response()
+        resp.status_code = 200
+        resp.url = url
+        resp.encoding = "utf-8"
+        resp._content = entry["content"].encode("utf-8")  # pylint: disable=W0212
+        resp.headers = CaseInsensitiveDict({"Content-Type": "application/json"})
+        if entry.get("etag") is not None:
+            resp.headers["ETag"] = entry["etag"]
+        return resp
+
+    def get(self, url, fetch, user=None):
+        """Get the response of url from the cache or by fetch.
+
+        Args:
+            url (str): Host and url of the metadata.
+            fetch (func): Send the request, accepts ``headers``.
+            user (str): (opt) User sending the request, see
+                :meth:`entry_key`.
+
+        Returns:
+            class:`Response <Response>` object
+        """
+        key = self.entry_key(url, user)
+        entry = self.lookup(key)
+        if entry is not None and entry["immutable"]:
+            with self._lock:
+                self.hits += 1
+            return self._response(url, entry)
+
+        headers = None
+        if entry is not None and entry.get("etag") is not None:
+            headers = {"If-None-Match": entry["etag"]}
+        resp = fetch(headers=headers)
+        if entry is not None and resp.status_code == 304:
+            with self._lock:
+                self.hits += 1
+                self.revalidated += 1
+            return self._response(url, entry)
+
+        with self._lock:
+            self.misses += 1
+        if 200 <= resp.status_code < 300:
+            self.store(key, resp)
+        return resp
+
+    def stats(self):
+        """Get the counters of cache.
+
+        Returns:
+            dict: hits, misses, revalidated and entries in memory.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "revalidated": self.revalidated,
+                "size": len(self._entries),
+            }
+
+    def clear(self):
+        """Drop the entries in memory and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.revalidated = 0
@@ -12,7 +12,7 @@ import logging
 from decanter.core.core_api import CoreAPI
 from decanter.core.extra import CoreStatus, CoreKeys
 from decanter.core.extra.decorators import block_method
-from decanter.core.extra.utils import check_response
+from decanter.core.extra.utils import bounded_map, check_response
 
 
 logger = logging.getLogger(__name__)
@@ -21,6 +21,9 @@ logger = logging.getLogger(__name__)
 class Model:
     """Model from training.
 
+    A model bound by :meth:`bind` is a lazy proxy, its metadata is fetched
+    the first time one of :attr:`METADATA` attributes is accessed.
+
     Attributes:
         get_model: Function to get models metadata.
         download_model: Function to get model mojo file.
@@ -37,29 +40,100 @@ class Model:
         completed_at (str): The time the model was completed_at.
     """
 
+    METADATA = [
+        "key",
+        "name",
+        "importances",
+        "attributes",
+        "hyperparameters",
+        "created_at",
+        "updated_at",
+        "completed_at",
+    ]
+    "list(str): Attributes fetched from the model's metadata."
+
     def __init__(self):
         self.get_model = CoreAPI().get_models_by_id
         self.download_model = CoreAPI().get_models_download_by_id
         self.task_status = CoreStatus.PENDING
         self.id = None
-        self.key = None
-        self.name = None
         self.exp_id = None
-        self.importances = None
-        self.attributes = None
-        self.hyperparameters = None
-        self.created_at = None
-        self.updated_at = None
-        self.completed_at = None
+        self._unfetched = False
+        for attr in self.METADATA:
+            setattr(self, attr, None)
+
+    def __getattr__(self, attr):
+        """Fetch the metadata on the first access of an unfetched attribute."""
+        if attr in type(self).METADATA and self.__dict__.get("_unfetched"):
+            self.fetch()
+            return self.__dict__.get(attr)
+        raise AttributeError(
+            "'%s' object has no attribute '%s'" % (self.__class__.__name__, attr)
+        )
+
+    @property
+    def is_fetched(self):
+        """bool: False if the metadata is waiting for the first access."""
+        return not self._unfetched
+
+    def bind(self, exp_id, model_id):
+        """Point the model at exp_id and model_id without any request.
+
+        The metadata is fetched the first time one of :attr:`METADATA`
+        attributes is accessed, or by :meth:`fetch` and :meth:`prefetch`.
+        ``id`` and ``exp_id`` are available right away.
+
+        Args:
+            exp_id (str): The experiment ID of the model.
+            model_id (str): ObjectId in 24 hex digits.
+        """
+        for attr in self.METADATA:
+            self.__dict__.pop(attr, None)
+        self.exp_id = exp_id
+        self.id = model_id
+        self._unfetched = True
+
+    def use_context(self, context):
+        """Get and download the model from the host of context.
+
+        Args:
+            context (:class:`~decanter.core.context.Context`): Context of
+                an isolated :class:`~decanter.core.client.CoreClient`.
+        """
+        core_service = CoreAPI(context)
+        self.get_model = core_service.get_models_by_id
+        self.download_model = core_service.get_models_download_by_id
+
+    def fetch(self):
+        """Fetch the metadata of the bound model if it isn't fetched yet."""
+        if self._unfetched:
+            self.update(self.exp_id, self.id)
+
+    @classmethod
+    def prefetch(cls, models, concurrency=8):
+        """Fetch the metadata of many bound models concurrently.
+
+        Args:
+            models (list(:class:`Model`)): Models to fetch, models already
+                fetched are skipped.
+            concurrency (int): Requests in flight at the same time.
+
+        Returns:
+            list: None for each fetched model, or the exception raised when
+            fetching it, in the order of models.
+        """
+        return bounded_map(lambda model: model.fetch(), models, concurrency)
 
     @classmethod
-    def create(cls, exp_id, model_id):
+    def create(cls, exp_id, model_id, context=None):
         """Create :class:`Model` or :class:`MultiModel` depends on which
         instance type has called.
 
         Args:
             exp_id (str): The experiment ID of the model.
             model_id (str): ObjectId in 24 hex digits.
+            context (:class:`~decanter.core.context.Context`): (opt) Context
+                of an isolated client to get the model from.
 
         Returns:
             :class:`~decanter.core.core_api.model.Model` or :class:`~decanter.\
@@ -70,18 +144,38 @@ class Model:
                 server when getting model's metadata.
         """
         model = cls()
-        get_models_resp = check_response(model.get_model(exp_id, model_id)).json()
-        try:
-            for attr, val in get_models_resp.items():
-                if attr == CoreKeys.id.value:
-                    attr = CoreKeys.id.name
-                model.__dict__.update({attr: val})
-        except AttributeError:
-            logger.error("[Model] No result from decanter.core.")
-
-        model.task_status = CoreStatus.DONE
+        if context is not None:
+            model.use_context(context)
+        model.update(exp_id, model_id)
         return model
 
+    @classmethod
+    def create_many(cls, pairs, concurrency=8, context=None):
+        """Create models by (exp_id, model_id) pairs, fetching them
+        concurrently.
+
+        Example:
+            .. code-block:: python
+
+                exps = Experiment.create_many(exp_ids)
+                models = Model.create_many(
+                    [(exp.id, model_id) for exp in exps for model_id in exp.models])
+
+        Args:
+            pairs (list(tuple)): The experiment ID and ObjectId of each model.
+            concurrency (int): Requests in flight at the same time.
+            context (:class:`~decanter.core.context.Context`): (opt) Context
+                of an isolated client to get the models from.
+
+        Returns:
+            list: :class:`Model` or :class:`MultiModel` objects in the order
+            of pairs, with the exception raised when creating a model in its
+            place.
+        """
+        return bounded_map(
+            lambda pair: cls.create(*pair, context=context), pairs, concurrency
+        )
+
     def update(self, exp_id, model_id):
         """Update model attributes.
 
@@ -89,6 +183,9 @@ class Model:
         decanter server.
         """
         get_models_resp = check_response(self.get_model(exp_id, model_id)).json()
+        for attr in self.METADATA:
+            self.__dict__.setdefault(attr, None)
+        self._unfetched = False
         try:
             for attr, val in get_models_resp.items():
                 if attr == CoreKeys.id.value:
@@ -170,24 +267,31 @@ class MultiModel(Model):
         completed_at (str): The time the model was completed_at.
     """
 
+    METADATA = [
+        "name",
+        "attributes",
+        "predictionPipeline",
+        "hyperparameters",
+        "created_at",
+        "updated_at",
+        "completed_at",
+    ]
+
     def __init__(self):
+        super().__init__()
         self.get_model = CoreAPI().get_multimodels_by_id
-        self.download_model = CoreAPI().get_models_download_by_id
-        self.task_status = CoreStatus.PENDING
-        self.id = None
-        self.name = None
-        self.exp_id = None
-        self.attributes = None
-        self.predictionPipeline = None
-        self.hyperparameters = None
-        self.created_at = None
-        self.updated_at = None
-        self.completed_at = None
+
+    def use_context(self, context):
+        """Get the multi model from the host of context."""
+        super().use_context(context)
+        self.get_model = CoreAPI(context).get_multimodels_by_id
 
     @classmethod
-    def create(cls, exp_id, model_id):
+    def create(cls, exp_id, model_id, context=None):
         """Create Multimodel. Inherit from :func:`Model.create`."""
-        return super(MultiModel, cls).create(exp_id=exp_id, model_id=model_id)
+        return super(MultiModel, cls).create(
+            exp_id=exp_id, model_id=model_id, context=context
+        )
 
     @classmethod
     def download_by_id(cls, model_id, model_path):
@@ -81,36 +81,179 @@ class PredictInput:
         Returns:
             :obj:`dict`
         """
-        if self.select_model == "best":
-            select_model_id = self.experiment.best_model.id
-        elif self.select_model == "model_id":
-            if self.select_opt in self.experiment.models:
-                select_model_id = self.select_opt
-            else:
-                logger.error(
-                    "[%s] Invalid input model ID: %s",
-                    self.__class__.__name__,
-                    self.select_opt,
-                )
-                raise ValueError("Invalid input model ID: %s" % self.select_opt)
-        elif self.select_model == "recommendation":
-            self.select_opt = check_is_enum(Evaluator, self.select_opt)
-            for rec in self.experiment.recommendations:
-                if self.select_opt == rec["evaluator"]:
-                    select_model_id = rec["model_id"]
-            if "select_model_id" not in locals().keys():
-                logger.error(
-                    "[%s] Invalid input metric: %s",
-                    self.__class__.__name__,
-                    self.select_opt,
-                )
-                raise ValueError("Invalid input metric: %s" % self.select_opt)
+        return json.loads(self.getPredictWire())
+
+    def getPredictWire(self):
+        """Serialize pred_body into the bytes of the request body.
+
+        Returns:
+            bytes
+        """
         setattr(self.pred_body, "data_id", self.data.id)
-        setattr(self.pred_body, "model_id", select_model_id)
+        setattr(self.pred_body, "model_id", self.select_model_id())
+        return self.pred_body.to_wire()
+
+    def select_model_id(self):
+        """Get the id of the model selected by select_model and select_opt.
+
+        Returns:
+            str: Model id.
+
+        Raises:
+            ValueError: If select_opt matches no model of the experiment.
+        """
+        return select_model_id(self)
+
+
+def select_model_id(predict_input):
+    """Get the id of the model selected by the settings of predict_input.
+
+    Shared by :class:`PredictInput` and :class:`PredictTemplate`.
+
+    Args:
+        predict_input: Settings with ``experiment``, ``select_model`` and
+            ``select_opt``, the latter normalized to an
+            :class:`~decanter.core.enums.evaluators.Evaluator` for
+            `recommendation`.
+
+    Returns:
+        str: Model id.
+
+    Raises:
+        ValueError: If select_opt matches no model of the experiment.
+    """
+    class_ = predict_input.__class__.__name__
+    experiment = predict_input.experiment
+    if predict_input.select_model == "best":
+        select_model_id_ = experiment.best_model.id
+    elif predict_input.select_model == "model_id":
+        if predict_input.select_opt in experiment.models:
+            select_model_id_ = predict_input.select_opt
+        else:
+            logger.error(
+                "[%s] Invalid input model ID: %s", class_, predict_input.select_opt
+            )
+            raise ValueError("Invalid input model ID: %s" % predict_input.select_opt)
+    elif predict_input.select_model == "recommendation":
+        predict_input.select_opt = check_is_enum(Evaluator, predict_input.select_opt)
+        for rec in experiment.recommendations:
+            if predict_input.select_opt == rec["evaluator"]:
+                select_model_id_ = rec["model_id"]
+        if "select_model_id_" not in locals().keys():
+            logger.error(
+                "[%s] Invalid input metric: %s", class_, predict_input.select_opt
+            )
+            raise ValueError("Invalid input metric: %s" % predict_input.select_opt)
+    return select_model_id_
+
+
+class PredictTemplate:
+    """Predict settings shared by a batch of test data.
+
+    The model is selected once and the body serialized once but for
+    ``data_id``, which is patched in for each test data. Used by
+    :func:`~decanter.core.client.CoreClient.predict_batch`, a template
+    has no test data of its own so it isn't a :class:`PredictInput`.
+
+    Args:
+        experiment (:class:`~decanter.core.jobs.experiment.Experiment`):
+            Experiment from training.
+        select_model (str, optional): See :class:`PredictInput`.
+        select_opt (str, optional): See :class:`PredictInput`.
+        keep_columns (:obj:`list`, optional): The names of the columns
+            that will be appended to the prediction data.
+        threshold (:obj:`double`, optional): Prediction threshold for
+            binary classification models. Max = 1, Min = 0
+
+    Examples:
+        .. code-block:: python
+
+            template = PredictTemplate(experiment=exp, threshold=0.9)
+            results = client.predict_batch(template, test_data_list, rate=5)
+
+    Attributes:
+        model_id (str): The selected model id, None until first serialized.
+    """
+
+    def __init__(
+        self,
+        experiment,
+        select_model="best",
+        select_opt=None,
+        callback=None,
+        keep_columns=None,
+        threshold=None,
+        version=None,
+    ):
+        self.experiment = experiment
+        self.pred_body = CoreBody.PredictBody.create(
+            data_id="tmp_data_id",
+            model_id="tmp_model_id",
+            callback=callback,
+            keep_columns=keep_columns,
+            threshold=threshold,
+            version=version,
+        )
+        self.select_model = select_model
+        self.select_opt = select_opt
+        self.model_id = None
+        self._wire_tail = None
+
+    def bind(self, data):
+        """Get the predict input of one test data.
+
+        Args:
+            data (:class:`~decanter.core.jobs.data_upload.DataUpload`):
+                Test data.
+
+        Returns:
+            :class:`TemplatePredictInput`
+        """
+        return TemplatePredictInput(self, data)
 
-        params = json.dumps(self.pred_body.jsonable(), cls=CoreBody.ComplexEncoder)
-        params = json.loads(params)
-        return params
+    def get_wire(self, data_id):
+        """Serialize the request body predicting data_id.
+
+        Returns:
+            bytes
+        """
+        if self._wire_tail is None:
+            self.model_id = select_model_id(self)
+            setattr(self.pred_body, "data_id", None)
+            setattr(self.pred_body, "model_id", self.model_id)
+            # body without its opening brace, data_id goes in front
+            self._wire_tail = self.pred_body.to_wire()[1:]
+        return b'{"data_id":' + CoreBody.dumps(data_id) + b"," + self._wire_tail
+
+
+class TemplatePredictInput:
+    """Predict input of one test data of a :class:`PredictTemplate`.
+
+    Args:
+        template (:class:`PredictTemplate`): The shared settings.
+        data (:class:`~decanter.core.jobs.data_upload.DataUpload`): Test data.
+    """
+
+    def __init__(self, template, data):
+        self.template = template
+        self.data = data
+        self.experiment = template.experiment
+
+    def getPredictParams(self):
+        """Create the JSON request body for prediction.
+
+        Returns:
+            :obj:`dict`
+        """
+        return json.loads(self.getPredictWire())
+
+    def getPredictWire(self):
+        """Serialize the request body for prediction.
+
+        Returns:
+            bytes
+        """
+        return self.template.get_wire(self.data.id)
 
 
 class PredictTSInput(PredictInput):
@@ -55,11 +55,17 @@ class SetupInput:
         Returns:
             :obj:`dict`
         """
+        return json.loads(self.get_setup_wire())
+
+    def get_setup_wire(self):
+        """Serialize setup_body into the bytes of the request body.
+
+        Returns:
+            bytes
+        """
         setattr(self.setup_body, "data_id", self.data.id)
         setattr(self.setup_body, "data_source", self.data.accessor)
-        params = json.dumps(self.setup_body.jsonable(), cls=CoreBody.ComplexEncoder)
-        params = json.loads(params)
-        return params
+        return self.setup_body.to_wire()
 
 
 class ColumnSpec(NamedTuple):
@@ -142,10 +142,16 @@ class TrainInput:
         Returns:
             :obj:`dict`
         """
+        return json.loads(self.get_train_wire())
+
+    def get_train_wire(self):
+        """Serialize train_body into the bytes of the request body.
+
+        Returns:
+            bytes
+        """
         setattr(self.train_body, "train_data_id", self.data.id)
-        params = json.dumps(self.train_body.jsonable(), cls=CoreBody.ComplexEncoder)
-        params = json.loads(params)
-        return params
+        return self.train_body.to_wire()
 
 
 class TrainTSInput:
@@ -298,12 +304,16 @@ class TrainTSInput:
         Returns:
             :obj:`dict`
         """
+        return json.loads(self.get_train_wire())
+
+    def get_train_wire(self):
+        """Serialize train_auto_ts_body into the bytes of the request body.
+
+        Returns:
+            bytes
+        """
         setattr(self.train_auto_ts_body.input_spec, "train_data_id", self.data.id)
-        params = json.dumps(
-            self.train_auto_ts_body.jsonable(), cls=CoreBody.ComplexEncoder
-        )
-        params = json.loads(params)
-        return params
+        return self.train_auto_ts_body.to_wire()
 
 
 class TrainClusterInput:
@@ -354,7 +364,13 @@ class TrainClusterInput:
         Returns:
             :obj:`dict`
         """
+        return json.loads(self.get_train_wire())
+
+    def get_train_wire(self):
+        """Serialize train_body into the bytes of the request body.
+
+        Returns:
+            bytes
+        """
         setattr(self.train_body, "train_data_id", self.data.id)
-        params = json.dumps(self.train_body.jsonable(), cls=CoreBody.ComplexEncoder)
-        params = json.loads(params)
-        return params
+        return self.train_body.to_wire()
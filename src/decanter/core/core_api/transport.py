@@ -0,0 +1,200 @@
+"""Transport settings of the requests session sending Decanter Core API
+requests.
+
+  Basic Usage::
+
+    client = CoreClient(
+        username='usr', password='pwd', host='decantercoreserver',
+        transport=TransportSettings(pool_maxsize=32, read_timeout=60))
+    client.transport_metrics()
+"""
+import logging
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+# Bound a half-open connection from holding a pooled connection forever
+DEFAULT_CONNECT_TIMEOUT = 10
+DEFAULT_READ_TIMEOUT = 300
+
+
+class TransportSettings:
+    """Settings of the pooled connections to Decanter Core.
+
+    Args:
+        pool_connections (int): Number of hosts to keep pools for.
+        pool_maxsize (int): Connections kept alive per host.
+        max_per_host (int): Requests in flight per host at the same time,
+            others wait for a free slot. Defaults to pool_maxsize, so
+            connections are never discarded for a full pool.
+        keep_alive (bool): Reuse connections between requests.
+        connect_timeout (float): Seconds to wait for a connection, None
+            to wait forever. Defaults to 10.
+        read_timeout (float): Seconds to wait for the server to send data,
+            None to wait forever. Defaults to 300.
+        max_retries (:class:`urllib3.util.retry.Retry`): Retry of requests
+            having temporary connection issue with Decanter Core.
+    """
+
+    def __init__(
+        self,
+        pool_connections=10,
+        pool_maxsize=10,
+        max_per_host=None,
+        keep_alive=True,
+        connect_timeout=DEFAULT_CONNECT_TIMEOUT,
+        read_timeout=DEFAULT_READ_TIMEOUT,
+        max_retries=None,
+    ):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.max_per_host = pool_maxsize if max_per_host is None else max_per_host
+        self.keep_alive = keep_alive
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        # Retry when having temporary connection issue with CoreX
+        # ref: https://stackoverflow.com/a/35504626
+        self.max_retries = max_retries or Retry(
+            total=5, backoff_factor=0.1, status_forcelist=[500, 502, 503, 504]
+        )
+
+    @property
+    def timeout(self):
+        """tuple: (connect, read) timeout of requests, None for no timeout."""
+        if self.connect_timeout is None and self.read_timeout is None:
+            return None
+        return (self.connect_timeout, self.read_timeout)
+
+
+class MeteredHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter bounding and counting the requests in flight per host.
+
+    Args:
+        max_per_host (int): Requests in flight per host, None for no bound.
+        timeout (tuple): Default (connect, read) timeout of requests sent
+            without one.
+        kwargs: Arguments of :class:`requests.adapters.HTTPAdapter`.
+    """
+
+    def __init__(self, max_per_host=None, timeout=None, **kwargs):
+        self.max_per_host = max_per_host
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._slots = {}
+        self._stats = {}
+        super().__init__(**kwargs)
+
+    def _host_state(self, host):
+        with self._lock:
+            if host not in self._stats:
+                self._stats[host] = {
+                    "requests": 0,
+                    "in_flight": 0,
+                    "max_in_flight": 0,
+                    "waits": 0,
+                    "wait_time": 0.0,
+                }
+                if self.max_per_host is not None:
+                    self._slots[host] = threading.BoundedSemaphore(self.max_per_host)
+            return self._stats[host], self._slots.get(host)
+
+    def send(self, request, **kwargs):  # pylint: disable=arguments-differ
+        """Send the request once a slot of its host is free."""
+        if kwargs.get("timeout") is None:
+            kwargs["timeout"] = self.timeout
+        host = urlparse(request.url).netloc
+        stats, slot = self._host_state(host)
+        waited = 0.0
+        if slot is not None and not slot.acquire(blocking=False):
+            start = time.monotonic()
+            slot.acquire()
+            waited = time.monotonic() - start
+        with self._lock:
+            stats["requests"] += 1
+            stats["in_flight"] += 1
+            stats["max_in_flight"] = max(stats["max_in_flight"], stats["in_flight"])
+            if waited:
+                stats["waits"] += 1
+                stats["wait_time"] += waited
+        try:
+            resp = super().send(request, **kwargs)
+            if not kwargs.get("stream"):
+                # read the body so the connection is back in the pool
+                # before the slot is free
+                resp.content  # pylint: disable=pointless-statement
+            return resp
+        finally:
+            with self._lock:
+                stats["in_flight"] -= 1
+            if slot is not None:
+                slot.release()
+
+    def metrics(self):
+        """Get the counters of requests and pooled connections per host.
+
+        Returns:
+            dict: ``{host: counters}`` with the requests sent, requests in
+            flight and their maximum, waits for a free slot and the seconds
+            waited, and the ``checkouts`` of the urllib3 pool and the
+            ``connections`` it opened.
+        """
+        with self._lock:
+            metrics = {host: dict(stats) for host, stats in self._stats.items()}
+        pools = self.poolmanager.pools
+        for key in pools.keys():
+            pool = pools[key]
+            for host in ("%s:%s" % (pool.host, pool.port), pool.host):
+                if host in metrics:
+                    stats = metrics[host]
+                    stats["checkouts"] = stats.get("checkouts", 0) + pool.num_requests
+                    stats["connections"] = (
+                        stats.get("connections", 0) + pool.num_connections
+                    )
+                    break
+        return metrics
+
+
+def create_session(settings=None):
+    """Create a requests session applying the transport settings.
+
+    Args:
+        settings (:class:`TransportSettings`): (opt) Defaults to
+            ``TransportSettings()``.
+
+    Returns:
+        :class:`requests.Session`: Session with a
+        :class:`MeteredHTTPAdapter` mounted for http and https.
+    """
+    settings = settings or TransportSettings()
+    session = requests.Session()
+    adapter = MeteredHTTPAdapter(
+        max_per_host=settings.max_per_host,
+        timeout=settings.timeout,
+        pool_connections=settings.pool_connections,
+        pool_maxsize=settings.pool_maxsize,
+        max_retries=settings.max_retries,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    if not settings.keep_alive:
+        session.headers["Connection"] = "close"
+    return session
+
+
+def session_metrics(session):
+    """Get the metrics of the adapter mounted on a session.
+
+    Returns:
+        dict: See :meth:`MeteredHTTPAdapter.metrics`, empty if the session
+        isn't created by :func:`create_session`.
+    """
+    adapter = session.get_adapter("https://")
+    if isinstance(adapter, MeteredHTTPAdapter):
+        return adapter.metrics()
+    return {}
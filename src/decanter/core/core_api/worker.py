@@ -19,6 +19,7 @@ class Worker:
         get_count: Function to get counts of worker.
     """
 
-    def __init__(self):
-        self.get_status = api.CoreAPI().get_worker_status
-        self.get_count = api.CoreAPI().get_worker_count
+    def __init__(self, context=None):
+        core_service = api.CoreAPI(context)
+        self.get_status = core_service.get_worker_status
+        self.get_count = core_service.get_worker_count
@@ -41,7 +41,7 @@ def update(func):
         try:
             self.result = args[0]
             for attr, val in self.result.items():
-                self.__dict__.update({attr if attr != "_id" else "id": val})
+                setattr(self, attr if attr != "_id" else "id", val)
 
         except AttributeError as err:
             logger.debug("[%s] '%s' %s", class_type, self.name, err)
@@ -0,0 +1,88 @@
+"""
+Measure how late the event loop wakes up, to make stalls visible.
+"""
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class LoopLagMonitor:
+    """Sample the lag of the event loop while jobs run.
+
+    Sleep ``interval`` seconds over and over and measure how much later
+    than asked the loop wakes up. A lag over ``threshold`` means some
+    callback held the loop thread, stalling the polling of every job, and
+    is logged as a warning.
+
+    Example:
+        .. code-block:: python
+
+            client = core.CoreClient(
+                username='usr', password='pwd', host='decantercoreserver',
+                loop_monitor=LoopLagMonitor(threshold=0.2))
+            ...
+            client.run()
+            client.loop_monitor.stats()
+
+    Args:
+        interval (float): Seconds between two samples.
+        threshold (float): Lag in seconds counted and logged as a stall.
+        clock (func): Monotonic clock returning seconds.
+    """
+
+    def __init__(self, interval=0.05, threshold=0.1, clock=time.monotonic):
+        self.interval = interval
+        self.threshold = threshold
+        self.clock = clock
+        self.samples = 0
+        self.total_lag = 0.0
+        self.max_lag = 0.0
+        self.stalls = 0
+
+    def record(self, lag):
+        """Count one sample of lag in seconds."""
+        self.samples += 1
+        self.total_lag += lag
+        self.max_lag = max(self.max_lag, lag)
+        if lag >= self.threshold:
+            self.stalls += 1
+            logger.warning("[LoopLag] event loop stalled for %.3fs", lag)
+
+    async def sample(self):
+        """Sample the lag until cancelled."""
+        while True:
+            start = self.clock()
+            await asyncio.sleep(self.interval)
+            self.record(max(self.clock() - start - self.interval, 0.0))
+
+    async def watch(self, awaitable):
+        """Sample the lag while awaiting awaitable.
+
+        Returns:
+            The result of awaitable.
+        """
+        sampler = asyncio.ensure_future(self.sample())
+        try:
+            return await awaitable
+        finally:
+            sampler.cancel()
+            try:
+                await sampler
+            except asyncio.CancelledError:
+                pass
+
+    def stats(self):
+        """Get the lag measured so far.
+
+        Returns:
+            dict: ``samples``, ``mean_lag`` and ``max_lag`` in seconds, and
+            the number of ``stalls`` over threshold.
+        """
+        return {
+            "samples": self.samples,
+            "mean_lag": self.total_lag / self.samples if self.samples else 0.0,
+            "max_lag": self.max_lag,
+            "stalls": self.stalls,
+        }
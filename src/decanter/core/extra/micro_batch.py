@@ -0,0 +1,201 @@
+"""
+Coalesce concurrent calls into batches under size and latency limits.
+"""
+import collections
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """Run a batch function over the items of concurrent callers.
+
+    Items submitted by any thread are queued and sent to ``func`` together,
+    as soon as ``max_batch_size`` items wait or the oldest of them waited
+    ``max_latency`` seconds. Up to ``max_concurrency`` batches run at once
+    in a thread pool, while they do the next batch keeps filling.
+
+    Example:
+        .. code-block:: python
+
+            batcher = MicroBatcher(score_rows, max_batch_size=256)
+            results = batcher.submit(rows).result()
+            batcher.close()
+
+    Args:
+        func (func): Get the list of results of a list of items, in order.
+        max_batch_size (int): Most items sent in one batch.
+        max_latency (float): Seconds an item may wait for its batch to fill.
+        max_concurrency (int): Batches running at the same time.
+        clock (func): Monotonic clock returning seconds.
+
+    Attributes:
+        batches (int): Number of batches sent.
+        items (int): Number of items sent.
+    """
+
+    def __init__(
+        self,
+        func,
+        max_batch_size=256,
+        max_latency=0.005,
+        max_concurrency=4,
+        clock=time.monotonic,
+    ):
+        if max_batch_size < 1 or max_concurrency < 1:
+            raise ValueError(
+                "Invalid max_batch_size %s or max_concurrency %s"
+                % (max_batch_size, max_concurrency)
+            )
+        self.func = func
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency
+        self.max_concurrency = max_concurrency
+        self.clock = clock
+        self.batches = 0
+        self.items = 0
+        self._cond = threading.Condition()
+        self._pending = collections.deque()
+        self._pending_items = 0
+        self._slots = threading.Semaphore(max_concurrency)
+        self._executor = None
+        self._dispatcher = None
+        self._closed = False
+
+    def submit(self, items):
+        """Queue items for the next batches.
+
+        Items more than max_batch_size are split over several batches.
+
+        Args:
+            items (list): Items of one caller.
+
+        Returns:
+            :class:`concurrent.futures.Future`: Resolves to the list of
+            results of items, in order.
+
+        Raises:
+            RuntimeError: If the batcher is closed.
+        """
+        items = list(items)
+        size = self.max_batch_size
+        chunks = [items[i : i + size] for i in range(0, len(items), size)]
+        futures = [Future() for _ in chunks]
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("[MicroBatcher] submit to a closed batcher")
+            deadline = self.clock() + self.max_latency
+            for chunk, future in zip(chunks, futures):
+                self._pending.append((chunk, future, deadline))
+            self._pending_items += len(items)
+            if self._dispatcher is None:
+                self._executor = ThreadPoolExecutor(
+                    self.max_concurrency, thread_name_prefix="MicroBatcher"
+                )
+                self._dispatcher = threading.Thread(
+                    target=self._dispatch, name="MicroBatcher", daemon=True
+                )
+                self._dispatcher.start()
+            self._cond.notify()
+        return _join(futures)
+
+    def _take_batch(self):
+        """Wait for a full or timed out batch and take it off the queue.
+
+        Returns:
+            list: (items, future, deadline) of the batch, empty once closed.
+        """
+        with self._cond:
+            while not self._pending and not self._closed:
+                self._cond.wait()
+            while self._pending_items < self.max_batch_size and not self._closed:
+                timeout = self._pending[0][2] - self.clock()
+                if timeout <= 0:
+                    break
+                self._cond.wait(timeout)
+            batch, size = [], 0
+            while self._pending:
+                chunk = self._pending[0][0]
+                if batch and size + len(chunk) > self.max_batch_size:
+                    break
+                batch.append(self._pending.popleft())
+                size += len(chunk)
+            self._pending_items -= size
+            if batch:
+                self.batches += 1
+                self.items += size
+            return batch
+
+    def _dispatch(self):
+        """Send batches until closed and drained."""
+        while True:
+            # wait for a free slot first, so the batch fills meanwhile
+            self._slots.acquire()
+            batch = self._take_batch()
+            if not batch:
+                self._slots.release()
+                return
+            self._executor.submit(self._run_batch, batch)
+
+    def _run_batch(self, batch):
+        try:
+            items = [item for chunk, _, _ in batch for item in chunk]
+            logger.debug("[MicroBatcher] send %s items", len(items))
+            try:
+                results = list(self.func(items))
+                if len(results) != len(items):
+                    raise ValueError(
+                        "[MicroBatcher] got %s results of %s items"
+                        % (len(results), len(items))
+                    )
+            except Exception as err:  # pylint: disable=broad-except
+                for _, future, _ in batch:
+                    future.set_exception(err)
+                return
+            start = 0
+            for chunk, future, _ in batch:
+                future.set_result(results[start : start + len(chunk)])
+                start += len(chunk)
+        finally:
+            self._slots.release()
+
+    def close(self):
+        """Send the queued items and wait for all batches to finish."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        if self._dispatcher is not None:
+            self._dispatcher.join()
+            self._executor.shutdown(wait=True)
+
+
+def _join(futures):
+    """Get a future of the concatenated results of futures."""
+    if len(futures) == 1:
+        return futures[0]
+    joined = Future()
+    if not futures:
+        joined.set_result([])
+        return joined
+    lock = threading.Lock()
+    left = [len(futures)]
+
+    def on_done(future):
+        if future.exception() is not None:
+            with lock:
+                if joined.done():
+                    return
+                joined.set_exception(future.exception())
+            return
+        with lock:
+            left[0] -= 1
+            if left[0] or joined.done():
+                return
+        joined.set_result([res for fut in futures for res in fut.result()])
+
+    for future in futures:
+        future.add_done_callback(on_done)
+    return joined
@@ -0,0 +1,472 @@
+"""
+Stream data between local files and Decanter Core in chunks.
+"""
+import logging
+import os
+import re
+import tempfile
+import time
+import zlib
+
+import pandas as pd
+
+from decanter.core.extra.utils import check_response, isnotebook
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+try:
+    if isnotebook():
+        raise ImportError
+except ImportError:
+    from tqdm.notebook import tqdm
+else:
+    from tqdm import tqdm
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1024 * 1024
+SPOOL_MAX_SIZE = 64 * 1024 * 1024
+
+# pandas dtype of each Decanter Core column data type.
+SCHEMA_DTYPES = {
+    "numerical": "float64",
+    "categorical": "category",
+    "text": "object",
+    "string": "object",
+}
+SCHEMA_DATETIME_TYPES = {"datetime", "timestamp", "date"}
+
+
+def download_to_file(
+    get_file, path, resume=False, chunk_size=CHUNK_SIZE, progress=True, desc=None
+):
+    """Stream a file from Decanter Core to path with constant memory.
+
+    Write the response body chunk by chunk and report the download rate in
+    bytes per second. If resume is True and path holds a partial file,
+    request the rest with a Range header and append it, or download the
+    whole file again if the server doesn't support Range requests.
+
+    Args:
+        get_file (func): Send the request, accepts ``headers`` and returns
+            a streamed class:`Response <Response>`.
+        path (str): The path to download file.
+        resume (bool): Resume from the partial file at path.
+        chunk_size (int): Bytes to read and write at a time.
+        progress (bool): Show progress bar with download rate.
+        desc (str): Description of the progress bar.
+
+    Returns:
+        int: Size in bytes of the downloaded file.
+    """
+    offset = os.path.getsize(path) if resume and os.path.isfile(path) else 0
+    headers = {"Range": "bytes=%d-" % offset} if offset else None
+    resp = get_file(headers=headers)
+
+    if offset and resp.status_code == 416:
+        resp.close()
+        logger.info("[Download] '%s' already complete", path)
+        return offset
+    check_response(resp)
+    content_range = None
+    if resp.status_code == 206:
+        content_range = parse_content_range(resp.headers.get("Content-Range"))
+        if content_range is None or content_range[0] != offset:
+            # appending another range would corrupt the file
+            logger.info(
+                "[Download] '%s' got range %s instead of %s-, download it all",
+                path,
+                resp.headers.get("Content-Range"),
+                offset,
+            )
+            resp.close()
+            resp = check_response(get_file(headers=None))
+            content_range = None
+    if resp.status_code != 206:
+        offset = 0
+
+    length = resp.headers.get("Content-Length")
+    total = offset + int(length) if length is not None else None
+    if content_range is not None and content_range[2] is not None:
+        total = content_range[2]
+    pbar = tqdm(
+        total=total,
+        initial=offset,
+        unit="B",
+        unit_scale=True,
+        unit_divisor=1024,
+        desc=desc or "Download %s" % os.path.basename(path),
+        disable=not progress,
+    )
+    start, written = time.monotonic(), 0
+    try:
+        with open(path, "ab" if offset else "wb") as file:
+            for chunk in resp.iter_content(chunk_size=chunk_size):
+                file.write(chunk)
+                written += len(chunk)
+                pbar.update(len(chunk))
+    finally:
+        pbar.close()
+        resp.close()
+
+    elapsed = max(time.monotonic() - start, 1e-9)
+    logger.info(
+        "[Download] '%s' %s bytes in %.2fs (%.0f bytes/s)",
+        path,
+        written,
+        elapsed,
+        written / elapsed,
+    )
+    return offset + written
+
+
+def parse_content_range(value):
+    """Parse a ``Content-Range`` header of bytes.
+
+    Args:
+        value (str): Header value, ex. ``bytes 1000-4999/5000``.
+
+    Returns:
+        tuple: First byte, last byte and total size, None if unknown,
+        or None if value isn't a range of bytes.
+    """
+    match = re.match(r"^\s*bytes\s+(\d+)-(\d+)/(\d+|\*)\s*$", value or "")
+    if match is None:
+        return None
+    start, end, total = match.groups()
+    return int(start), int(end), None if total == "*" else int(total)
+
+
+def stream_size(file):
+    """Get the remaining bytes of a file-like object without reading it.
+
+    Args:
+        file (file-like): Opened file, :class:`DataFrameCSVReader` or any
+            object with ``__len__`` or seek and tell.
+
+    Returns:
+        int: The size, None if it can't be known.
+    """
+    if hasattr(file, "__len__"):
+        return len(file)
+    try:
+        return os.fstat(file.fileno()).st_size - file.tell()
+    except (AttributeError, OSError, ValueError):
+        pass
+    try:
+        pos = file.tell()
+        end = file.seek(0, os.SEEK_END)
+        file.seek(pos)
+        return end - pos
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
+class DataFrameCSVReader:
+    """Read-only file-like object serializing a DataFrame to csv lazily.
+
+    Rows are turned into csv ``chunk_rows`` at a time while being read, so
+    memory stays around one chunk instead of the whole csv string. The
+    length in bytes, needed for the Content-Length of multipart uploads, is
+    counted by serializing the chunks once without keeping them, unless
+    they were kept by :meth:`spool`.
+
+    Example:
+        .. code-block:: python
+
+            reader = DataFrameCSVReader(df, name='train.csv')
+            CoreAPI().post_upload(
+                file=reader, filename=reader.name, encoding='text/plain(UTF-8)')
+
+    Args:
+        df (:class:`pandas.DataFrame`): Data to serialize.
+        name (str): File name of the csv.
+        chunk_rows (int): Number of rows serialized at a time.
+        encoding (str): Encoding of the csv bytes.
+        to_csv_kwargs: Other arguments of :func:`pandas.DataFrame.to_csv`,
+            index defaults to False.
+    """
+
+    def __init__(
+        self, df, name="no_name", chunk_rows=50000, encoding="utf-8", **to_csv_kwargs
+    ):
+        self.df = df
+        self.name = name
+        self.chunk_rows = max(int(chunk_rows), 1)
+        self.encoding = encoding
+        self.header = to_csv_kwargs.pop("header", True)
+        self.to_csv_kwargs = dict({"index": False}, **to_csv_kwargs)
+        self._len = None
+        self._spool = None
+        self._chunks = None
+        self._buffer = b""
+        self._pos = 0
+        self._read = 0
+
+    def iter_chunks(self):
+        """Yield csv bytes of each chunk of rows, header in the first one.
+
+        Start from the first row each call, without moving the reader.
+        """
+        if self._spool is not None:
+            yield from self._iter_spool()
+            return
+        header = self.header
+        for start in range(0, max(len(self.df), 1), self.chunk_rows):
+            rows = self.df.iloc[start : start + self.chunk_rows]
+            csv = rows.to_csv(header=header, **self.to_csv_kwargs)
+            yield csv.encode(self.encoding)
+            header = False
+
+    def spool(self, max_size=SPOOL_MAX_SIZE):
+        """Serialize the csv once into a temporary file, yielding its chunks.
+
+        Reads and :meth:`iter_chunks` afterwards reuse the spooled bytes
+        instead of serializing the DataFrame again, e.g. after hashing it.
+
+        Args:
+            max_size (int): Bytes kept in memory, a larger csv is spooled
+                to disk.
+        """
+        spool = tempfile.SpooledTemporaryFile(max_size)
+        size = 0
+        for chunk in self.iter_chunks():
+            spool.write(chunk)
+            size += len(chunk)
+            yield chunk
+        self._spool, self._len = spool, size
+
+    def _iter_spool(self):
+        pos = 0
+        while True:
+            self._spool.seek(pos)
+            chunk = self._spool.read(CHUNK_SIZE)
+            if not chunk:
+                return
+            pos += len(chunk)
+            yield chunk
+
+    def __len__(self):
+        """Return the remaining bytes to read."""
+        if self._len is None:
+            self._len = sum(len(chunk) for chunk in self.iter_chunks())
+        return self._len - self._read
+
+    def read(self, size=-1):
+        """Read up to size bytes, or all the remaining bytes if size < 0.
+
+        Returns:
+            bytes
+        """
+        parts, remaining = [], size
+        while size < 0 or remaining > 0:
+            if self._pos >= len(self._buffer):
+                if self._chunks is None:
+                    self._chunks = self.iter_chunks()
+                self._buffer, self._pos = next(self._chunks, b""), 0
+                if not self._buffer:
+                    break
+            end = len(self._buffer) if size < 0 else self._pos + remaining
+            part = self._buffer[self._pos : end]
+            self._pos += len(part)
+            remaining -= len(part)
+            parts.append(part)
+        data = b"".join(parts)
+        self._read += len(data)
+        return data
+
+
+class Compressor:
+    """Compress a stream on the fly while it is sent.
+
+    Keep count of the bytes read and sent to report the compression ratio.
+
+    Example:
+        .. code-block:: python
+
+            compressor = Compressor('gzip', level=6)
+            for chunk in compressor.compress_stream(open('train.csv', 'rb')):
+                send(chunk)
+            compressor.ratio
+
+    Args:
+        codec (str): ``gzip``, or ``zstd`` which requires the zstandard
+            package.
+        level (int): Compression level of the codec, None for its default.
+        chunk_size (int): Bytes read from the stream at a time.
+
+    Raises:
+        ValueError: If the codec isn't supported.
+        ImportError: If zstd is selected without zstandard installed.
+    """
+
+    CODECS = ["gzip", "zstd"]
+
+    def __init__(self, codec="gzip", level=None, chunk_size=CHUNK_SIZE):
+        if codec not in self.CODECS:
+            raise ValueError(
+                "Invalid compression codec %s, use one of %s" % (codec, self.CODECS)
+            )
+        if codec == "zstd" and zstandard is None:
+            raise ImportError(
+                "[Core] zstd compression requires zstandard, "
+                "install with 'pip install zstandard'"
+            )
+        self.codec = codec
+        self.level = level
+        self.chunk_size = chunk_size
+        self.raw_bytes = 0
+        self.compressed_bytes = 0
+
+    @property
+    def content_encoding(self):
+        """str: Value of the Content-Encoding header."""
+        return self.codec
+
+    @property
+    def ratio(self):
+        """float: Raw bytes per compressed byte, None before compressing."""
+        if not self.compressed_bytes:
+            return None
+        return self.raw_bytes / self.compressed_bytes
+
+    def _compressobj(self):
+        if self.codec == "zstd":
+            level = 3 if self.level is None else self.level
+            return zstandard.ZstdCompressor(level=level).compressobj()
+        level = -1 if self.level is None else self.level
+        # wbits 31: zlib deflate with gzip header and trailer
+        return zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress_stream(self, stream):
+        """Yield the compressed bytes of a file-like object.
+
+        Args:
+            stream (file-like): Object with read(size), such as an opened
+                file or a :class:`requests_toolbelt.MultipartEncoder`.
+        """
+        self.raw_bytes = self.compressed_bytes = 0
+        compressobj = self._compressobj()
+        while True:
+            data = stream.read(self.chunk_size)
+            if isinstance(data, str):
+                data = data.encode("utf-8")
+            if not data:
+                break
+            self.raw_bytes += len(data)
+            compressed = compressobj.compress(data)
+            if compressed:
+                self.compressed_bytes += len(compressed)
+                yield compressed
+        compressed = compressobj.flush()
+        self.compressed_bytes += len(compressed)
+        yield compressed
+
+
+def schema_read_kwargs(schema):
+    """Turn the data schema into pandas.read_csv dtype arguments.
+
+    Args:
+        schema (dict or list): The ``schema`` of data, either
+            ``{'columns': [...]}``, the list of columns with ``id`` and
+            ``data_type``, or ``{column_id: data_type}``.
+
+    Returns:
+        dict: ``dtype`` and ``parse_dates`` arguments of pandas.read_csv,
+        columns of unknown data types are left to pandas.
+    """
+    if isinstance(schema, dict):
+        if "columns" in schema:
+            schema = schema["columns"]
+        else:
+            schema = [{"id": key, "data_type": val} for key, val in schema.items()]
+    dtype, parse_dates = {}, []
+    for col in schema or []:
+        col_id, data_type = col.get("id"), col.get("data_type")
+        if not isinstance(data_type, str):
+            continue
+        if col_id is None:
+            continue
+        if data_type in SCHEMA_DTYPES:
+            dtype[col_id] = SCHEMA_DTYPES[data_type]
+        elif data_type in SCHEMA_DATETIME_TYPES:
+            parse_dates.append(col_id)
+    kwargs = {}
+    if dtype:
+        kwargs["dtype"] = dtype
+    if parse_dates:
+        kwargs["parse_dates"] = parse_dates
+    return kwargs
+
+
+def merge_read_kwargs(schema_kwargs, kwargs):
+    """Merge pandas.read_csv arguments of the caller over the schema's.
+
+    A ``dtype`` dict of the caller overrides the schema per column, such
+    columns are also left out of the schema's ``parse_dates``. Any other
+    argument of the caller replaces the schema's.
+
+    Args:
+        schema_kwargs (dict): Arguments from :func:`schema_read_kwargs`.
+        kwargs (dict): Arguments of the caller.
+
+    Returns:
+        dict: Arguments to pass to pandas.read_csv.
+    """
+    merged = dict(schema_kwargs)
+    dtype = kwargs.get("dtype")
+    if isinstance(dtype, dict):
+        if "dtype" in merged:
+            dtype = dict(merged["dtype"], **dtype)
+        if "parse_dates" in merged:
+            merged["parse_dates"] = [
+                col for col in merged["parse_dates"] if col not in dtype
+            ]
+            if not merged["parse_dates"]:
+                del merged["parse_dates"]
+    merged.update(kwargs)
+    if dtype is not None:
+        merged["dtype"] = dtype
+    return merged
+
+
+def read_csv_stream(get_file, schema=None, chunksize=None, **kwargs):
+    """Parse a csv file from Decanter Core while it is downloaded.
+
+    Feed the response stream to pandas.read_csv, so the file is never held
+    in memory as bytes or str.
+
+    Args:
+        get_file (func): Send the request and return a streamed
+            class:`Response <Response>`.
+        schema (dict or list): (opt) The data schema to take column dtypes
+            from, see :func:`schema_read_kwargs`.
+        chunksize (int): (opt) Return an iterator of DataFrames with
+            chunksize rows each instead of one DataFrame.
+        kwargs: Other arguments of pandas.read_csv, they take precedence
+            over the ones from schema, a ``dtype`` dict column by column.
+
+    Returns:
+        :class:`pandas.DataFrame` or iterator of :class:`pandas.DataFrame`
+    """
+    kwargs = merge_read_kwargs(schema_read_kwargs(schema), kwargs)
+    resp = check_response(get_file())
+    resp.raw.decode_content = True
+    if chunksize is None:
+        try:
+            return pd.read_csv(resp.raw, **kwargs)
+        finally:
+            resp.close()
+    return _iter_csv_chunks(resp, chunksize, kwargs)
+
+
+def _iter_csv_chunks(resp, chunksize, kwargs):
+    """Yield DataFrame chunks and close the response when exhausted."""
+    try:
+        for chunk in pd.read_csv(resp.raw, chunksize=chunksize, **kwargs):
+            yield chunk
+    finally:
+        resp.close()
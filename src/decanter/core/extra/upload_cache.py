@@ -0,0 +1,146 @@
+"""
+Local cache of uploaded data keyed by the hash of its content.
+
+Basic Usage::
+
+    cache = UploadCache()
+    client.upload(file=open('train.csv', 'rb'), cache=cache)
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+
+from decanter.core.extra.stream import CHUNK_SIZE, DataFrameCSVReader
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.expanduser("~"), ".decanter", "upload_cache.json"
+)
+
+
+def content_hash(file, chunk_size=CHUNK_SIZE, options=None):
+    """Get the sha256 of the bytes to upload and its options, reading the
+    bytes in chunks.
+
+    A file is read from its current position and seeked back after
+    hashing, a :class:`~decanter.core.extra.stream.DataFrameCSVReader` is
+    hashed by its csv bytes, so a DataFrame and the csv file it was
+    written to share the same hash. The csv is spooled while hashed, see
+    :meth:`~decanter.core.extra.stream.DataFrameCSVReader.spool`, so the
+    upload doesn't serialize the DataFrame again.
+
+    Args:
+        file (file-like or :class:`~decanter.core.extra.stream.DataFrameCSVReader`):
+            Data to upload.
+        chunk_size (int): Bytes read at a time.
+        options (dict): (opt) Upload options shaping the data on Decanter
+            Core, e.g. ``eda`` and ``filename``, the same bytes uploaded
+            with other options get another hash.
+
+    Returns:
+        str: Hex digest, None if the file can't be read again after hashing.
+    """
+    sha = hashlib.sha256()
+    if options:
+        sha.update(json.dumps(options, sort_keys=True).encode("utf-8"))
+    if isinstance(file, DataFrameCSVReader):
+        for chunk in file.spool():
+            sha.update(chunk)
+        return sha.hexdigest()
+    try:
+        pos = file.tell()
+    except (AttributeError, OSError, ValueError):
+        return None
+    while True:
+        chunk = file.read(chunk_size)
+        if not chunk:
+            break
+        if isinstance(chunk, str):
+            chunk = chunk.encode("utf-8")
+        sha.update(chunk)
+    file.seek(pos)
+    return sha.hexdigest()
+
+
+class UploadCache:
+    """Map content hashes of uploaded data to their data id.
+
+    Entries are kept per Decanter Core host and user in a json file,
+    written after each change so other processes of the nightly pipelines
+    find them. Users on the same host don't share entries, as they may not
+    be allowed to access each other's data.
+
+    Args:
+        path (str): Path of the json file, None to keep entries in memory
+            only. Defaults to ``~/.decanter/upload_cache.json``.
+    """
+
+    def __init__(self, path=DEFAULT_CACHE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries = self._load()
+
+    def _load(self):
+        if self.path is None or not os.path.isfile(self.path):
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                return json.load(file)
+        except (OSError, ValueError) as err:
+            logger.warning("[UploadCache] ignore unreadable %s: %s", self.path, err)
+            return {}
+
+    def _save(self):
+        if self.path is None:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = "%s.%d.tmp" % (self.path, os.getpid())
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump(self._entries, file)
+        os.replace(tmp_path, self.path)
+
+    @staticmethod
+    def scope(host, user=None):
+        """Get the key of the entries of user on host."""
+        return host if user is None else "%s %s" % (user, host)
+
+    def get(self, host, key, user=None):
+        """Get the data id of uploaded content.
+
+        Args:
+            host (str): Decanter Core server URL.
+            key (str): Content hash.
+            user (str): (opt) User who uploaded the content.
+
+        Returns:
+            str: Data id, None if the content isn't cached.
+        """
+        with self._lock:
+            entry = self._entries.get(self.scope(host, user), {}).get(key)
+        return entry["data_id"] if entry else None
+
+    def put(self, host, key, data_id, name=None, user=None):
+        """Record the data id of content uploaded by user."""
+        with self._lock:
+            self._entries.setdefault(self.scope(host, user), {})[key] = {
+                "data_id": data_id,
+                "name": name,
+                "cached_at": time.time(),
+            }
+            self._save()
+
+    def discard(self, host, key, user=None):
+        """Drop a stale entry whose data no longer exists."""
+        with self._lock:
+            entries = self._entries.get(self.scope(host, user), {})
+            if entries.pop(key, None) is not None:
+                self._save()
+
+    def __len__(self):
+        return sum(len(entries) for entries in self._entries.values())
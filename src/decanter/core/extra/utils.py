@@ -4,6 +4,8 @@ Functions support other modules.
 import uuid
 import logging
 
+from concurrent.futures import ThreadPoolExecutor
+
 
 def check_response(response, key=None):
     """CHeck the api response.
@@ -25,6 +27,18 @@ def check_response(response, key=None):
     return response
 
 
+def decode_json(response):
+    """Check the api response and decode its JSON body.
+
+    Meant to run in an executor, keeping the decoding of large bodies off
+    the event loop.
+
+    Returns:
+        The JSON-decoded body.
+    """
+    return check_response(response).json()
+
+
 def gen_id(type_, name):
     """Generate a random UUID if name isn't given.
     Returns:
@@ -75,3 +89,33 @@ def exception_handler_for_class_method(func):
             logger.error(e)
 
     return inner_function
+
+
+def bounded_map(func, items, concurrency=8):
+    """Call func on each item from at most concurrency threads.
+
+    Blocking requests share the pooled connections of the session, so keep
+    concurrency within its pool size (10 per host by default).
+
+    Args:
+        func (func): Called with one item.
+        items (iterable): Arguments of func.
+        concurrency (int): Calls in flight at the same time.
+
+    Returns:
+        list: Results in the order of items, with the exception raised by a
+        call in place of its result, like
+        ``asyncio.gather(return_exceptions=True)``.
+    """
+    items = list(items)
+
+    def call(item):
+        try:
+            return func(item)
+        except Exception as err:  # pylint: disable=broad-except
+            return err
+
+    if len(items) <= 1 or concurrency <= 1:
+        return [call(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(items))) as executor:
+        return list(executor.map(call, items))
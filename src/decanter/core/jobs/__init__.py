@@ -4,3 +4,8 @@ from .data_setup import DataSetup
 from .experiment import Experiment, ExperimentTS, ExperimentCluster
 from .predict_result import PredictResult, PredictTSResult
 from .job import Job
+from .poller import TaskPoller
+from .scheduler import JobScheduler
+from .rate_limiter import RateLimiter
+from .worker_monitor import WorkerMonitor
+from .poll_policy import PollPolicy, FixedPollPolicy, AdaptivePollPolicy
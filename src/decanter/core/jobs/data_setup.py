@@ -6,13 +6,13 @@ Handle data setup to Decanter Core server Stores Data
 attribute.
 
 """
-import io
 import logging
 
-import pandas as pd
+from functools import partial
 
 from decanter.core.extra import CoreStatus
 from decanter.core.extra.decorators import update
+from decanter.core.extra.stream import download_to_file, read_csv_stream
 from decanter.core.extra.utils import check_response, gen_id
 from decanter.core.jobs.job import Job
 from decanter.core.jobs.task import SetupTask
@@ -103,33 +103,55 @@ class DataSetup(Job):
             )
         return data_txt
 
-    def show_df(self):
+    def show_df(self, chunksize=None, use_schema=False, **kwargs):
         """Show data in pandas dataframe.
 
+        Parse the csv while it is downloaded instead of decoding the whole
+        file first.
+
+        Args:
+            chunksize (:obj:`int`, optional): Return an iterator of
+                DataFrames with chunksize rows each. Defaults to None.
+            use_schema (:obj:`bool`, optional): Take the column dtypes from
+                ``schema`` instead of letting pandas infer them.
+                Defaults to False.
+            kwargs: Other arguments of :func:`pandas.read_csv`.
+
         Returns:
-            :class:`pandas.DataFrame`: Content of setup data.
+            :class:`pandas.DataFrame`: Content of setup data, or iterator of
+            :class:`pandas.DataFrame` if chunksize is given.
         """
         data_df = None
         if self.is_success():
-            data_csv = check_response(self.core_service.get_data_file_by_id(self.id))
-            data_csv = data_csv.content.decode("utf-8")
-            data_df = pd.read_csv(io.StringIO(data_csv))
+            data_df = read_csv_stream(
+                partial(self.core_service.get_data_file_by_id, self.id, stream=True),
+                schema=self.schema if use_schema else None,
+                chunksize=chunksize,
+                **kwargs
+            )
         else:
             logger.error("[%s get result] fail", self.__class__.__name__)
         return data_df
 
-    def download_csv(self, path):
+    def download_csv(self, path, resume=False, progress=True):
         """DownLoad csv format of the setup data.
 
+        Stream the file to path in chunks with constant memory.
+
         Args:
             path (str): The path to download csv file.
+            resume (:obj:`bool`, optional): Resume from the partial file at
+                path if the server supports Range requests. Defaults to False.
+            progress (:obj:`bool`, optional): Show the download progress and
+                rate. Defaults to True.
         """
         if self.is_success():
-            data_csv = check_response(
-                self.core_service.get_data_file_by_id(self.id)
-            ).text
-            save_csv = open(path, "w+")
-            save_csv.write(data_csv)
-            save_csv.close()
+            download_to_file(
+                partial(self.core_service.get_data_file_by_id, self.id, stream=True),
+                path,
+                resume=resume,
+                progress=progress,
+                desc="Download %s" % self.name,
+            )
         else:
             logger.error("[%s get result] fail", self.__class__.__name__)
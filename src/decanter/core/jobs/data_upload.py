@@ -6,13 +6,13 @@ Handle data upload to Decanter Core server Stores Data
 attribute.
 
 """
-import io
 import logging
 
-import pandas as pd
+from functools import partial
 
 from decanter.core.extra import CoreStatus
 from decanter.core.extra.decorators import update
+from decanter.core.extra.stream import download_to_file, read_csv_stream
 from decanter.core.extra.utils import check_response, gen_id
 from decanter.core.jobs.job import Job
 from decanter.core.jobs.task import UploadTask
@@ -42,16 +42,43 @@ class DataUpload(Job):
         name (str): Name to track Job progress, will give default name if None.
     """
 
-    def __init__(self, file=None, name=None, eda=True):
+    def __init__(
+        self,
+        file=None,
+        name=None,
+        eda=True,
+        compression=None,
+        compression_level=None,
+        multipart_threshold=None,
+        **multipart_options,
+    ):
         """DataUpload Init.
 
         Args:
             file (file-object): DataUpload file to upload.
             name (:obj:`str`, optional): Name to track Job progress
+            eda (:obj:`bool`, optional): Whether to perform eda on data upload
+            compression (:obj:`str`, optional): Compress the upload on the
+                fly with codec ``gzip`` or ``zstd``. Defaults to None.
+            compression_level (:obj:`int`, optional): Level of compression
+                codec. Defaults to the codec's default.
+            multipart_threshold (:obj:`int`, optional): Upload files larger
+                than this many bytes in parts sent concurrently. Defaults
+                to None, uploading at once.
+            multipart_options: part_size, max_workers and max_retries of
+                the chunked upload.
         """
         super().__init__(
             jobs=None,
-            task=UploadTask(file, name, eda),
+            task=UploadTask(
+                file,
+                name,
+                eda,
+                compression,
+                compression_level,
+                multipart_threshold,
+                **multipart_options,
+            ),
             name=gen_id(self.__class__.__name__, name),
         )
 
@@ -65,18 +92,26 @@ class DataUpload(Job):
         self.completed_at = None
 
     @classmethod
-    def create(cls, data_id, name=None):
+    def create(cls, data_id, name=None, cached=True, context=None):
         """Create data by data_id.
 
         Args:
             data_id (str): ObjectId in 24 hex digits
             name (str): (opt) Name to track Job progress
+            cached (bool): (opt) False to skip the metadata cache and make
+                sure the data still exists.
+            context (:class:`~decanter.core.context.Context`): (opt) Context
+                of an isolated client to get the data from.
 
         Returns:
             :class:`~decanter.core.jobs.data_upload.DataUpload` object
         """
         data = cls()
-        data_resp = check_response(data.core_service.get_data_by_id(data_id)).json()
+        if context is not None:
+            data.use_context(context)
+        data_resp = check_response(
+            data.core_service.get_data_by_id(data_id, cached=cached)
+        ).json()
         data.update_result(data_resp)
         data.status = CoreStatus.DONE
         data.name = name
@@ -104,33 +139,55 @@ class DataUpload(Job):
             )
         return data_txt
 
-    def show_df(self):
+    def show_df(self, chunksize=None, use_schema=False, **kwargs):
         """Show data in pandas dataframe.
 
+        Parse the csv while it is downloaded instead of decoding the whole
+        file first.
+
+        Args:
+            chunksize (:obj:`int`, optional): Return an iterator of
+                DataFrames with chunksize rows each. Defaults to None.
+            use_schema (:obj:`bool`, optional): Take the column dtypes from
+                ``schema`` instead of letting pandas infer them.
+                Defaults to False.
+            kwargs: Other arguments of :func:`pandas.read_csv`.
+
         Returns:
-            :class:`pandas.DataFrame`: Content of uploaded data.
+            :class:`pandas.DataFrame`: Content of uploaded data, or iterator of
+            :class:`pandas.DataFrame` if chunksize is given.
         """
         data_df = None
         if self.is_success():
-            data_csv = check_response(self.core_service.get_data_file_by_id(self.id))
-            data_csv = data_csv.content.decode("utf-8")
-            data_df = pd.read_csv(io.StringIO(data_csv))
+            data_df = read_csv_stream(
+                partial(self.core_service.get_data_file_by_id, self.id, stream=True),
+                schema=self.schema if use_schema else None,
+                chunksize=chunksize,
+                **kwargs
+            )
         else:
             logger.error("[%s get result] fail", self.__class__.__name__)
         return data_df
 
-    def download_csv(self, path):
+    def download_csv(self, path, resume=False, progress=True):
         """DownLoad csv format of the uploaded data.
 
+        Stream the file to path in chunks with constant memory.
+
         Args:
             path (str): The path to download csv file.
+            resume (:obj:`bool`, optional): Resume from the partial file at
+                path if the server supports Range requests. Defaults to False.
+            progress (:obj:`bool`, optional): Show the download progress and
+                rate. Defaults to True.
         """
         if self.is_success():
-            data_csv = check_response(
-                self.core_service.get_data_file_by_id(self.id)
-            ).text
-            save_csv = open(path, "w+")
-            save_csv.write(data_csv)
-            save_csv.close()
+            download_to_file(
+                partial(self.core_service.get_data_file_by_id, self.id, stream=True),
+                path,
+                resume=resume,
+                progress=progress,
+                desc="Download %s" % self.name,
+            )
         else:
             logger.error("[%s get result] fail", self.__class__.__name__)
@@ -5,13 +5,13 @@ Experiment and ExperimentTS handles the training of models on Decanter Core serv
 and stores Experiment results in its attributes.
 """
 import logging
-import numpy as np
-from decanter.core.core_api import CoreAPI, Model, MultiModel
+from decanter.core.core_api import Model, MultiModel
 from decanter.core.extra import CoreStatus
 from decanter.core.extra.decorators import update
-from decanter.core.extra.utils import check_response, gen_id
+from decanter.core.extra.utils import bounded_map, check_response, gen_id
 from decanter.core.jobs.job import Job
 from decanter.core.jobs.task import TrainTask, TrainTSTask, TrainClusterTask
+from decanter.core.leaderboard import Leaderboard
 from decanter.core.enums.evaluators import Evaluator
 from decanter.core.enums import check_is_enum
 
@@ -51,7 +51,7 @@ class Experiment(Job):
 
     def __init__(self, train_input, select_model_by=Evaluator.auto, name=None):
         super().__init__(
-            jobs=[train_input.data],
+            jobs=[train_input.data] if train_input is not None else None,
             task=TrainTask(train_input, name=name),
             name=gen_id(self.__class__.__name__, name),
         )
@@ -74,33 +74,97 @@ class Experiment(Job):
         self.completed_at = None
 
     @classmethod
-    def create(cls, exp_id, name=None):
+    def create(cls, exp_id, name=None, context=None):
         """Create Experiment by exp_id.
 
         Args:
             exp_id (str): ObjectId in 24 hex digits.
             name (:obj:`str`, optional): Name to track Job progress.
+            context (:class:`~decanter.core.context.Context`): (opt) Context
+                of an isolated client to get the experiment from, its best
+                model is bound to the same context.
 
         Returns:
             :class:`~decanter.core.jobs.experiment.Experiment`: Experiment object
                 with the specific id.
         """
-        core_service = CoreAPI()
-        exp_resp = check_response(core_service.get_experiments_by_id(exp_id)).json()
         exp = cls(train_input=None)
+        if context is not None:
+            exp.use_context(context)
+        exp_resp = check_response(
+            exp.core_service.get_experiments_by_id(exp_id)
+        ).json()
+        exp.task.status, exp.task.result = CoreStatus.DONE, exp_resp
         exp.update_result(exp_resp)
         exp.status = CoreStatus.DONE
         exp.name = name
         return exp
 
+    @classmethod
+    def create_many(cls, exp_ids, concurrency=8, context=None):
+        """Create Experiments by exp_ids, fetching them concurrently.
+
+        Args:
+            exp_ids (list(str)): ObjectIds in 24 hex digits.
+            concurrency (:obj:`int`, optional): Requests in flight at the
+                same time. Defaults to 8.
+            context (:class:`~decanter.core.context.Context`): (opt) Context
+                of an isolated client to get the experiments from.
+
+        Returns:
+            list: :class:`~decanter.core.jobs.experiment.Experiment` objects
+            in the order of exp_ids, with the exception raised when
+            creating an experiment in its place.
+        """
+        return bounded_map(
+            lambda exp_id: cls.create(exp_id, context=context), exp_ids, concurrency
+        )
+
     @update
     def update_result(self, task_result):
         """Update Job's attribute from Task's result."""
         self.get_best_model()
 
+    def prepare_result(self, task_result):
+        """Build the leaderboard of the experiment's models off the loop."""
+        attributes = task_result.get("attributes")
+        if self.task.is_success() and attributes:
+            self._leaderboard = (attributes, Leaderboard(attributes))
+
+    def leaderboard(self, score_types=None):
+        """Get the scores of all models in one matrix for ranking.
+
+        Built once per attributes of the experiment.
+
+        Args:
+            score_types (:obj:`list(str)`, optional): Score types to keep,
+                defaults to ``cv_averages`` and ``validation_scores``.
+
+        Returns:
+            :class:`~decanter.core.leaderboard.Leaderboard`
+        """
+        cached = getattr(self, "_leaderboard", None)
+        if (
+            cached is None
+            or cached[0] is not self.attributes
+            or (score_types is not None and cached[1].score_types != score_types)
+        ):
+            board = Leaderboard(self.attributes, score_types=score_types)
+            self._leaderboard = (self.attributes, board)
+        return self._leaderboard[1]
+
+    def use_context(self, context):
+        """Run the Experiment in context, best model included."""
+        super().use_context(context)
+        self.best_model.use_context(context)
+
     def get_best_model(self):
         """Get the best model in experiment by `select_model_by` and stores
-        in best model attribute."""
+        in best model attribute.
+
+        The best model is bound without a request, its metadata is fetched
+        when first used, see :meth:`~decanter.core.core_api.model.Model.bind`.
+        """
         if not self.task.is_success():
             return
         class_ = self.__class__.__name__
@@ -108,43 +172,12 @@ class Experiment(Job):
         select_by_evaluator = Evaluator.resolve_select_model_by(
             self.select_model_by, self.hyperparameters["model_type"]
         )
-        minlevel = {
-            Evaluator.mse.value,
-            Evaluator.mae.value,
-            Evaluator.mean_per_class_error.value,
-            Evaluator.deviance.value,
-            Evaluator.logloss.value,
-            Evaluator.rmse.value,
-            Evaluator.rmsle.value,
-            Evaluator.misclassification.value,
-            Evaluator.mape.value,
-            Evaluator.wmape.value,
-        }
 
         # Get the best model among models with valid score
-        model_list = list(
-            filter(
-                lambda x: not np.isnan(x["cv_averages"][select_by_evaluator]),
-                self.attributes.values(),
-            )
-        )
-        best_model_id = None
-        try:
-            if select_by_evaluator in minlevel:
-                best_model_id = min(
-                    model_list, key=lambda x: x["cv_averages"][select_by_evaluator]
-                )["model_id"]
-            else:
-                best_model_id = max(
-                    model_list, key=lambda x: x["cv_averages"][select_by_evaluator]
-                )["model_id"]
-        except AttributeError:
-            logger.error("[%s] no models in %s result", class_, self.name)
-        except KeyError as err:
-            logger.error(err)
+        best_model_id = self.leaderboard().best(select_by_evaluator)
 
         if best_model_id is not None:
-            self.best_model.update(self.id, best_model_id)
+            self.best_model.bind(self.id, best_model_id)
             self.best_model.task_status = self.task.status
             logger.debug(
                 "[%s] '%s' best model id: %s", class_, self.name, best_model_id
@@ -188,7 +221,7 @@ class ExperimentTS(Experiment, Job):
     def __init__(self, train_input, select_model_by=Evaluator.auto, name=None):
         Job.__init__(
             self,
-            jobs=[train_input.data],
+            jobs=[train_input.data] if train_input is not None else None,
             task=TrainTSTask(train_input, name=name),
             name=gen_id(self.__class__.__name__, name),
         )
@@ -211,19 +244,23 @@ class ExperimentTS(Experiment, Job):
         self.completed_at = None
 
     @classmethod
-    def create(cls, exp_id, name=None):
+    def create(cls, exp_id, name=None, context=None):
         """Create Time series Experiment by exp_id. Inherit from
         :func:`~Experiment.create`
 
         Args:
             exp_id (str): ObjectId in 24 hex digits
             name (:obj:`str`, optional): (opt) Name to track Job progress
+            context (:class:`~decanter.core.context.Context`): (opt) Context
+                of an isolated client to get the experiment from.
 
         Returns:
             :class:`~decanter.core.jobs.experiment.ExperimentTS`: Experiment object\
                 with the specific id.
         """
-        return super(ExperimentTS, cls).create(exp_id=exp_id, name=name)
+        return super(ExperimentTS, cls).create(
+            exp_id=exp_id, name=name, context=context
+        )
 
 
 class ExperimentCluster(Experiment, Job):
@@ -261,7 +298,7 @@ class ExperimentCluster(Experiment, Job):
     def __init__(self, train_input, select_model_by=Evaluator.auto, name=None):
         Job.__init__(
             self,
-            jobs=[train_input.data],
+            jobs=[train_input.data] if train_input is not None else None,
             task=TrainClusterTask(train_input, name=name),
             name=gen_id(self.__class__.__name__, name),
         )
@@ -284,16 +321,20 @@ class ExperimentCluster(Experiment, Job):
         self.completed_at = None
 
     @classmethod
-    def create(cls, exp_id, name=None):
+    def create(cls, exp_id, name=None, context=None):
         """Create Clustering Experiment by exp_id. Inherit from
         :func:`~Experiment.create`
 
         Args:
             exp_id (str): ObjectId in 24 hex digits
             name (:obj:`str`, optional): (opt) Name to track Job progress
+            context (:class:`~decanter.core.context.Context`): (opt) Context
+                of an isolated client to get the experiment from.
 
         Returns:
             :class:`~decanter.core.jobs.experiment.ExperimentCluster`: Experiment object\
                 with the specific id.
         """
-        return super(ExperimentCluster, cls).create(exp_id=exp_id, name=name)
+        return super(ExperimentCluster, cls).create(
+            exp_id=exp_id, name=name, context=context
+        )
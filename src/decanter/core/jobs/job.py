@@ -7,7 +7,9 @@ of task in its attributes.
 import abc
 import asyncio
 import logging
+import time
 
+from decanter.core import Context
 from decanter.core.core_api import CoreAPI
 from decanter.core.extra import CoreStatus
 from decanter.core.extra.decorators import block_method
@@ -33,9 +35,20 @@ class Job:
         name (str): Name to track Job progress.
         core_service (:class:`~decanter.core.core_api.api.CoreAPI`): Handle the
             calling of api.
+        context (:class:`~decanter.core.context.Context`): Context the Job
+            and its task run in.
+        deadline (float): :func:`time.monotonic` time the Job stops itself
+            at if it isn't done, None for no deadline.
+        priority (int): Order of the Job waiting in the context's scheduler,
+            lower starts first.
+        rate_limiter (:class:`~decanter.core.jobs.rate_limiter.RateLimiter`):
+            Pace the start of the task with other jobs sharing it, None for
+            no limit.
     """
 
     def __init__(self, task, jobs=None, name=None):
+        self._status = CoreStatus.PENDING
+        self._done_event = None
         self.id = None
         self.status = CoreStatus.PENDING
         self.result = None
@@ -43,6 +56,59 @@ class Job:
         self.jobs = jobs
         self.name = name
         self.core_service = CoreAPI()
+        self.context = Context
+        self.deadline = None
+        self.priority = 0
+        self.rate_limiter = None
+        self._applied_result = None
+
+    def use_context(self, context):
+        """Run the Job and its task in context instead of the shared Context.
+
+        Args:
+            context (:class:`~decanter.core.context.Context`): Context of
+                an isolated :class:`~decanter.core.client.CoreClient`.
+        """
+        self.context = context
+        self.core_service = CoreAPI(context)
+        self.task.use_context(context)
+
+    def set_deadline(self, timeout):
+        """Stop the Job if it isn't done within timeout seconds from now.
+
+        The time waiting for prerequired jobs counts towards the deadline.
+
+        Args:
+            timeout (float): Seconds the Job may take, None for no deadline.
+        """
+        self.deadline = None if timeout is None else time.monotonic() + timeout
+
+    @property
+    def status(self):
+        """str: Job status. Wake up the coroutines awaiting
+        :func:`wait_done` once it turns into `DONE_STATUS`."""
+        return self._status
+
+    @status.setter
+    def status(self, value):
+        self._status = value
+        if self._done_event is None:
+            return
+        if value in CoreStatus.DONE_STATUS:
+            self._done_event.set()
+        else:
+            self._done_event.clear()
+
+    async def wait_done(self):
+        """Wait until the Job is in `DONE_STATUS`.
+
+        Dependents await it directly instead of polling :func:`is_done`.
+        """
+        if self._done_event is None:
+            self._done_event = asyncio.Event()
+            if self.is_done():
+                self._done_event.set()
+        await self._done_event.wait()
 
     def is_done(self):
         """
@@ -83,20 +149,25 @@ class Job:
         to execute running the task if all prerequired jobs is successful.
 
         The coroutine will be done when the Job fininsh gettng the result from
-        task.
+        task, or when the deadline passes, stopping the Job and its task.
         """
+        if self.deadline is None:
+            await self.wait_task()
+            return
+        try:
+            await asyncio.wait_for(self.wait_task(), self.deadline - time.monotonic())
+        except asyncio.TimeoutError:
+            logger.warning("[Job] '%s' deadline exceeded, stop it", self.name)
+            try:
+                self.stop()
+            except Exception as err:  # pylint: disable=broad-except
+                logger.error("[Job] '%s' fail to stop task: %s", self.name, err)
+                self.status = CoreStatus.FAIL
+
+    async def wait_task(self):
+        """Wait for prerequired jobs, then run the task until it's done."""
         if self.jobs is not None and self.status not in CoreStatus.DONE_STATUS:
-            while not all(job.is_done() for job in self.jobs) and not any(
-                job.is_fail() for job in self.jobs
-            ):
-                ll = [job.status for job in self.jobs]
-                logger.debug(
-                    "[Job] '%s' waiting %s pre required jobs. jobs status: %s",
-                    self.name,
-                    len(self.jobs),
-                    ll,
-                )
-                await asyncio.sleep(5)
+            await self.wait_jobs()
 
             # check if any pre_request_jobs has failed
             if not all(job.is_success() for job in self.jobs):
@@ -114,13 +185,26 @@ class Job:
             logger.info("[Job] %s failed status: %s", self.name, self.status)
             return
 
-        self.status = CoreStatus.RUNNING
-        self.task.run()
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire()
+        scheduler = self.context.scheduler
+        if scheduler is not None:
+            await scheduler.acquire(self)
+        try:
+            # stopped while waiting for a slot
+            if self.status in CoreStatus.DONE_STATUS:
+                return
+            self.status = CoreStatus.RUNNING
+            self.task.run()
 
-        while self.task.not_done():
-            await self.update()
-            if self.task.not_done():
-                await asyncio.sleep(3)
+            while self.task.not_done():
+                await self.update()
+                # the shared task poller paces the updates itself
+                if self.task.not_done() and self.context.task_poller is None:
+                    await asyncio.sleep(self.task.next_poll_interval())
+        finally:
+            if scheduler is not None:
+                scheduler.release(self)
 
         self.status = self.task.status
         logger.info(
@@ -128,15 +212,61 @@ class Job:
         )
         return
 
+    async def wait_jobs(self):
+        """Wait until all prerequired jobs are done or any of them fails.
+
+        Wake up on the completion of each prerequired job, or when the Job
+        itself is done (e.g. stopped) while waiting.
+        """
+        logger.debug(
+            "[Job] '%s' waiting %s pre required jobs. jobs status: %s",
+            self.name,
+            len(self.jobs),
+            [job.status for job in self.jobs],
+        )
+        waiters = [asyncio.ensure_future(job.wait_done()) for job in self.jobs]
+        waiters.append(asyncio.ensure_future(self.wait_done()))
+        pending = set(waiters)
+        try:
+            while pending and not all(job.is_done() for job in self.jobs):
+                if any(job.is_fail() for job in self.jobs) or self.is_done():
+                    break
+                _, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+        finally:
+            for waiter in pending:
+                waiter.cancel()
+
     async def update(self):
         """Update attributes from task's result.
 
         A python coroutine await by :func:`~decanter.core.jobs.job.Job.wait`.
         Will wait for task to update its result by await task.update(),
         then use the updated result from task to update Job's attributes.
+        A result already applied is skipped, the final result is prepared
+        by :func:`prepare_result` in the default executor first.
         """
         await self.task.update()
-        self.update_result(self.task.result)
+        result = self.task.result
+        if result is not None and result is self._applied_result:
+            return
+        if result is not None and self.task.is_done():
+            loop = asyncio.get_event_loop()
+            await loop.run_in_executor(None, self.prepare_result, result)
+        self._applied_result = result
+        self.update_result(result)
+
+    def prepare_result(self, task_result):
+        """Do the heavy part of applying the final task result.
+
+        Run in the default executor before :func:`update_result`, so it
+        must not change the Job's attributes, only caches they are read
+        through.
+
+        Args:
+            task_result (dict): Result of the finished task.
+        """
 
     @abc.abstractmethod
     def update_result(self, task_result):
@@ -0,0 +1,130 @@
+# pylint: disable=too-few-public-methods
+"""Policies deciding how long a :class:`~decanter.core.jobs.job.Job` waits
+before polling the status of its task again.
+
+The default :class:`AdaptivePollPolicy` backs off while the task's
+``progress`` doesn't move, and polls sooner as the observed progress rate
+predicts the task is about to finish.
+"""
+import abc
+import time
+
+
+class PollPolicy:
+    """Base class of poll-scheduling policies.
+
+    Per task state is kept in the task's ``poll_state`` dictionary, so one
+    policy can be shared by all tasks of a client.
+    """
+
+    @abc.abstractmethod
+    def next_interval(self, task):
+        """Get the seconds to wait before polling the task again.
+
+        Args:
+            task (:class:`~decanter.core.jobs.task.Task`): Task just polled.
+
+        Raises:
+            NotImplementedError: If child class do not implement this function.
+        """
+        raise NotImplementedError("Please Implement next_interval method")
+
+
+class FixedPollPolicy(PollPolicy):
+    """Poll every fixed interval.
+
+    Args:
+        interval (float): Seconds between two polls.
+    """
+
+    def __init__(self, interval=3):
+        self.interval = interval
+
+    def next_interval(self, task):
+        """Return the fixed interval."""
+        return self.interval
+
+
+class AdaptivePollPolicy(PollPolicy):
+    """Poll by the progress rate of the task.
+
+    Start polling at ``initial_interval``. Multiply the interval by
+    ``backoff`` every poll the progress doesn't move, up to
+    ``max_interval``. While the progress moves, estimate the remaining time
+    from the smoothed progress rate and poll after ``eta_fraction`` of it,
+    so the interval shrinks as the progress approaches 1.0. By default a
+    task is never polled more often than every 3 seconds, the interval of
+    :class:`FixedPollPolicy`.
+
+    Example:
+        .. code-block:: python
+
+            client = core.CoreClient(
+                username='usr', password='pwd', host='decantercoreserver',
+                poll_policy=AdaptivePollPolicy(min_interval=1, max_interval=120))
+
+    Args:
+        initial_interval (float): Seconds before the second poll.
+        min_interval (float): Lower bound of the interval.
+        max_interval (float): Upper bound of the interval.
+        backoff (float): Multiplier of the interval when progress stalls.
+        eta_fraction (float): Fraction of the estimated remaining time to
+            wait for.
+        smoothing (float): Weight of the newest rate in the exponential
+            moving average of progress rate.
+        clock (func): Monotonic clock returning seconds.
+    """
+
+    def __init__(
+        self,
+        initial_interval=3,
+        min_interval=3,
+        max_interval=60,
+        backoff=1.5,
+        eta_fraction=0.5,
+        smoothing=0.5,
+        clock=time.monotonic,
+    ):
+        self.initial_interval = initial_interval
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.eta_fraction = eta_fraction
+        self.smoothing = smoothing
+        self.clock = clock
+
+    def _clamp(self, interval):
+        return max(self.min_interval, min(self.max_interval, interval))
+
+    def next_interval(self, task):
+        """Get the interval from the progress change since the last poll.
+
+        Returns:
+            float: Seconds to wait before polling again.
+        """
+        state = task.poll_state
+        now = self.clock()
+        progress = task.progress or 0
+
+        if "time" not in state:
+            interval = self.initial_interval
+        else:
+            elapsed = now - state["time"]
+            moved = progress - state["progress"]
+            if moved <= 0 or elapsed <= 0:
+                interval = state["interval"] * self.backoff
+            else:
+                rate = moved / elapsed
+                if state.get("rate") is not None:
+                    rate = self.smoothing * rate + (1 - self.smoothing) * state["rate"]
+                state["rate"] = rate
+                eta = max(1 - progress, 0) / rate
+                state["eta"] = eta
+                interval = eta * self.eta_fraction
+
+        interval = self._clamp(interval)
+        state.update(time=now, progress=progress, interval=interval)
+        return interval
+
+
+DEFAULT_POLL_POLICY = AdaptivePollPolicy()
@@ -0,0 +1,192 @@
+"""Shared poller refreshing many :class:`~decanter.core.jobs.task.CoreTask`
+with one request per tick.
+
+Instead of every task polling ``/v2/tasks/{task_id}`` on its own, the
+poller collects the ids of all pending tasks in
+:attr:`~decanter.core.context.Context.JOBS`, fetches them together, and
+hands each task its part of the response.
+"""
+import asyncio
+import logging
+
+from functools import partial
+
+from decanter.core import Context
+from decanter.core.core_api import CoreAPI
+from decanter.core.extra import CoreStatus, CoreKeys
+from decanter.core.extra.utils import decode_json
+
+logger = logging.getLogger(__name__)
+
+
+class TaskPoller:
+    """Refresh all pending tasks of the context together.
+
+    Every tick sends one request to the ``/tasks`` list endpoint, or to
+    ``bulk_endpoint`` if given, and calls
+    :func:`~decanter.core.jobs.task.CoreTask.update_task_response` of each
+    task found in the response. Tasks missing in the response fall back to
+    polling by their own id.
+
+    Example:
+        .. code-block:: python
+
+            from decanter import core
+            from decanter.core.jobs.poller import TaskPoller
+
+            client = core.CoreClient(
+                username='usr', password='pwd', host='decantercoreserver',
+                task_poller=TaskPoller())
+
+    Attributes:
+        interval (float): Seconds between two ticks, None to follow the poll
+            policies of the pending tasks.
+        bulk_endpoint (str): Endpoint accepting ``{"ids": [task_id...]}``
+            and returning the tasks, None to use the ``/tasks`` list.
+        ticks (int): Number of ticks done.
+        core_service (:class:`~decanter.core.core_api.api.CoreAPI`): Handle
+            the calling of api.
+        context (:class:`~decanter.core.context.Context`): Context whose
+            jobs are polled.
+    """
+
+    def __init__(self, interval=None, bulk_endpoint=None):
+        self.interval = interval
+        self.bulk_endpoint = bulk_endpoint
+        self.ticks = 0
+        self.core_service = CoreAPI()
+        self.context = Context
+        self._waiting = set()
+        self._next_tick = None
+        self._runner = None
+
+    def use_context(self, context):
+        """Poll the jobs of context with its credentials and host.
+
+        Args:
+            context (:class:`~decanter.core.context.Context`): Context the
+                poller is set up with.
+        """
+        self.context = context
+        self.core_service = CoreAPI(context)
+
+    def pending_tasks(self):
+        """Get the running tasks of jobs registered in the context and of
+        tasks waiting in :func:`refresh`.
+
+        Returns:
+            list(:class:`~decanter.core.jobs.task.CoreTask`)
+        """
+        tasks = {}
+        candidates = [getattr(job, "task", None) for job in self.context.JOBS]
+        for task in candidates + list(self._waiting):
+            if getattr(task, "id", None) is not None and task.not_done():
+                tasks[id(task)] = task
+        return list(tasks.values())
+
+    async def refresh(self, task):
+        """Wait until the next tick has refreshed the task.
+
+        Start the ticking coroutine if it is not running yet. Task without
+        id can't be polled in bulk and is polled by itself.
+
+        Args:
+            task (:class:`~decanter.core.jobs.task.CoreTask`): Task waiting
+                for its status.
+        """
+        if task.id is None:
+            await task.fetch_update()
+            await asyncio.sleep(self.next_interval([task]))
+            return
+
+        self._waiting.add(task)
+        if self._runner is None or self._runner.done():
+            self._next_tick = self.context.LOOP.create_future()
+            self._runner = self.context.LOOP.create_task(self._run())
+        try:
+            await asyncio.shield(self._next_tick)
+        finally:
+            self._waiting.discard(task)
+        logger.debug("[TaskPoller] '%s' refreshed. status: %s", task.name, task.status)
+
+    async def _run(self):
+        """Tick until there are no pending tasks left."""
+        while True:
+            tick, self._next_tick = self._next_tick, self.context.LOOP.create_future()
+            try:
+                await self.poll_once()
+            except Exception as err:  # pylint: disable=broad-except
+                logger.error("[TaskPoller] tick failed: %s", err)
+            tick.set_result(None)
+            tasks = self.pending_tasks()
+            if not tasks:
+                self._next_tick.set_result(None)
+                return
+            await asyncio.sleep(self.next_interval(tasks))
+
+    def next_interval(self, tasks):
+        """Get the seconds until next tick.
+
+        Use the fixed interval if given, else the shortest interval asked by
+        the poll policies of the pending tasks.
+
+        Returns:
+            float
+        """
+        if self.interval is not None:
+            return self.interval
+        return min(task.next_poll_interval() for task in tasks)
+
+    async def poll_once(self):
+        """Fetch all pending tasks with one request and update them."""
+        tasks = self.pending_tasks()
+        if not tasks:
+            return
+        self.ticks += 1
+        responses = await self.fetch([task.id for task in tasks])
+        missing = []
+        for task in tasks:
+            if task.id not in responses:
+                missing.append(task)
+                continue
+            if task.status in CoreStatus.DONE_STATUS:
+                continue
+            task.response = responses[task.id]
+            task.update_task_response()
+
+        if missing:
+            logger.debug("[TaskPoller] %s tasks not in bulk response", len(missing))
+            await asyncio.gather(*[task.fetch_update() for task in missing])
+
+    async def fetch(self, task_ids):
+        """Get the tasks by ids with one request.
+
+        Args:
+            task_ids (list(str)): Ids of the tasks.
+
+        Returns:
+            dict: Task responses keyed by task id.
+        """
+        loop = self.context.LOOP
+        if self.context.async_api is not None:
+            resp = await self._request(self.context.async_api, task_ids)
+        else:
+            func = partial(self._request, self.core_service, task_ids)
+            resp = await loop.run_in_executor(None, func)
+
+        # the list of all tasks can be large, decode it off the event loop
+        body = await loop.run_in_executor(None, decode_json, resp)
+        if isinstance(body, dict):
+            body = body.get("data", body.get("tasks", []))
+        wanted = set(task_ids)
+        return {
+            task[CoreKeys.id.value]: task
+            for task in body
+            if task.get(CoreKeys.id.value) in wanted
+        }
+
+    def _request(self, core_service, task_ids):
+        """Send the bulk request with the given CoreAPI."""
+        if self.bulk_endpoint is None:
+            return core_service.get_tasks_list()
+        return core_service.post_tasks_bulk(url=self.bulk_endpoint, task_ids=task_ids)
@@ -5,12 +5,12 @@
 PredictResult and PredictTSResult handle the prediction of the model training
 on Decanter Core server, and stores the predict results in its attributes.
 """
-import io
 import logging
 
-import pandas as pd
+from functools import partial
 
 from decanter.core.extra.decorators import update
+from decanter.core.extra.stream import download_to_file, read_csv_stream
 from decanter.core.extra.utils import check_response, gen_id
 from decanter.core.jobs.job import Job
 from decanter.core.jobs.task import PredictTask, PredictTSTask
@@ -75,34 +75,56 @@ class PredictResult(Job):
             logger.error("[%s] fail", self.__class__.__name__)
         return pred_txt
 
-    def show_df(self):
+    def show_df(self, chunksize=None, use_schema=False, **kwargs):
         """Show predict result in pandas dataframe.
 
+        Parse the csv while it is downloaded instead of decoding the whole
+        file first.
+
+        Args:
+            chunksize (:obj:`int`, optional): Return an iterator of
+                DataFrames with chunksize rows each. Defaults to None.
+            use_schema (:obj:`bool`, optional): Take the column dtypes from
+                ``schema`` instead of letting pandas infer them.
+                Defaults to False.
+            kwargs: Other arguments of :func:`pandas.read_csv`.
+
         Returns:
-            :class:`pandas.DataFrame`: Content of predict result.
+            :class:`pandas.DataFrame`: Content of predict result, or iterator of
+            :class:`pandas.DataFrame` if chunksize is given.
         """
         pred_df = None
         if self.is_success():
-            pred_csv = check_response(self.core_service.get_data_file_by_id(self.id))
-            pred_csv = pred_csv.content.decode("utf-8")
-            pred_df = pd.read_csv(io.StringIO(pred_csv))
+            pred_df = read_csv_stream(
+                partial(self.core_service.get_data_file_by_id, self.id, stream=True),
+                schema=self.schema if use_schema else None,
+                chunksize=chunksize,
+                **kwargs
+            )
         else:
             logger.error("[%s] fail", self.__class__.__name__)
         return pred_df
 
-    def download_csv(self, path):
+    def download_csv(self, path, resume=False, progress=True):
         """DownLoad csv format of the predict result.
 
+        Stream the file to path in chunks with constant memory.
+
         Args:
             path (str): The path to download csv file.
+            resume (:obj:`bool`, optional): Resume from the partial file at
+                path if the server supports Range requests. Defaults to False.
+            progress (:obj:`bool`, optional): Show the download progress and
+                rate. Defaults to True.
         """
         if self.is_success():
-            data_csv = check_response(
-                self.core_service.get_data_file_by_id(self.id)
-            ).text
-            save_csv = open(path, "w+")
-            save_csv.write(data_csv)
-            save_csv.close()
+            download_to_file(
+                partial(self.core_service.get_data_file_by_id, self.id, stream=True),
+                path,
+                resume=resume,
+                progress=progress,
+                desc="Download %s" % self.name,
+            )
         else:
             logger.error("[%s] Fail to Download", self.__class__.__name__)
 
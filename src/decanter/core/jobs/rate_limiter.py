@@ -0,0 +1,68 @@
+"""Pace the start of tasks on Decanter Core.
+
+Jobs submitted in bulk, such as the predictions of
+:func:`~decanter.core.client.CoreClient.predict_batch`, all become ready at
+once when the job they wait for is done. With a :class:`RateLimiter` they
+send their task at a steady rate instead of in a single burst.
+"""
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimiter:
+    """Token bucket limiting how many tasks start per second.
+
+    Up to ``burst`` tasks start at once, the next ones one every
+    ``1 / rate`` seconds, in the order they asked.
+
+    Example:
+        .. code-block:: python
+
+            limiter = RateLimiter(rate=5, burst=10)
+            for job in jobs:
+                job.rate_limiter = limiter
+
+    Args:
+        rate (float): Tasks started per second.
+        burst (int): Tasks that may start at once.
+        clock (func): Monotonic clock returning seconds.
+
+    Raises:
+        ValueError: If rate or burst isn't positive.
+    """
+
+    def __init__(self, rate, burst=1, clock=time.monotonic):
+        if rate <= 0 or burst < 1:
+            raise ValueError("Invalid rate %s or burst %s" % (rate, burst))
+        self.rate = rate
+        self.burst = burst
+        self.clock = clock
+        self._tokens = float(burst)
+        self._updated = None
+
+    def _refill(self):
+        now = self.clock()
+        if self._updated is not None:
+            elapsed = now - self._updated
+            self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def reserve(self):
+        """Take a token, borrowing it from the future if none is left.
+
+        Returns:
+            float: Seconds to wait before starting.
+        """
+        self._refill()
+        self._tokens -= 1
+        return max(-self._tokens / self.rate, 0.0)
+
+    async def acquire(self):
+        """Wait for the turn to start a task."""
+        delay = self.reserve()
+        if delay > 0:
+            logger.debug("[RateLimiter] wait %.3fs", delay)
+            await asyncio.sleep(delay)
@@ -0,0 +1,191 @@
+"""Scheduler bounding how many :class:`~decanter.core.jobs.job.Job` run
+their task on Decanter Core at the same time.
+
+:func:`~decanter.core.context.Context.run` gathers every queued job at
+once. With a scheduler, a job whose prerequired jobs are done waits for a
+free slot, overall and for its task type, before running its task. Waiting
+jobs start in priority order as the running ones finish, or as workers of
+Decanter Core turn idle if a
+:class:`~decanter.core.jobs.worker_monitor.WorkerMonitor` is given.
+"""
+import asyncio
+import bisect
+import itertools
+import logging
+
+from decanter.core.core_api import Worker
+from decanter.core.extra.utils import check_response
+
+logger = logging.getLogger(__name__)
+
+
+class JobScheduler:
+    """Start jobs in priority order within running limits.
+
+    Example:
+        .. code-block:: python
+
+            from decanter import core
+            from decanter.core.jobs import JobScheduler
+
+            client = core.CoreClient(
+                username='usr', password='pwd', host='decantercoreserver',
+                scheduler=JobScheduler(max_running=8, max_per_type={'train': 2}))
+
+    Args:
+        max_running (int): Tasks running at the same time, None for no
+            limit.
+        max_per_type (dict): Tasks running at the same time per task type,
+            ``upload``, ``setup``, ``train`` or ``predict``. Types not
+            given are only bound by max_running.
+        monitor (:class:`~decanter.core.jobs.worker_monitor.WorkerMonitor`):
+            (opt) Admit tasks of the monitored types only while a matching
+            worker of Decanter Core is idle.
+
+    Attributes:
+        running (dict): Number of running tasks per task type.
+        started (int): Number of tasks started through the scheduler.
+    """
+
+    def __init__(self, max_running=None, max_per_type=None, monitor=None):
+        self.max_running = max_running
+        self.max_per_type = dict(max_per_type or {})
+        self.monitor = monitor
+        self.running = {}
+        self.started = 0
+        self._queue = []
+        self._order = itertools.count()
+        self._watcher = None
+
+    def use_context(self, context):
+        """Monitor the workers of context.
+
+        Args:
+            context (:class:`~decanter.core.context.Context`): Context the
+                scheduler is set up with.
+        """
+        if self.monitor is not None:
+            self.monitor.use_context(context)
+
+    @classmethod
+    def from_workers(cls, context=None, per_worker=1, max_per_type=None):
+        """Size the scheduler to the workers of Decanter Core.
+
+        Allow ``per_worker`` running tasks for each worker counted by
+        ``/v2/worker/count``. If the count is given per worker type, the
+        types matching task types bound them too.
+
+        Args:
+            context (:class:`~decanter.core.context.Context`): (opt) Context
+                of the server to count workers of.
+            per_worker (int): Running tasks allowed per worker.
+            max_per_type (dict): (opt) Limits overriding the counted ones.
+
+        Returns:
+            :class:`JobScheduler`
+        """
+        counts = check_response(Worker(context).get_count()).json()
+        if isinstance(counts, dict) and "data" in counts:
+            counts = counts["data"]
+        if isinstance(counts, dict):
+            counts = {
+                key: val
+                for key, val in counts.items()
+                if isinstance(val, int) and not isinstance(val, bool)
+            }
+            total = sum(counts.values())
+        else:
+            total, counts = int(counts), {}
+        limits = {key: max(val * per_worker, 1) for key, val in counts.items()}
+        limits.update(max_per_type or {})
+        logger.info("[Scheduler] %s workers of Decanter Core: %s", total, counts)
+        return cls(max_running=max(total * per_worker, 1), max_per_type=limits)
+
+    @property
+    def total_running(self):
+        """int: Number of running tasks."""
+        return sum(self.running.values())
+
+    @property
+    def queued(self):
+        """int: Number of jobs waiting for a slot."""
+        return len(self._queue)
+
+    def _has_slot(self, task_type):
+        if self.max_running is not None and self.total_running >= self.max_running:
+            return False
+        limit = self.max_per_type.get(task_type)
+        if limit is not None and self.running.get(task_type, 0) >= limit:
+            return False
+        if self.monitor is not None:
+            capacity = self.monitor.capacity(task_type)
+            return capacity is None or capacity > 0
+        return True
+
+    def _start(self, task_type):
+        self.running[task_type] = self.running.get(task_type, 0) + 1
+        self.started += 1
+        if self.monitor is not None:
+            self.monitor.reserve(task_type)
+
+    async def _watch_workers(self):
+        """Poll the workers and admit waiting jobs until none is left."""
+        while self._queue:
+            await asyncio.sleep(self.monitor.interval)
+            await self.monitor.poll()
+            self._dispatch()
+
+    async def acquire(self, job):
+        """Wait until the task of job may run.
+
+        Args:
+            job (:class:`~decanter.core.jobs.job.Job`): Job about to run its
+                task, jobs with a lower ``priority`` start first.
+        """
+        task_type = job.task.task_type
+        monitor = self.monitor
+        if monitor is not None and task_type in monitor.task_types:
+            if monitor.is_stale():
+                await monitor.poll()
+        loop = asyncio.get_event_loop()
+        waiter = loop.create_future()
+        entry = (job.priority, next(self._order), task_type, waiter)
+        bisect.insort(self._queue, entry)
+        self._dispatch()
+        if not waiter.done():
+            logger.debug("[Scheduler] '%s' queued, %s waiting", job.name, self.queued)
+            if monitor is not None and (self._watcher is None or self._watcher.done()):
+                self._watcher = loop.create_task(self._watch_workers())
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if entry in self._queue:
+                self._queue.remove(entry)
+            elif not waiter.cancelled():
+                self.release(job)
+            raise
+
+    def release(self, job):
+        """Free the slot of job and start the waiting jobs that fit.
+
+        Args:
+            job (:class:`~decanter.core.jobs.job.Job`): Job whose task is
+                done.
+        """
+        self.running[job.task.task_type] -= 1
+        self._dispatch()
+
+    def _dispatch(self):
+        """Start the waiting jobs that fit, in priority order."""
+        for entry in list(self._queue):
+            _, _, waiting_type, waiter = entry
+            if waiter.cancelled():
+                self._queue.remove(entry)
+                continue
+            if self.max_running is not None and self.total_running >= self.max_running:
+                break
+            if not self._has_slot(waiting_type):
+                continue
+            self._queue.remove(entry)
+            self._start(waiting_type)
+            waiter.set_result(None)
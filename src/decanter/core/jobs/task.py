@@ -12,8 +12,11 @@ from functools import partial
 from decanter.core import Context
 from decanter.core.core_api import CoreAPI
 from decanter.core.extra import CoreStatus, CoreKeys
+from decanter.core.extra.stream import Compressor, stream_size
+from decanter.core.jobs.poll_policy import DEFAULT_POLL_POLICY
 from decanter.core.extra.utils import (
     check_response,
+    decode_json,
     gen_id,
     isnotebook,
     exception_handler,
@@ -42,12 +45,34 @@ class Task:
         status (str): Status of task.
         result (value of the task result): The result of executing the task.
         name (str): Name of task for tracking process.
+        progress (float): Progress of the task process.
+        poll_policy (:class:`~decanter.core.jobs.poll_policy.PollPolicy`):
+            Policy overriding the context's one for this task.
+        poll_state (dict): State kept by the poll policy.
+        context (:class:`~decanter.core.context.Context`): Context whose
+            loop, poller and policy drive the task.
     """
 
+    task_type = None
+    "str: Type of task, bound by a :class:`~decanter.core.jobs.JobScheduler`."
+
     def __init__(self, name=None):
         self.status = CoreStatus.PENDING
         self.result = None
         self.name = name
+        self.progress = 0
+        self.poll_policy = None
+        self.poll_state = {}
+        self.context = Context
+
+    def use_context(self, context):
+        """Run the task in context instead of the shared Context.
+
+        Args:
+            context (:class:`~decanter.core.context.Context`): Context of
+                an isolated :class:`~decanter.core.client.CoreClient`.
+        """
+        self.context = context
 
     def is_done(self):
         """
@@ -79,6 +104,18 @@ class Task:
             self.status == CoreStatus.DONE and self.result is None
         )
 
+    def next_poll_interval(self):
+        """Get the seconds to wait before polling the task again.
+
+        Use the task's own poll policy, else the context's, else the
+        default :class:`~decanter.core.jobs.poll_policy.AdaptivePollPolicy`.
+
+        Returns:
+            float
+        """
+        policy = self.poll_policy or self.context.poll_policy or DEFAULT_POLL_POLICY
+        return policy.next_interval(self)
+
     @abc.abstractmethod
     def run(self):
         """Execute task.
@@ -120,20 +157,41 @@ class CoreTask(Task):
         self.core_service = CoreAPI()
         self.id = None
         self.response = None
-        self.progress = 0
         self.pbar = None
 
+    def use_context(self, context):
+        """Run the task in context and call the api of its host."""
+        super().use_context(context)
+        self.core_service = CoreAPI(context)
+
     async def update(self):
         """Update the response from Decanter server.
 
-        Get the task from sending api request and update the result
-        of response.
+        Wait for the next tick of the context's shared task poller if there
+        is one, else get the task by its own id.
+        """
+        if self.context.task_poller is not None:
+            await self.context.task_poller.refresh(self)
+        else:
+            await self.fetch_update()
+
+    async def fetch_update(self):
+        """Get the task by its id and update the result of response.
+
+        Await the request on the event loop if the context uses the async
+        transport, else send it in the default executor. The response is
+        decoded in the default executor either way, so large results don't
+        stall the polling of other tasks.
         """
-        func = partial(self.core_service.get_tasks_by_id, task_id=self.id)
-        self.response = await Context.LOOP.run_in_executor(None, func)
+        context = self.context
+        if context.async_api is not None:
+            resp = await context.async_api.get_tasks_by_id(task_id=self.id)
+        else:
+            func = partial(self.core_service.get_tasks_by_id, task_id=self.id)
+            resp = await context.LOOP.run_in_executor(None, func)
         if self.status in CoreStatus.DONE_STATUS:
             return
-        self.response = check_response(self.response).json()
+        self.response = await context.LOOP.run_in_executor(None, decode_json, resp)
         self.update_task_response()
         logger.debug("[Task]'%s' done update. status: %s", self.name, self.status)
 
@@ -151,7 +209,8 @@ class CoreTask(Task):
         @exception_handler
         def update_pbar(resp_progress):
             diff = int((resp_progress - self.progress) * 100)
-            self.pbar.update(diff)
+            if diff:
+                self.pbar.update(diff)
             self.progress = resp_progress
 
         for key_ in [CoreKeys.id, CoreKeys.progress, CoreKeys.result, CoreKeys.status]:
@@ -199,6 +258,8 @@ class CoreTask(Task):
 
         Send the stop task api to stop the running or pending task.
         """
+        if self.pbar is not None:
+            self.pbar.close()
         if self.id is not None:
             check_response(self.core_service.put_tasks_stop_by_id(self.id))
         logger.info(
@@ -212,22 +273,83 @@ class UploadTask(CoreTask):
 
     Attributes:
         file (csv-file-object): The csv file to be uploaded.
+        compressor (:class:`~decanter.core.extra.stream.Compressor`):
+            Compress the upload on the fly if compression is selected.
+        compression_ratio (float): Raw bytes per sent byte of compressed
+            upload.
+        multipart_threshold (int): Upload files larger than this many bytes
+            in parts sent concurrently, None to always upload at once.
+        multipart_options (dict): part_size, max_workers, max_retries of
+            :meth:`~decanter.core.core_api.api.CoreAPI.post_upload_chunked`.
     """
 
-    def __init__(self, file, name=None, eda=True):
+    task_type = "upload"
+
+    def __init__(
+        self,
+        file,
+        name=None,
+        eda=True,
+        compression=None,
+        compression_level=None,
+        multipart_threshold=None,
+        **multipart_options,
+    ):
         super().__init__(name=gen_id("UploadTask", name))
         self.file = file
         self.eda = eda
+        self.multipart_threshold = multipart_threshold
+        self.multipart_options = multipart_options
+        self.compressor = None
+        self.compression_ratio = None
+        if compression is not None:
+            self.compressor = Compressor(compression, level=compression_level)
+
+    def use_multipart(self):
+        """Whether to upload the file in parts.
+
+        Returns:
+            bool: True if the file is larger than ``multipart_threshold``.
+        """
+        if self.multipart_threshold is None or self.compressor is not None:
+            return False
+        size = stream_size(self.file)
+        return size is not None and size > self.multipart_threshold
 
     def run(self):
-        """Execute upload data by sending the upload api."""
+        """Execute upload data by sending the upload api.
+
+        Files larger than ``multipart_threshold`` are sent in parts with
+        :meth:`~decanter.core.core_api.api.CoreAPI.post_upload_chunked`.
+        """
+        if self.use_multipart():
+            super().run_core_task(
+                api_func=self.core_service.post_upload_chunked,
+                filename=self.file.name,
+                file=self.file,
+                size=stream_size(self.file),
+                eda=self.eda,
+                **self.multipart_options,
+            )
+            return
         super().run_core_task(
             api_func=self.core_service.post_upload,
             filename=self.file.name,
             file=self.file,
             eda=self.eda,
             encoding="text/plain(UTF-8)",
+            compressor=self.compressor,
         )
+        if self.compressor is not None and self.compressor.ratio is not None:
+            self.compression_ratio = self.compressor.ratio
+            logger.info(
+                "[UploadTask] '%s' %s compressed %s to %s bytes, ratio %.2f",
+                self.name,
+                self.compressor.codec,
+                self.compressor.raw_bytes,
+                self.compressor.compressed_bytes,
+                self.compression_ratio,
+            )
 
 
 class TrainTask(CoreTask):
@@ -238,15 +360,17 @@ class TrainTask(CoreTask):
             Settings for training.
     """
 
+    task_type = "train"
+
     def __init__(self, train_input, name=None):
         super().__init__(name=gen_id("TrainTask", name))
         self.train_input = train_input
 
     def run(self):
         """Execute model training by sending the triain api."""
-        train_params = self.train_input.get_train_params()
+        train_wire = self.train_input.get_train_wire()
         super().run_core_task(
-            api_func=self.core_service.post_tasks_train, **train_params
+            api_func=self.core_service.post_tasks_train, wire=train_wire
         )
 
 
@@ -258,6 +382,8 @@ class TrainTSTask(CoreTask):
             Settings for training time series forecast models.
     """
 
+    task_type = "train"
+
     def __init__(self, train_input, name=None):
         super().__init__(name=gen_id("TrainTSTask", name))
         self.train_input = train_input
@@ -265,9 +391,9 @@ class TrainTSTask(CoreTask):
     def run(self):
         """Execute time seires forecast model training by sending the auto
         time series forecast train api."""
-        train_params = self.train_input.get_train_params()
+        train_wire = self.train_input.get_train_wire()
         super().run_core_task(
-            api_func=self.core_service.post_tasks_auto_ts_train, **train_params
+            api_func=self.core_service.post_tasks_auto_ts_train, wire=train_wire
         )
 
 
@@ -279,15 +405,17 @@ class TrainClusterTask(CoreTask):
             Settings for training time series forecast models.
     """
 
+    task_type = "train"
+
     def __init__(self, train_input, name=None):
         super().__init__(name=gen_id("TrainClusterTask", name))
         self.train_input = train_input
 
     def run(self):
         """Execute clustering training by sending the cluster triain api."""
-        train_params = self.train_input.get_train_params()
+        train_wire = self.train_input.get_train_wire()
         super().run_core_task(
-            api_func=self.core_service.post_tasks_cluster_train, **train_params
+            api_func=self.core_service.post_tasks_cluster_train, wire=train_wire
         )
 
 
@@ -299,15 +427,17 @@ class PredictTask(CoreTask):
             Settings for prediction.
     """
 
+    task_type = "predict"
+
     def __init__(self, predict_input, name=None):
         super().__init__(name=gen_id("PredictTask", name))
         self.predict_input = predict_input
 
     def run(self):
         """Execute predict model training by sending the predict api."""
-        pred_params = self.predict_input.getPredictParams()
+        pred_wire = self.predict_input.getPredictWire()
         super().run_core_task(
-            api_func=self.core_service.post_tasks_predict, **pred_params
+            api_func=self.core_service.post_tasks_predict, wire=pred_wire
         )
 
 
@@ -320,6 +450,8 @@ class PredictTSTask(CoreTask):
             Settings for time series prediction.
     """
 
+    task_type = "predict"
+
     def __init__(self, predict_input, name=None):
         super().__init__(name=gen_id("PredictTSTask", name))
         self.predict_input = predict_input
@@ -327,9 +459,9 @@ class PredictTSTask(CoreTask):
     def run(self):
         """Execute time series models prediction by sending the time
         series predict api."""
-        pred_params = self.predict_input.getPredictParams()
+        pred_wire = self.predict_input.getPredictWire()
         super().run_core_task(
-            api_func=self.core_service.post_tasks_auto_ts_predict, **pred_params
+            api_func=self.core_service.post_tasks_auto_ts_predict, wire=pred_wire
         )
 
 
@@ -342,6 +474,8 @@ class SetupTask(CoreTask):
             Settings for set up data.
     """
 
+    task_type = "setup"
+
     def __init__(self, setup_input, name="Setup"):
         super().__init__(name=name)
         self.setup_input = setup_input
@@ -350,7 +484,7 @@ class SetupTask(CoreTask):
         """
         Execute setup data by sending the setup api.
         """
-        setup_params = self.setup_input.get_setup_params()
+        setup_wire = self.setup_input.get_setup_wire()
         super().run_core_task(
-            api_func=self.core_service.post_tasks_setup, **setup_params
+            api_func=self.core_service.post_tasks_setup, wire=setup_wire
         )
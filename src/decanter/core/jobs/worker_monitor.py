@@ -0,0 +1,183 @@
+"""Admission control of tasks by the idle workers of Decanter Core.
+
+A :class:`WorkerMonitor` polls ``/v2/worker/status`` and tells a
+:class:`~decanter.core.jobs.scheduler.JobScheduler` how many workers of a
+type are idle. Train and predict tasks are admitted only while a matching
+worker is idle and queue locally otherwise, instead of piling up as
+pending tasks on the server.
+"""
+import asyncio
+import functools
+import logging
+import time
+
+from decanter.core.core_api import Worker
+from decanter.core.extra.utils import check_response
+
+logger = logging.getLogger(__name__)
+
+
+class WorkerMonitor:
+    """Track the idle workers of each type.
+
+    Worker status is expected as a list of workers, or ``{"data": [...]}``,
+    each with its ``type`` and ``status``. Override :meth:`parse_status` for
+    other layouts.
+
+    Example:
+        .. code-block:: python
+
+            from decanter import core
+            from decanter.core.jobs import JobScheduler, WorkerMonitor
+
+            client = core.CoreClient(
+                username='usr', password='pwd', host='decantercoreserver',
+                scheduler=JobScheduler(monitor=WorkerMonitor(interval=5)))
+
+    Args:
+        interval (float): Seconds between two polls of worker status while
+            tasks are waiting.
+        task_types (list(str)): Task types admitted by worker capacity,
+            others are never held back.
+        type_map (dict): Task type of each worker type whose name differs,
+            e.g. ``{'trainer': 'train'}``.
+        idle_status (list(str)): Worker status meaning idle.
+        context (:class:`~decanter.core.context.Context`): (opt) Context
+            of the server to poll, defaults to the scheduler's.
+        clock (func): Monotonic clock returning seconds.
+
+    Attributes:
+        idle (dict): Idle workers per task type left to admit tasks to,
+            None before the first poll.
+        polls (int): Number of polls done.
+        reservations (int): Number of tasks admitted so far.
+    """
+
+    IDLE_STATUS = ["idle", "ready", "available"]
+
+    def __init__(
+        self,
+        interval=5,
+        task_types=("train", "predict"),
+        type_map=None,
+        idle_status=None,
+        context=None,
+        clock=time.monotonic,
+    ):
+        self.interval = interval
+        self.task_types = set(task_types)
+        self.type_map = dict(type_map or {})
+        self.idle_status = set(idle_status or self.IDLE_STATUS)
+        self.context = context
+        self.clock = clock
+        self.idle = None
+        self.polls = 0
+        self.updated_at = None
+        self.reservations = 0
+        self._reserved = []
+        self._polling = None
+
+    def use_context(self, context):
+        """Poll the workers of context unless given one at creation.
+
+        Args:
+            context (:class:`~decanter.core.context.Context`): Context the
+                scheduler is set up with.
+        """
+        if self.context is None:
+            self.context = context
+
+    def parse_status(self, body):
+        """Count the idle workers per task type in the worker status.
+
+        Args:
+            body: JSON-decoded response of ``/v2/worker/status``.
+
+        Returns:
+            dict: Idle workers of each monitored task type.
+        """
+        if isinstance(body, dict):
+            body = body.get("data", body.get("workers", []))
+        idle = dict.fromkeys(self.task_types, 0)
+        for worker in body or []:
+            worker_type = worker.get("type", worker.get("task_type"))
+            task_type = self.type_map.get(worker_type, worker_type)
+            if task_type not in idle:
+                continue
+            if str(worker.get("status", "")).lower() in self.idle_status:
+                idle[task_type] += 1
+        return idle
+
+    def fetch(self):
+        """Get the idle workers per task type from Decanter Core.
+
+        Returns:
+            dict: See :meth:`parse_status`.
+        """
+        resp = Worker(self.context).get_status()
+        return self.parse_status(check_response(resp).json())
+
+    def refresh(self):
+        """Get the worker status and reset the idle counts."""
+        self._update(self.fetch(), self.reservations)
+
+    def _update(self, idle, polled_after):
+        """Reset the idle counts to a worker status fetched after the
+        first polled_after reservations.
+
+        Those reservations are in the status already and are dropped, the
+        ones made while fetching are kept counted against it.
+        """
+        self._reserved = [
+            (seq, task_type) for seq, task_type in self._reserved if seq > polled_after
+        ]
+        for _, task_type in self._reserved:
+            if task_type in idle:
+                idle[task_type] = max(idle[task_type] - 1, 0)
+        self.idle = idle
+        self.updated_at = self.clock()
+        self.polls += 1
+        logger.debug("[WorkerMonitor] idle workers: %s", idle)
+
+    def _on_polled(self, polled_after, future):
+        if not future.cancelled() and future.exception() is None:
+            self._update(future.result(), polled_after)
+
+    def is_stale(self):
+        """bool: True if the idle counts are older than interval."""
+        return self.idle is None or self.clock() - self.updated_at >= self.interval
+
+    async def poll(self):
+        """Refresh in the default executor, concurrent calls share a poll.
+
+        The counts are reset on the event loop once the status is fetched,
+        tasks admitted meanwhile stay counted against the new status.
+        """
+        if self._polling is None or self._polling.done():
+            loop = asyncio.get_event_loop()
+            self._polling = loop.run_in_executor(None, self.fetch)
+            self._polling.add_done_callback(
+                functools.partial(self._on_polled, self.reservations)
+            )
+        try:
+            await asyncio.shield(self._polling)
+        except Exception as err:  # pylint: disable=broad-except
+            logger.error("[WorkerMonitor] fail to get worker status: %s", err)
+
+    def capacity(self, task_type):
+        """Get the tasks of task_type that may still be admitted.
+
+        Returns:
+            int: Idle workers left, None if task_type isn't held back.
+        """
+        if task_type not in self.task_types or self.idle is None:
+            return None
+        return self.idle.get(task_type, 0)
+
+    def reserve(self, task_type):
+        """Count an admitted task against the idle workers until a poll
+        started after it."""
+        if self.capacity(task_type) is not None:
+            self.reservations += 1
+            self._reserved.append((self.reservations, task_type))
+            self.idle[task_type] -= 1
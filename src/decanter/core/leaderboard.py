@@ -0,0 +1,373 @@
+"""Rank the models of an experiment by their scores.
+
+:class:`Leaderboard` keeps the scores of all models in one NumPy matrix of
+models x metrics x score types, so ranking thousands of models by one or
+many metrics is done with array operations instead of Python loops.
+"""
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from decanter.core.enums.evaluators import Evaluator
+
+SCORE_TYPES = ["cv_averages", "validation_scores"]
+
+# Metrics where the lower score is the better one.
+MINIMIZED_METRICS = {
+    Evaluator.mse.value,
+    Evaluator.mae.value,
+    Evaluator.mean_per_class_error.value,
+    Evaluator.deviance.value,
+    Evaluator.logloss.value,
+    Evaluator.rmse.value,
+    Evaluator.rmsle.value,
+    Evaluator.misclassification.value,
+    Evaluator.mape.value,
+    Evaluator.wmape.value,
+}
+
+
+def _to_float(val):
+    try:
+        return float(val)
+    except (TypeError, ValueError):
+        return np.nan
+
+
+class Leaderboard:
+    """Columnar scores of the models in an experiment.
+
+    Missing or non-numeric scores are NaN and never ranked.
+
+    Example:
+        .. code-block:: python
+
+            board = Leaderboard.from_experiment(exp)
+            board.top_k('auc', k=5)
+            board.pareto(['auc', 'logloss'], score_type='validation_scores')
+
+    Args:
+        attributes (dict): ``attributes`` of experiment, the scores of each
+            model by score type and metric.
+        score_types (list(str)): Score types to keep.
+
+    Attributes:
+        model_ids (numpy.ndarray): Model ids, one per row.
+        metrics (list(str)): Metric names, one per column.
+        score_types (list(str)): Score types, one per depth.
+        scores (numpy.ndarray): Float matrix of shape
+            (models, metrics, score types).
+    """
+
+    def __init__(self, attributes, score_types=None):
+        self.score_types = list(score_types or SCORE_TYPES)
+        attributes = attributes or {}
+        models = list(attributes.items())
+        self.model_ids = np.array(
+            [val.get("model_id", key) for key, val in models], dtype=object
+        )
+        metrics = set()
+        for _, val in models:
+            for score_type in self.score_types:
+                metrics.update(val.get(score_type) or {})
+        self.metrics = sorted(metrics)
+        index = {metric: i for i, metric in enumerate(self.metrics)}
+
+        self.scores = np.full(
+            (len(models), len(self.metrics), len(self.score_types)), np.nan
+        )
+        for row, (_, val) in enumerate(models):
+            for depth, score_type in enumerate(self.score_types):
+                for metric, score in (val.get(score_type) or {}).items():
+                    self.scores[row, index[metric], depth] = _to_float(score)
+
+    @classmethod
+    def from_experiment(cls, exp, score_types=None):
+        """Build the leaderboard of an experiment's models.
+
+        Args:
+            exp (:class:`~decanter.core.jobs.experiment.Experiment`)
+
+        Returns:
+            :class:`Leaderboard`
+        """
+        return cls(exp.attributes, score_types=score_types)
+
+    def __len__(self):
+        return len(self.model_ids)
+
+    @staticmethod
+    def is_minimized(metric):
+        """Whether lower scores of metric are better."""
+        return metric in MINIMIZED_METRICS
+
+    def column(self, metric, score_type="cv_averages"):
+        """Get the scores of all models in metric and score type.
+
+        Returns:
+            numpy.ndarray: Scores of each model, NaN for all models if the
+            metric is unknown.
+        """
+        if metric not in self.metrics:
+            return np.full(len(self), np.nan)
+        return self.scores[
+            :, self.metrics.index(metric), self.score_types.index(score_type)
+        ]
+
+    def _gains(self, metric, score_type):
+        """Scores oriented so that higher is better."""
+        scores = self.column(metric, score_type)
+        return -scores if self.is_minimized(metric) else scores
+
+    def top_k(self, metric, k=10, score_type="cv_averages"):
+        """Get the ids of the k best models in metric.
+
+        Args:
+            metric (str): Metric to rank by.
+            k (int): Number of models.
+            score_type (str): ``cv_averages`` or ``validation_scores``.
+
+        Returns:
+            list(str): Model ids, the best first.
+        """
+        gains = self._gains(metric, score_type)
+        valid = np.flatnonzero(~np.isnan(gains))
+        k = min(k, len(valid))
+        if k <= 0:
+            return []
+        if k < len(valid):
+            valid = valid[np.argpartition(-gains[valid], k - 1)[:k]]
+        ranked = valid[np.argsort(-gains[valid], kind="stable")]
+        return list(self.model_ids[ranked])
+
+    def best(self, metric, score_type="cv_averages"):
+        """Get the id of the best model in metric.
+
+        Returns:
+            str: Model id, None if no model has a valid score.
+        """
+        gains = self._gains(metric, score_type)
+        if np.isnan(gains).all():
+            return None
+        # the first of equally good models, like min and max do
+        return self.model_ids[np.nanargmax(gains)]
+
+    def pareto(self, metrics, score_type="cv_averages"):
+        """Get the models no other model beats in all metrics.
+
+        A model is dominated if another one is at least as good in every
+        metric and better in one. Models with a NaN score in any of the
+        metrics are left out. Models are swept in lexicographic order of
+        their scores, each checked against the front only, so memory stays
+        linear in the number of models.
+
+        Args:
+            metrics (list(str)): Metrics to trade off.
+            score_type (str): ``cv_averages`` or ``validation_scores``.
+
+        Returns:
+            list(str): Model ids of the Pareto front.
+        """
+        gains = np.column_stack([self._gains(m, score_type) for m in metrics])
+        valid = np.flatnonzero(~np.isnan(gains).any(axis=1))
+        gains = gains[valid]
+        # a model comes after the models dominating it in lexicographic
+        # order, so checking it against the front found so far is enough
+        order = np.lexsort(-gains[:, ::-1].T)
+        front = np.empty_like(gains)
+        size = 0
+        on_front = np.zeros(len(gains), dtype=bool)
+        for row in order:
+            found = front[:size]
+            if size and (
+                (found >= gains[row]).all(axis=1) & (found > gains[row]).any(axis=1)
+            ).any():
+                continue
+            front[size] = gains[row]
+            size += 1
+            on_front[row] = True
+        return list(self.model_ids[valid[on_front]])
+
+    def to_frame(self, score_type="cv_averages"):
+        """Get the scores of score type as a DataFrame.
+
+        Returns:
+            :class:`pandas.DataFrame`: Models as rows and metrics as columns.
+        """
+        depth = self.score_types.index(score_type)
+        return pd.DataFrame(
+            self.scores[:, :, depth], index=self.model_ids, columns=self.metrics
+        )
+
+
+class LeaderboardIndex:
+    """Scores of models across many experiments in one columnar table.
+
+    Each row is the score of a model in one metric and score type, with the
+    experiment, train data, target and model type it belongs to. String
+    columns are categorical to stay compact over hundreds of experiments.
+
+    Example:
+        .. code-block:: python
+
+            index = LeaderboardIndex()
+            index.append(Experiment.create_many(exp_ids))
+            index.top_k('auc', k=20, train_data_id=data.id)
+            index.to_parquet('leaderboard.parquet')
+            index = LeaderboardIndex.read_parquet('leaderboard.parquet')
+
+    Args:
+        frame (:class:`pandas.DataFrame`): (opt) Rows with :attr:`COLUMNS`,
+            ex. read back from a Parquet file.
+    """
+
+    COLUMNS = ["exp_id", "model_id", "train_data_id", "target", "model_type"]
+    COLUMNS += ["score_type", "metric", "score"]
+
+    def __init__(self, frame=None):
+        self._pending = {}
+        self._frame = self._compact(frame) if frame is not None else None
+
+    @classmethod
+    def _compact(cls, frame):
+        frame = frame[cls.COLUMNS].reset_index(drop=True)
+        for col in cls.COLUMNS[:-1]:
+            frame[col] = frame[col].astype("category")
+        frame["score"] = frame["score"].astype("float64")
+        return frame
+
+    @staticmethod
+    def experiment_frame(exp):
+        """Get the rows of an experiment's model scores.
+
+        Args:
+            exp (:class:`~decanter.core.jobs.experiment.Experiment`)
+
+        Returns:
+            :class:`pandas.DataFrame`
+        """
+        board = exp.leaderboard()
+        n_models, n_metrics, n_types = board.scores.shape
+        hyperparameters = exp.hyperparameters or {}
+        size = n_models * n_metrics * n_types
+        return pd.DataFrame(
+            {
+                "exp_id": np.repeat(exp.id, size),
+                "model_id": np.repeat(board.model_ids, n_metrics * n_types),
+                "train_data_id": np.repeat(exp.train_data_id, size),
+                "target": np.repeat(exp.target, size),
+                "model_type": np.repeat(hyperparameters.get("model_type"), size),
+                "score_type": np.tile(board.score_types, n_models * n_metrics),
+                "metric": np.tile(np.repeat(board.metrics, n_types), n_models),
+                "score": board.scores.reshape(-1),
+            }
+        )
+
+    def append(self, experiments):
+        """Add the models of finished experiments.
+
+        Rows of an experiment already in the index are replaced. Items which
+        aren't experiments, such as the errors returned by
+        :meth:`~decanter.core.jobs.experiment.Experiment.create_many`, and
+        experiments without models are skipped.
+
+        Args:
+            experiments (list(:class:`~decanter.core.jobs.experiment.Experiment`)):
+                Experiments, or a single one.
+        """
+        if not isinstance(experiments, (list, tuple)):
+            experiments = [experiments]
+        for exp in experiments:
+            if getattr(exp, "attributes", None):
+                # the latest append of an experiment wins
+                self._pending.pop(exp.id, None)
+                self._pending[exp.id] = self.experiment_frame(exp)
+
+    @property
+    def frame(self):
+        """:class:`pandas.DataFrame`: All rows, appended ones merged in.
+
+        The table is kept between accesses, only the experiments appended
+        since are compacted and merged in.
+        """
+        if self._frame is None:
+            self._frame = self._compact(pd.DataFrame(columns=self.COLUMNS))
+        if self._pending:
+            new = self._compact(pd.concat(self._pending.values(), ignore_index=True))
+            old = self._frame
+            replaced = old["exp_id"].isin(list(self._pending))
+            if replaced.any():
+                old = old[~replaced]
+                old = old.assign(exp_id=old["exp_id"].cat.remove_unused_categories())
+            self._frame, self._pending = self._concat(old, new), {}
+        return self._frame
+
+    @classmethod
+    def _concat(cls, first, second):
+        """Stack two compact frames, merging the categories of each column."""
+        if not len(first):
+            return second
+        columns = {}
+        for col in cls.COLUMNS[:-1]:
+            parts = [first[col], second[col]]
+            if parts[0].cat.categories.dtype != parts[1].cat.categories.dtype:
+                parts = [
+                    part.cat.set_categories(part.cat.categories.astype(object))
+                    for part in parts
+                ]
+            columns[col] = union_categoricals(parts)
+        columns["score"] = np.concatenate(
+            [first["score"].to_numpy(), second["score"].to_numpy()]
+        )
+        return pd.DataFrame(columns, columns=cls.COLUMNS)
+
+    def __len__(self):
+        frame = self.frame
+        return len(frame[["exp_id", "model_id"]].drop_duplicates())
+
+    def query(self, metric, score_type="cv_averages", **filters):
+        """Get the valid scores of metric, the best first.
+
+        Args:
+            metric (str): Metric to rank by.
+            score_type (str): ``cv_averages`` or ``validation_scores``.
+            filters: Column values to keep, a list keeps any of its values,
+                ex. ``train_data_id=data.id, model_type='regression'``.
+
+        Returns:
+            :class:`pandas.DataFrame`
+        """
+        frame = self.frame
+        mask = (frame["metric"] == metric) & (frame["score_type"] == score_type)
+        mask &= frame["score"].notna()
+        for col, val in filters.items():
+            if col not in self.COLUMNS:
+                raise KeyError("[LeaderboardIndex] no column %s" % col)
+            if isinstance(val, (list, tuple, set)):
+                mask &= frame[col].isin(list(val))
+            else:
+                mask &= frame[col] == val
+        return frame[mask].sort_values(
+            "score", ascending=Leaderboard.is_minimized(metric), kind="stable"
+        )
+
+    def top_k(self, metric, k=20, score_type="cv_averages", **filters):
+        """Get the k best models in metric across all experiments.
+
+        Returns:
+            :class:`pandas.DataFrame`: At most k rows, the best first.
+        """
+        return self.query(metric, score_type=score_type, **filters).head(k)
+
+    def to_parquet(self, path):
+        """Persist the index to a Parquet file, requires pyarrow."""
+        self.frame.to_parquet(path, index=False)
+
+    @classmethod
+    def read_parquet(cls, path):
+        """Load an index persisted by :meth:`to_parquet`.
+
+        Returns:
+            :class:`LeaderboardIndex`
+        """
+        return cls(pd.read_parquet(path))
@@ -0,0 +1,227 @@
+# pylint: disable=redefined-outer-name
+"""Test related method and functionality of AsyncCoreAPI."""
+import asyncio
+import io
+
+import pytest
+
+from decanter.core import Context
+from decanter.core.core_api import AsyncCoreAPI, async_api
+from decanter.core.extra import CoreStatus
+from decanter.core.extra.stream import Compressor
+from decanter.core.extra.utils import check_response
+from decanter.core.jobs.task import CoreTask
+
+web = pytest.importorskip("aiohttp.web")
+test_utils = pytest.importorskip("aiohttp.test_utils")
+
+TASK_ID = "4asynctaskid"
+
+
+@pytest.fixture
+def async_server():
+    """Serve a fake task endpoint and point the Context at it."""
+    loop = asyncio.new_event_loop()
+    requests_seen = []
+
+    async def get_task(request):
+        requests_seen.append(request)
+        if request.headers.get("Authorization") is None:
+            return web.json_response({}, status=401)
+        return web.json_response(
+            {
+                "_id": request.match_info["task_id"],
+                "status": CoreStatus.DONE,
+                "progress": 1,
+                "result": {"_id": "4dataid"},
+            }
+        )
+
+    app = web.Application()
+    app.router.add_get("/v2/tasks/{task_id}", get_task)
+    server = test_utils.TestServer(app)
+    loop.run_until_complete(server.start_server())
+    Context.USERNAME, Context.PASSWORD = "usr", "pwd"
+    Context.HOST = str(server.make_url("")).rstrip("/")
+    Context.LOOP = loop
+
+    yield loop, requests_seen
+
+    loop.run_until_complete(server.close())
+    loop.close()
+    Context.USERNAME = Context.PASSWORD = Context.HOST = Context.LOOP = None
+    Context.async_api = None
+
+
+def test_async_get_task(async_server):
+    """AsyncCoreAPI awaits the endpoint and returns a checkable response."""
+    loop, requests_seen = async_server
+    api = AsyncCoreAPI(max_connections=2)
+
+    async def get():
+        resp = await api.get_tasks_by_id(task_id=TASK_ID)
+        await api.close()
+        return resp
+
+    resp = loop.run_until_complete(get())
+    assert check_response(resp).json()["_id"] == TASK_ID
+    assert len(requests_seen) == 1
+
+
+def test_core_task_update_with_async_api(async_server):
+    """CoreTask.update polls through the async transport once selected."""
+    loop, requests_seen = async_server
+    Context.async_api = AsyncCoreAPI()
+    task = CoreTask(name="async")
+    task.id = TASK_ID
+
+    loop.run_until_complete(task.update())
+    loop.run_until_complete(Context.async_api.close())
+
+    assert task.status == CoreStatus.DONE
+    assert task.result == {"_id": "4dataid"}
+    assert len(requests_seen) == 1
+
+
+def test_async_chunked_upload_awaits_every_part():
+    """Parts are awaited and retried alone, then the upload is committed."""
+    loop = asyncio.new_event_loop()
+    csv = b"".join(b"%d,%d\n" % (i, i * 3) for i in range(5000))
+    parts, attempts, completed = {}, {}, []
+
+    async def init(request):
+        assert (await request.json())["size"] == len(csv)
+        return web.json_response({"upload_id": "up1"})
+
+    async def put_part(request):
+        number = int(request.match_info["number"])
+        attempts[number] = attempts.get(number, 0) + 1
+        if number == 2 and attempts[number] == 1:
+            return web.json_response({}, status=400)
+        parts[number] = await request.read()
+        return web.json_response({}, headers={"ETag": "etag%d" % number})
+
+    async def complete(request):
+        completed.extend((await request.json())["parts"])
+        return web.json_response({"_id": "task1"})
+
+    app = web.Application()
+    app.router.add_post("/v2/upload/multipart", init)
+    app.router.add_put("/v2/upload/multipart/up1/parts/{number}", put_part)
+    app.router.add_post("/v2/upload/multipart/up1/complete", complete)
+    server = test_utils.TestServer(app)
+    loop.run_until_complete(server.start_server())
+    context = type("Ctx", (), {})
+    context.USERNAME, context.PASSWORD = "usr", "pwd"
+    context.HOST = str(server.make_url("")).rstrip("/")
+    api = AsyncCoreAPI(context=context)
+
+    async def upload():
+        resp = await api.post_upload_chunked(
+            filename="train.csv",
+            file=io.BytesIO(csv),
+            size=len(csv),
+            part_size=10000,
+            max_workers=3,
+            backoff_factor=0,
+        )
+        await api.close()
+        return resp
+
+    try:
+        resp = loop.run_until_complete(upload())
+    finally:
+        loop.run_until_complete(server.close())
+        loop.close()
+
+    assert check_response(resp).json()["_id"] == "task1"
+    assert b"".join(parts[number] for number in sorted(parts)) == csv
+    assert attempts[2] == 2 and all(
+        count == 1 for number, count in attempts.items() if number != 2
+    )
+    assert [part["etag"] for part in completed] == [
+        "etag%d" % part["part_number"] for part in completed
+    ]
+    assert [part["part_number"] for part in completed] == sorted(parts)
+
+
+def test_only_idempotent_methods_are_retried(monkeypatch):
+    """A 502 retries a GET but never submits a POST twice."""
+    monkeypatch.setattr(async_api, "RETRY_BACKOFF_FACTOR", 0)
+    loop = asyncio.new_event_loop()
+    hits = {"GET": 0, "POST": 0}
+
+    async def bad_gateway(request):
+        hits[request.method] += 1
+        return web.json_response({}, status=502)
+
+    app = web.Application()
+    app.router.add_get("/v2/tasks/{task_id}", bad_gateway)
+    app.router.add_post("/v2/tasks/train", bad_gateway)
+    server = test_utils.TestServer(app)
+    loop.run_until_complete(server.start_server())
+    context = type("Ctx", (), {})
+    context.USERNAME, context.PASSWORD = "usr", "pwd"
+    context.HOST = str(server.make_url("")).rstrip("/")
+    api = AsyncCoreAPI(context=context)
+
+    async def send():
+        statuses = [
+            (await api.get_tasks_by_id(task_id=TASK_ID)).status_code,
+            (await api.post_tasks_train(target="y")).status_code,
+        ]
+        await api.close()
+        return statuses
+
+    try:
+        statuses = loop.run_until_complete(send())
+    finally:
+        loop.run_until_complete(server.close())
+        loop.close()
+
+    assert statuses == [502, 502]
+    assert hits == {"GET": async_api.RETRY_TOTAL + 1, "POST": 1}
+
+
+def test_async_compressed_upload():
+    """The multipart body is gzipped on the fly with Content-Encoding set."""
+    loop = asyncio.new_event_loop()
+    csv = b"".join(b"%d,%d\n" % (i, i * 3) for i in range(5000))
+    received = {}
+
+    async def upload(request):
+        received["encoding"] = request.headers.get("Content-Encoding")
+        received["body"] = await request.content.read()
+        return web.json_response({"_id": "task1"})
+
+    app = web.Application()
+    app.router.add_post("/v2/upload", upload)
+    server = test_utils.TestServer(app)
+    loop.run_until_complete(server.start_server())
+    context = type("Ctx", (), {})
+    context.USERNAME, context.PASSWORD = "usr", "pwd"
+    context.HOST = str(server.make_url("")).rstrip("/")
+    api = AsyncCoreAPI(context=context)
+    compressor = Compressor("gzip", chunk_size=4096)
+
+    async def send():
+        resp = await api.post_upload(
+            filename="train.csv",
+            file=io.BytesIO(csv),
+            encoding="text/plain(UTF-8)",
+            compressor=compressor,
+        )
+        await api.close()
+        return resp
+
+    try:
+        resp = loop.run_until_complete(send())
+    finally:
+        loop.run_until_complete(server.close())
+        loop.close()
+
+    assert check_response(resp).json()["_id"] == "task1"
+    assert received["encoding"] == "gzip"
+    # the server decodes the gzip content encoding
+    assert csv in received["body"]
+    assert compressor.ratio > 1 and compressor.raw_bytes > len(csv)
@@ -0,0 +1,102 @@
+"""Test related method and functionality of request body serialization."""
+import json
+from types import SimpleNamespace
+
+import pytest
+import responses
+
+from decanter.core import Context
+from decanter.core.core_api import CoreAPI, CoreBody
+from decanter.core.core_api import body_obj
+from decanter.core.core_api.setup_input import ColumnSpec, SetupInput
+
+BACKENDS = ["json"] + (["orjson"] if body_obj.orjson is not None else [])
+
+
+@pytest.fixture
+def setup_input():
+    """Setup input of uploaded data."""
+    data = SimpleNamespace(
+        id="data-id", accessor={"uri": "/data/train.csv", "format": "csv"}
+    )
+    return SetupInput(
+        data=data,
+        data_columns=[
+            {"id": "a", "data_type": "numerical"},
+            {"id": "b", "data_type": "categorical", "nullable": True},
+        ],
+        eda=True,
+    )
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_to_wire_matches_params(setup_input, backend):
+    """Wire bytes decode to the params built by the dumps and loads path."""
+    params = setup_input.get_setup_params()
+    expected = json.loads(
+        json.dumps(setup_input.setup_body.jsonable(), cls=CoreBody.ComplexEncoder)
+    )
+    wire = setup_input.setup_body.to_wire(backend=backend)
+
+    assert isinstance(wire, bytes)
+    assert json.loads(wire) == expected == params
+    assert params["data_id"] == "data-id"
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_dumps_encodes_tuples_and_nested_objects(backend):
+    """Named tuples become arrays and nested CoreX objects their dict."""
+    body = {
+        "cols": ColumnSpec("a", "numerical"),
+        "acc": CoreBody.Accessor.create(uri="u", format="csv"),
+    }
+
+    assert json.loads(body_obj.dumps(body, backend=backend)) == {
+        "cols": ["a", "numerical"],
+        "acc": {"uri": "u", "format": "csv"},
+    }
+
+
+@responses.activate
+def test_post_task_sends_wire_bytes(setup_input):
+    """The serialized body is sent as is, with a JSON content type."""
+    Context.HOST, Context.USERNAME, Context.PASSWORD = "http://core.test", "u", "p"
+    responses.add(responses.POST, "http://core.test/v2/tasks/setup", json={})
+    try:
+        wire = setup_input.get_setup_wire()
+        CoreAPI().post_tasks_setup(wire=wire)
+        CoreAPI().post_tasks_setup(**setup_input.get_setup_params())
+    finally:
+        Context.HOST = Context.USERNAME = Context.PASSWORD = None
+
+    sent, legacy = [call.request for call in responses.calls]
+    assert sent.body == wire
+    assert sent.headers["Content-Type"] == "application/json"
+    assert json.loads(sent.body) == json.loads(legacy.body)
+
+
+def test_body_objects_are_slotted_records():
+    """Fields are declared, unknown ones rejected and None ones omitted."""
+    col = CoreBody.Column(id="a", data_type="numerical")
+
+    assert not hasattr(col, "__dict__")
+    assert col.jsonable() == {"id": "a", "data_type": "numerical"}
+    assert col == CoreBody.column_array([{"id": "a", "data_type": "numerical"}])[0]
+    with pytest.raises(TypeError):
+        CoreBody.Column(id="a", data_type="numerical", unknown=1)
+
+
+def test_cv_obj_array_nests_folds():
+    """Cross validation folds become CVObjects encoded as plain arrays."""
+    folds = [{"train": {"start": 0, "end": 9}, "test": {"start": 10, "end": 19}}]
+    train = CoreBody.CVTrain.create(start=0, end=19)
+    split = CoreBody.TimeSeriesSplit.create(
+        split_by="ts", cv=CoreBody.cv_obj_array(folds), train=train, test=None
+    )
+
+    assert isinstance(split.cv[0], CoreBody.CVObject)
+    assert json.loads(split.to_wire()) == {
+        "split_by": "ts",
+        "cv": folds,
+        "train": {"start": 0, "end": 19},
+    }
@@ -0,0 +1,124 @@
+# pylint: disable=redefined-outer-name
+"""Test related method and functionality of chunked upload."""
+import io
+import json
+import re
+import threading
+
+import pytest
+import requests
+import responses
+
+from decanter.core import Context
+from decanter.core.core_api import CoreAPI
+from decanter.core.jobs.task import UploadTask
+
+HOST = "http://mobagel.test"
+CSV = b"".join(b"%d,%d\n" % (i, i * 3) for i in range(10000))
+PART_URL = re.compile(HOST + r"/v2/upload/multipart/up1/parts/(\d+)")
+
+
+class FakeMultipartServer:
+    """Collect parts, failing some of them a given number of times."""
+
+    def __init__(self, failures=None):
+        self.failures = dict(failures or {})
+        self.parts = {}
+        self.attempts = {}
+        self.completed = None
+        self.aborted = False
+        self.lock = threading.Lock()
+
+    def init(self, request):
+        assert json.loads(request.body)["size"] == len(CSV)
+        return (200, {}, json.dumps({"upload_id": "up1"}))
+
+    def put_part(self, request):
+        number = int(PART_URL.match(request.url).group(1))
+        with self.lock:
+            self.attempts[number] = self.attempts.get(number, 0) + 1
+            if self.failures.get(number, 0) > 0:
+                self.failures[number] -= 1
+                raise requests.exceptions.ConnectionError("connection reset")
+            self.parts[number] = request.body
+        return (200, {"ETag": "etag%d" % number}, "")
+
+    def complete(self, request):
+        self.completed = json.loads(request.body)["parts"]
+        return (200, {}, json.dumps({"_id": "task1"}))
+
+    def abort(self, _):
+        self.aborted = True
+        return (200, {}, "")
+
+    def register(self):
+        url = HOST + "/v2/upload/multipart"
+        responses.add_callback(responses.POST, url, callback=self.init)
+        responses.add_callback(responses.PUT, PART_URL, callback=self.put_part)
+        responses.add_callback(
+            responses.POST, url + "/up1/complete", callback=self.complete
+        )
+        responses.add_callback(responses.DELETE, url + "/up1", callback=self.abort)
+
+
+@pytest.fixture
+def context():
+    """Point the Context at the fake host."""
+    Context.HOST = HOST
+    Context.USERNAME, Context.PASSWORD = "usr", "pwd"
+    yield
+    Context.HOST = Context.USERNAME = Context.PASSWORD = None
+
+
+@responses.activate
+def test_only_failed_parts_are_retried(context):
+    """Parts are reassembled in order and a failed part is sent again alone."""
+    server = FakeMultipartServer(failures={3: 2})
+    server.register()
+
+    resp = CoreAPI().post_upload_chunked(
+        filename="train.csv",
+        file=io.BytesIO(CSV),
+        size=len(CSV),
+        part_size=10000,
+        max_workers=4,
+        backoff_factor=0,
+    )
+
+    assert resp.json() == {"_id": "task1"}
+    numbers = sorted(server.parts)
+    assert b"".join(server.parts[num] for num in numbers) == CSV
+    assert [part["part_number"] for part in server.completed] == numbers
+    assert server.completed[0]["etag"] == "etag1"
+    assert server.attempts[3] == 3
+    assert all(server.attempts[num] == 1 for num in numbers if num != 3)
+
+
+@responses.activate
+def test_abort_when_part_runs_out_of_retries(context):
+    """The upload is aborted and not committed if a part keeps failing."""
+    server = FakeMultipartServer(failures={2: 10})
+    server.register()
+
+    with pytest.raises(Exception, match="Part 2"):
+        CoreAPI().post_upload_chunked(
+            filename="train.csv",
+            file=io.BytesIO(CSV),
+            size=len(CSV),
+            part_size=10000,
+            max_retries=2,
+            backoff_factor=0,
+        )
+
+    assert server.aborted
+    assert server.completed is None
+
+
+def test_upload_task_switches_on_threshold():
+    """Only files larger than the threshold are uploaded in parts."""
+    file = io.BytesIO(CSV)
+    file.name = "train.csv"
+
+    assert not UploadTask(file).use_multipart()
+    assert UploadTask(file, multipart_threshold=len(CSV) - 1).use_multipart()
+    assert not UploadTask(file, multipart_threshold=len(CSV)).use_multipart()
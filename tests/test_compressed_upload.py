@@ -0,0 +1,100 @@
+# pylint: disable=redefined-outer-name
+"""Test related method and functionality of compressed upload."""
+import gzip
+import io
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+from requests_toolbelt.multipart.decoder import MultipartDecoder
+
+from decanter.core import Context
+from decanter.core.core_api import CoreAPI
+from decanter.core.extra.stream import Compressor
+
+CSV = b"".join(b"%d,category_%d\n" % (i, i % 7) for i in range(20000))
+
+
+class UploadHandler(BaseHTTPRequestHandler):
+    """Stand-in of Decanter Core decoding the compressed multipart upload."""
+
+    received = {}
+
+    def _read_chunked(self):
+        body = b""
+        while True:
+            size = int(self.rfile.readline().strip(), 16)
+            if size == 0:
+                self.rfile.readline()
+                return body
+            body += self.rfile.read(size)
+            self.rfile.readline()
+
+    def do_POST(self):  # pylint: disable=invalid-name
+        """Decompress and parse the uploaded csv."""
+        if self.headers.get("Transfer-Encoding") == "chunked":
+            body = self._read_chunked()
+        else:
+            body = self.rfile.read(int(self.headers["Content-Length"]))
+        encoding = self.headers.get("Content-Encoding")
+        UploadHandler.received["sent"] = len(body)
+        UploadHandler.received["encoding"] = encoding
+        if encoding == "gzip":
+            body = gzip.decompress(body)
+        elif encoding == "zstd":
+            zstandard = pytest.importorskip("zstandard")
+            body = zstandard.ZstdDecompressor().decompressobj().decompress(body)
+        part = MultipartDecoder(body, self.headers["Content-Type"]).parts[0]
+        UploadHandler.received["csv"] = part.content
+        resp = json.dumps({"_id": "4dataid"}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(resp)))
+        self.end_headers()
+        self.wfile.write(resp)
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+
+@pytest.fixture
+def server():
+    """Run the stand-in server and point the Context at it."""
+    httpd = HTTPServer(("127.0.0.1", 0), UploadHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    Context.HOST = "http://127.0.0.1:%d" % httpd.server_port
+    Context.USERNAME, Context.PASSWORD = "usr", "pwd"
+    UploadHandler.received = {}
+    yield UploadHandler.received
+    httpd.shutdown()
+    httpd.server_close()
+    Context.HOST = Context.USERNAME = Context.PASSWORD = None
+
+
+@pytest.mark.parametrize("codec", ["gzip", "zstd"])
+def test_compressed_upload_round_trip(server, codec):
+    """The server decodes the same csv from fewer bytes on the wire."""
+    if codec == "zstd":
+        pytest.importorskip("zstandard")
+    compressor = Compressor(codec, chunk_size=4096)
+
+    resp = CoreAPI().post_upload(
+        file=io.BytesIO(CSV),
+        filename="train.csv",
+        encoding="text/plain(UTF-8)",
+        compressor=compressor,
+    )
+
+    assert resp.json() == {"_id": "4dataid"}
+    assert server["encoding"] == codec
+    assert server["csv"] == CSV
+    assert server["sent"] == compressor.compressed_bytes
+    assert compressor.ratio > 5
+
+
+def test_invalid_codec():
+    """Unsupported codecs are rejected before uploading."""
+    with pytest.raises(ValueError):
+        Compressor("brotli")
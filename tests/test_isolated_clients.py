@@ -0,0 +1,148 @@
+# pylint: disable=redefined-outer-name
+"""Test related method and functionality of isolated clients."""
+import base64
+
+import pandas as pd
+import pytest
+import responses
+
+from decanter.core import Context, CoreClient
+from decanter.core.core_api import Model, TransportSettings
+from decanter.core.jobs import Experiment, FixedPollPolicy
+
+HOSTS = ["http://first.test", "http://second.test"]
+DF = pd.DataFrame({"a": range(10), "b": range(10)})
+
+
+def add_host_responses(mock, host):
+    """Serve the worker status and an upload whose data id names the host."""
+    task_id = "4task" + host[len("http://") : -len(".test")]
+    mock.add(responses.GET, host + "/v2/worker/status", json={})
+    mock.add(responses.POST, host + "/v2/upload", json={"_id": task_id})
+    mock.add(
+        responses.GET,
+        host + "/v2/tasks/%s" % task_id,
+        json={
+            "_id": task_id,
+            "status": "done",
+            "progress": 1,
+            "result": {"_id": "data-" + host},
+        },
+    )
+
+
+@pytest.fixture
+def mock():
+    """Mock the requests to both hosts."""
+    with responses.RequestsMock(assert_all_requests_are_fired=False) as mock_:
+        for host in HOSTS:
+            add_host_responses(mock_, host)
+        yield mock_
+
+
+@pytest.fixture
+def clients(mock):  # pylint: disable=unused-argument
+    """Two isolated clients of different users and hosts."""
+    pair = [
+        CoreClient(
+            username="usr%d" % i,
+            password="pwd",
+            host=host,
+            poll_policy=FixedPollPolicy(0),
+            isolated=True,
+        )
+        for i, host in enumerate(HOSTS)
+    ]
+    yield pair
+    for client in pair:
+        client.close()
+
+
+def auth_user(request):
+    """Get the user name of the basic auth header of a request."""
+    token = request.headers["Authorization"].split()[1]
+    return base64.b64decode(token).decode().split(":")[0]
+
+
+def test_clients_keep_their_own_state(mock, clients):
+    """Jobs, credentials and host stay in each client, not the Context."""
+    first, second = clients
+    data = [first.upload(DF, name="first"), second.upload(DF, name="second")]
+    first.run()
+    second.run()
+
+    assert [job.id for job in data] == ["data-" + host for host in HOSTS]
+    assert first.get_all_jobs() == [data[0]] and second.get_all_jobs() == [data[1]]
+    assert Context.JOBS == [] and Context.HOST is None
+    for i, host in enumerate(HOSTS):
+        calls = [call for call in mock.calls if call.request.url.startswith(host)]
+        assert calls and all(auth_user(call.request) == "usr%d" % i for call in calls)
+
+
+def test_closing_one_client_leaves_the_other(clients):
+    """Closing a client doesn't touch the loop or jobs of another one."""
+    first, second = clients
+    data = second.upload(DF)
+
+    first.close()
+    second.run()
+
+    assert first.LOOP.is_closed() and first.HOST is None
+    assert data.is_success() and second.HOST == HOSTS[1]
+
+
+def test_load_experiments_and_models_in_client(mock, clients):
+    """Experiments and models created in a client are fetched from its host."""
+    host = HOSTS[1]
+    exp_url = host + "/v2/experiments/4expid"
+    mock.add(
+        responses.GET,
+        exp_url,
+        json={
+            "_id": "4expid",
+            "hyperparameters": {"model_type": "regression"},
+            "attributes": {"m1": {"model_id": "m1", "cv_averages": {"deviance": 1.0}}},
+        },
+    )
+    mock.add(responses.GET, exp_url + "/models/m1", json={"name": "GBM"})
+
+    exp = Experiment.create("4expid", context=clients[1])
+    models = Model.create_many([("4expid", "m1")], context=clients[1])
+
+    assert exp.best_model.name == "GBM" and models[0].name == "GBM"
+    assert Context.HOST is None
+    calls = [call for call in mock.calls if call.request.url.startswith(exp_url)]
+    assert len(calls) == 3
+    assert all(auth_user(call.request) == "usr1" for call in calls)
+
+
+def test_isolated_client_beside_shared_async_client(mock):  # pylint: disable=W0613
+    """An isolated client never uses the session or async api of Context."""
+    shared = CoreClient(
+        username="usr0",
+        password="pwd",
+        host=HOSTS[0],
+        async_transport=True,
+        transport=TransportSettings(),
+    )
+    isolated = CoreClient(
+        username="usr1", password="pwd", host=HOSTS[1], isolated=True
+    )
+    transported = CoreClient(
+        username="usr1",
+        password="pwd",
+        host=HOSTS[1],
+        async_transport=True,
+        transport=TransportSettings(),
+        isolated=True,
+    )
+    try:
+        assert Context.async_api.context.HOST == HOSTS[0]
+        assert Context.session is not None
+        assert isolated.async_api is None and isolated.session is None
+        assert transported.async_api.context.HOST == HOSTS[1]
+        assert transported.session not in (None, Context.session)
+    finally:
+        transported.close()
+        isolated.close()
+        shared.close()
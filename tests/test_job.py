@@ -0,0 +1,131 @@
+"""Test related method and functionality of Job."""
+import asyncio
+import threading
+import time
+
+from decanter.core.extra import CoreStatus
+from decanter.core.jobs.job import Job
+from decanter.core.jobs.task import Task
+
+
+class InstantTask(Task):
+    """Task finishing on its first update."""
+
+    def run(self):
+        self.status = CoreStatus.RUNNING
+
+    async def update(self):
+        self.status = CoreStatus.DONE
+        self.result = {"_id": self.name}
+
+
+class InstantJob(Job):
+    """Job storing the result of an InstantTask."""
+
+    def __init__(self, name, jobs=None):
+        super().__init__(task=InstantTask(name=name), jobs=jobs, name=name)
+
+    def update_result(self, task_result):
+        self.result = task_result
+
+
+def test_dependents_start_without_polling_delay():
+    """A chain of jobs runs without any sleep between dependent jobs."""
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    upload = InstantJob("upload")
+    train = InstantJob("train", jobs=[upload])
+    predict = InstantJob("predict", jobs=[upload, train])
+
+    start = time.monotonic()
+    loop.run_until_complete(asyncio.gather(predict.wait(), train.wait(), upload.wait()))
+    loop.close()
+
+    assert time.monotonic() - start < 1
+    assert [job.status for job in (upload, train, predict)] == [CoreStatus.DONE] * 3
+
+
+def test_dependent_fails_when_prerequired_job_stops():
+    """Waiting dependents wake up and fail as soon as a prerequired job stops."""
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    data = InstantJob("data")
+    exp = InstantJob("exp", jobs=[data])
+
+    async def stop_data():
+        await asyncio.sleep(0.1)
+        data.stop()
+
+    loop.run_until_complete(asyncio.gather(exp.wait(), stop_data()))
+    loop.close()
+
+    assert data.status == CoreStatus.FAIL
+    assert exp.status == CoreStatus.FAIL
+    assert exp.task.status == CoreStatus.PENDING
+
+
+class EndlessTask(InstantTask):
+    """Task running until stopped."""
+
+    def __init__(self, name=None):
+        super().__init__(name=name)
+        self.stopped = False
+
+    async def update(self):
+        await asyncio.sleep(0.01)
+
+    def next_poll_interval(self):
+        return 0.01
+
+    def stop(self):
+        self.stopped = True
+        self.status = CoreStatus.FAIL
+
+
+def test_deadline_stops_running_job_and_dependents():
+    """The job past its deadline stops its task, dependents waiting on it
+    stop at their own deadline."""
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    train = InstantJob("train")
+    train.task = EndlessTask(name="train")
+    train.set_deadline(0.3)
+    predict = InstantJob("predict", jobs=[train])
+    predict.set_deadline(0.1)
+
+    start = time.monotonic()
+    loop.run_until_complete(asyncio.gather(train.wait(), predict.wait()))
+    loop.close()
+
+    assert time.monotonic() - start < 1
+    assert predict.status == CoreStatus.FAIL
+    assert predict.task.status == CoreStatus.PENDING
+    assert train.task.stopped and train.status == CoreStatus.FAIL
+
+
+class PreparedJob(InstantJob):
+    """Job recording where and how often its result is applied."""
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.prepared_in, self.applied = [], 0
+
+    def prepare_result(self, task_result):
+        self.prepared_in.append(threading.current_thread())
+
+    def update_result(self, task_result):
+        self.applied += 1
+        self.result = task_result
+
+
+def test_final_result_prepared_off_the_loop():
+    """The final result is prepared in the executor and applied once."""
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    job = PreparedJob("big")
+
+    loop.run_until_complete(job.wait())
+    loop.close()
+
+    assert job.prepared_in and job.prepared_in[0] is not threading.main_thread()
+    assert job.applied == 1 and job.result == {"_id": "big"}
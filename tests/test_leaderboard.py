@@ -0,0 +1,155 @@
+"""Test related method and functionality of Leaderboard."""
+import numpy as np
+import pytest
+
+from decanter.core import Leaderboard, LeaderboardIndex
+from decanter.core.jobs import Experiment
+
+ATTRIBUTES = {
+    "m%d" % i: {
+        "model_id": "m%d" % i,
+        "cv_averages": {"auc": auc, "logloss": logloss},
+        "validation_scores": {"auc": auc - 0.05},
+    }
+    for i, (auc, logloss) in enumerate(
+        [(0.8, 0.5), (0.9, 0.4), (float("nan"), 0.3), (0.85, 0.2), (0.7, 0.6)]
+    )
+}
+
+
+def test_matrix_shape_and_nan_masking():
+    """Missing and NaN scores are masked out of rankings."""
+    board = Leaderboard(ATTRIBUTES)
+
+    assert board.scores.shape == (5, 2, 2)
+    assert board.metrics == ["auc", "logloss"]
+    assert np.isnan(board.column("logloss", "validation_scores")).all()
+    assert board.top_k("auc", k=10) == ["m1", "m3", "m0", "m4"]
+    assert board.best("logloss", "validation_scores") is None
+    assert board.best("r2") is None
+
+
+def test_top_k_by_direction_of_metric():
+    """Higher auc and lower logloss rank first."""
+    board = Leaderboard(ATTRIBUTES)
+
+    assert board.top_k("auc", k=2) == ["m1", "m3"]
+    assert board.top_k("logloss", k=3) == ["m3", "m2", "m1"]
+    assert board.best("auc", "validation_scores") == "m1"
+
+
+def test_pareto_front():
+    """Only models no other model beats in every metric are kept."""
+    board = Leaderboard(ATTRIBUTES)
+
+    assert board.pareto(["auc", "logloss"]) == ["m1", "m3"]
+    assert board.to_frame().loc["m3", "logloss"] == 0.2
+
+
+def test_pareto_front_matches_pairwise_check():
+    """The sweep finds the same front as comparing every pair of models."""
+    rng = np.random.default_rng(0)
+    scores = rng.integers(0, 8, size=(300, 3)).astype(float)
+    scores[::50, 1] = np.nan
+    attributes = {
+        "m%d" % i: {"cv_averages": {"auc": auc, "f1": f1, "mse": mse}}
+        for i, (auc, f1, mse) in enumerate(scores)
+    }
+    board = Leaderboard(attributes)
+
+    gains = scores * [1, 1, -1]
+    valid = ~np.isnan(gains).any(axis=1)
+    not_worse = (gains[None, :, :] >= gains[:, None, :]).all(axis=2)
+    better = (gains[None, :, :] > gains[:, None, :]).any(axis=2)
+    dominated = (not_worse & better & valid[None, :]).any(axis=1)
+    expected = ["m%d" % i for i in np.flatnonzero(valid & ~dominated)]
+
+    assert board.pareto(["auc", "f1", "mse"]) == expected
+    assert board.pareto(["auc"]) == [
+        "m%d" % i for i in np.flatnonzero(scores[:, 0] == scores[:, 0].max())
+    ]
+
+
+def make_experiment(exp_id, data_id, aucs):
+    """Finished experiment with models scored by auc."""
+    exp = Experiment(train_input=None)
+    exp.id, exp.train_data_id, exp.target = exp_id, data_id, "label"
+    exp.hyperparameters = {"model_type": "binary classification"}
+    exp.attributes = {
+        "%s-m%d" % (exp_id, i): {
+            "model_id": "%s-m%d" % (exp_id, i),
+            "cv_averages": {"auc": auc},
+        }
+        for i, auc in enumerate(aucs)
+    }
+    return exp
+
+
+def test_index_top_k_across_experiments():
+    """Top models are ranked over all experiments on the same data."""
+    index = LeaderboardIndex()
+    index.append([make_experiment("e1", "d1", [0.7, 0.9]), ValueError("failed")])
+    index.append(make_experiment("e2", "d1", [0.8, float("nan")]))
+    index.append(make_experiment("e3", "d2", [0.99]))
+
+    top = index.top_k("auc", k=2, train_data_id="d1")
+
+    assert list(top["model_id"]) == ["e1-m1", "e2-m0"]
+    assert len(index) == 5
+    best = index.top_k("auc", k=1, train_data_id=["d1", "d2"])
+    assert list(best["exp_id"]) == ["e3"]
+
+
+def test_index_append_replaces_experiment():
+    """Appending an experiment again replaces its previous rows."""
+    index = LeaderboardIndex()
+    index.append(make_experiment("e1", "d1", [0.7, 0.9]))
+    assert len(index) == 2
+    index.append(make_experiment("e1", "d1", [0.5]))
+
+    assert len(index) == 1
+    assert index.top_k("auc")["score"].tolist() == [0.5]
+    assert str(index.frame["exp_id"].dtype) == "category"
+
+
+def test_index_merges_only_new_experiments(monkeypatch):
+    """Appends after the table is built compact only the new rows."""
+    index = LeaderboardIndex()
+    index.append([make_experiment("e%d" % i, "d1", [0.5, 0.6]) for i in range(3)])
+    assert len(index) == 6
+    compacted = []
+    compact = LeaderboardIndex._compact  # pylint: disable=protected-access
+
+    def count_compact(frame):
+        compacted.append(len(frame))
+        return compact(frame)
+
+    monkeypatch.setattr(LeaderboardIndex, "_compact", staticmethod(count_compact))
+    index.append(make_experiment("e3", None, [0.9]))
+    index.append(make_experiment("e0", "d2", [0.1]))
+    frame = index.frame
+
+    # one model of two score types in each new experiment
+    assert compacted == [4] and index.frame is frame
+    assert sorted(frame["exp_id"].cat.categories) == ["e0", "e1", "e2", "e3"]
+    assert frame.groupby("exp_id", observed=True).size().to_dict() == {
+        "e0": 2,
+        "e1": 4,
+        "e2": 4,
+        "e3": 2,
+    }
+    assert list(index.top_k("auc", k=1)["model_id"]) == ["e3-m0"]
+    assert list(index.top_k("auc", train_data_id="d2")["exp_id"]) == ["e0"]
+
+
+def test_index_parquet_round_trip(tmp_path):
+    """The index is reloaded from Parquet as it was saved."""
+    pytest.importorskip("pyarrow")
+    index = LeaderboardIndex()
+    index.append(make_experiment("e1", "d1", [0.7, 0.9]))
+    path = str(tmp_path / "leaderboard.parquet")
+
+    index.to_parquet(path)
+    loaded = LeaderboardIndex.read_parquet(path)
+
+    assert loaded.top_k("auc").equals(index.top_k("auc"))
@@ -0,0 +1,65 @@
+"""Test related method and functionality of non-blocking polling."""
+import asyncio
+import threading
+import time
+
+import responses
+
+from decanter.core import Context
+from decanter.core.extra import CoreStatus
+from decanter.core.extra.loop_monitor import LoopLagMonitor
+from decanter.core.jobs import task as task_module
+from decanter.core.jobs.task import CoreTask
+
+HOST = "http://mobagel.test"
+TASK_ID = "4taskid"
+
+
+def test_monitor_counts_stalls():
+    """A callback holding the loop thread shows up as a stall."""
+    loop = asyncio.new_event_loop()
+    monitor = LoopLagMonitor(interval=0.01, threshold=0.1)
+
+    async def block():
+        await asyncio.sleep(0.05)
+        time.sleep(0.2)
+        await asyncio.sleep(0.05)
+        return "done"
+
+    assert loop.run_until_complete(monitor.watch(block())) == "done"
+    loop.close()
+
+    stats = monitor.stats()
+    assert stats["stalls"] == 1 and stats["max_lag"] >= 0.15
+    assert stats["samples"] > 2 and stats["mean_lag"] < stats["max_lag"]
+
+
+@responses.activate
+def test_task_response_decoded_off_the_loop(monkeypatch):
+    """The task's response is decoded in the executor, not on the loop."""
+    loop = asyncio.new_event_loop()
+    Context.LOOP, Context.HOST = loop, HOST
+    Context.USERNAME, Context.PASSWORD = "usr", "pwd"
+    result = {"attributes": {str(i): {"score": i} for i in range(5000)}}
+    responses.add(
+        responses.GET,
+        HOST + "/v2/tasks/%s" % TASK_ID,
+        json={"_id": TASK_ID, "status": "done", "progress": 1, "result": result},
+    )
+    threads = []
+
+    def decode_json(resp):
+        threads.append(threading.current_thread())
+        return resp.json()
+
+    monkeypatch.setattr(task_module, "decode_json", decode_json)
+    task = CoreTask(name="big")
+    task.id, task.status = TASK_ID, CoreStatus.RUNNING
+    try:
+        loop.run_until_complete(task.fetch_update())
+    finally:
+        loop.close()
+        Context.LOOP = Context.HOST = Context.USERNAME = Context.PASSWORD = None
+
+    assert threads and threads[0] is not threading.main_thread()
+    assert task.status == CoreStatus.DONE and task.result == result
@@ -0,0 +1,113 @@
+# pylint: disable=redefined-outer-name
+"""Test related method and functionality of metadata cache."""
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import requests
+import responses
+
+from decanter.core import Context
+from decanter.core.core_api import CoreAPI, MetadataCache, Model
+
+HOST = "http://mobagel.test"
+EXP_URL = HOST + "/v2/experiments/4expid"
+MODEL_URL = HOST + "/v2/experiments/4expid/models/4modelid"
+
+
+@pytest.fixture
+def cache():
+    """Point the Context at the fake host with a metadata cache."""
+    Context.HOST = HOST
+    Context.USERNAME, Context.PASSWORD = "usr", "pwd"
+    Context.metadata_cache = MetadataCache(maxsize=2)
+    yield Context.metadata_cache
+    Context.HOST = Context.USERNAME = Context.PASSWORD = None
+    Context.metadata_cache = None
+
+
+@responses.activate
+def test_done_metadata_is_served_from_cache(cache):
+    """Finished experiments and models are requested only once."""
+    responses.add(responses.GET, EXP_URL, json={"_id": "4expid", "status": "done"})
+    responses.add(
+        responses.GET,
+        MODEL_URL,
+        json={"_id": "4modelid", "completed_at": "2021-01-01T00:00:00Z"},
+    )
+    api = CoreAPI()
+
+    for _ in range(3):
+        assert api.get_experiments_by_id("4expid").json()["status"] == "done"
+        model = Model.create("4expid", "4modelid")
+
+    assert model.id == "4modelid"
+    assert len(responses.calls) == 2
+    assert cache.stats() == {"hits": 4, "misses": 2, "revalidated": 0, "size": 2}
+
+
+@responses.activate
+def test_running_metadata_is_revalidated_by_etag(cache):
+    """Unfinished metadata is sent again only when its ETag changes."""
+    responses.add(
+        responses.GET,
+        EXP_URL,
+        json={"_id": "4expid", "status": "running"},
+        headers={"ETag": '"v1"'},
+    )
+    responses.add(responses.GET, EXP_URL, status=304)
+    api = CoreAPI()
+
+    api.get_experiments_by_id("4expid")
+    resp = api.get_experiments_by_id("4expid")
+
+    assert responses.calls[1].request.headers["If-None-Match"] == '"v1"'
+    assert resp.json()["status"] == "running"
+    assert cache.revalidated == 1
+
+
+@responses.activate
+def test_lru_eviction_and_disk_store(tmp_path, cache):
+    """Evicted entries are read back from the on-disk store."""
+    disk = MetadataCache(maxsize=1, path=str(tmp_path))
+    Context.metadata_cache = disk
+    for data_id in ["a", "b"]:
+        responses.add(responses.GET, HOST + "/data/" + data_id, json={"status": "done"})
+        CoreAPI().get_data_by_id(data_id)
+
+    assert disk.stats()["size"] == 1
+    assert CoreAPI().get_data_by_id("a").json() == {"status": "done"}
+    key = MetadataCache.entry_key(HOST + "/data/b", "usr")
+    assert MetadataCache(path=str(tmp_path)).lookup(key) is not None
+    assert len(responses.calls) == 2
+    assert cache.misses == 0
+
+
+@responses.activate
+def test_entries_are_kept_per_user(cache):
+    """A user doesn't get the metadata cached for another user."""
+    responses.add(responses.GET, EXP_URL, json={"_id": "4expid", "status": "done"})
+
+    CoreAPI().get_experiments_by_id("4expid")
+    Context.USERNAME = "other"
+    CoreAPI().get_experiments_by_id("4expid")
+    CoreAPI().get_experiments_by_id("4expid")
+
+    assert len(responses.calls) == 2
+    assert cache.stats() == {"hits": 1, "misses": 2, "revalidated": 0, "size": 2}
+
+
+def test_counters_of_concurrent_hits():
+    """Hits counted from many threads add up."""
+    cache = MetadataCache()
+    resp = requests.Response()
+    resp._content = b'{"status": "done"}'  # pylint: disable=protected-access
+    cache.store(EXP_URL, resp)
+
+    def get(_):
+        for _ in range(200):
+            cache.get(EXP_URL, fetch=None)
+
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(get, range(8)))
+
+    assert cache.stats()["hits"] == 1600
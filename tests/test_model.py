@@ -0,0 +1,102 @@
+# pylint: disable=redefined-outer-name
+"""Test related method and functionality of lazy Model."""
+import pytest
+import responses
+
+from decanter.core import Context
+from decanter.core.core_api import Model
+from decanter.core.jobs import Experiment
+
+HOST = "http://mobagel.test"
+EXP = {
+    "_id": "4expid",
+    "status": "done",
+    "hyperparameters": {"model_type": "regression"},
+    "attributes": {
+        "m1": {"model_id": "m1", "cv_averages": {"deviance": 3.0}},
+        "m2": {"model_id": "m2", "cv_averages": {"deviance": 1.0}},
+    },
+}
+
+
+def model_url(model_id, exp_id="4expid"):
+    """Url of the model's metadata."""
+    return HOST + "/v2/experiments/%s/models/%s" % (exp_id, model_id)
+
+
+@pytest.fixture
+def context():
+    """Point the Context at the fake host."""
+    Context.HOST = HOST
+    Context.USERNAME, Context.PASSWORD = "usr", "pwd"
+    yield
+    Context.HOST = Context.USERNAME = Context.PASSWORD = None
+
+
+@responses.activate
+def test_best_model_is_fetched_on_first_access(context):
+    """Loading an experiment doesn't request its best model until it's used."""
+    responses.add(responses.GET, HOST + "/v2/experiments/4expid", json=EXP)
+    responses.add(responses.GET, model_url("m2"), json={"_id": "m2", "name": "GBM"})
+
+    exp = Experiment.create("4expid")
+
+    assert len(responses.calls) == 1
+    assert exp.best_model.id == "m2" and not exp.best_model.is_fetched
+    assert exp.best_model.name == "GBM"
+    assert exp.best_model.hyperparameters is None
+    assert exp.best_model.is_fetched
+    assert len(responses.calls) == 2
+
+
+@responses.activate
+def test_prefetch_bound_models(context):
+    """Prefetch fetches unfetched models and reports errors per model."""
+    for model_id in ["a", "b"]:
+        responses.add(responses.GET, model_url(model_id), json={"name": model_id})
+    responses.add(responses.GET, model_url("gone"), status=404)
+    models = [Model(), Model(), Model()]
+    models[0].bind("4expid", "a")
+    models[1].bind("4expid", "gone")
+    models[2].bind("4expid", "b")
+
+    errors = Model.prefetch(models, concurrency=3)
+
+    assert errors[0] is None and errors[2] is None
+    assert isinstance(errors[1], Exception)
+    assert [models[0].name, models[2].name] == ["a", "b"]
+    assert not models[1].is_fetched
+    assert Model.prefetch(models[::2]) == [None, None]
+    assert len(responses.calls) == 3
+
+
+@responses.activate
+def test_create_many_in_order_with_errors(context):
+    """Experiments and models keep the input order, failures in place."""
+    for exp_id in ["e1", "e2"]:
+        responses.add(
+            responses.GET,
+            HOST + "/v2/experiments/%s" % exp_id,
+            json=dict(EXP, _id=exp_id, models=["m1", "m2"]),
+        )
+        for model_id in ["m1", "m2"]:
+            responses.add(
+                responses.GET,
+                model_url(model_id, exp_id),
+                json={"_id": model_id, "exp_id": exp_id},
+            )
+    responses.add(responses.GET, HOST + "/v2/experiments/bad", status=500)
+
+    exps = Experiment.create_many(["e2", "bad", "e1"], concurrency=3)
+    models = Model.create_many(
+        [(exp.id, model_id) for exp in exps[::2] for model_id in exp.models]
+    )
+
+    assert [exps[0].id, exps[2].id] == ["e2", "e1"]
+    assert isinstance(exps[1], Exception)
+    assert [(model.exp_id, model.id) for model in models] == [
+        ("e2", "m1"),
+        ("e2", "m2"),
+        ("e1", "m1"),
+        ("e1", "m2"),
+    ]
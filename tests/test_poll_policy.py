@@ -0,0 +1,83 @@
+"""Test related method and functionality of poll policies."""
+import pytest
+
+from decanter.core import Context
+from decanter.core.jobs import AdaptivePollPolicy, FixedPollPolicy
+from decanter.core.jobs.task import CoreTask
+
+
+class FakeClock:
+    """Clock moving only when told to."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def poll(policy, task, clock, elapsed, progress):
+    """Move the clock and progress, then ask the policy for the interval."""
+    clock.now += elapsed
+    task.progress = progress
+    return policy.next_interval(task)
+
+
+def test_backoff_while_progress_stalls():
+    """Interval grows by backoff up to max_interval when progress is stuck."""
+    clock = FakeClock()
+    policy = AdaptivePollPolicy(
+        initial_interval=1, min_interval=1, max_interval=5, backoff=2, clock=clock
+    )
+    task = CoreTask(name="stalled")
+
+    intervals = [poll(policy, task, clock, 1, 0.1) for _ in range(5)]
+
+    assert intervals == [1, 2, 4, 5, 5]
+
+
+def test_default_polls_no_more_often_than_fixed():
+    """The default interval never drops under the fixed 3 seconds."""
+    clock = FakeClock()
+    policy = AdaptivePollPolicy(clock=clock)
+    task = CoreTask(name="short")
+
+    intervals = [poll(policy, task, clock, 3, progress) for progress in (0, 0.5, 1)]
+
+    assert intervals == [3, 3, 3]
+
+
+def test_speed_up_as_progress_approaches_end():
+    """Interval follows the estimated remaining time from the progress rate."""
+    clock = FakeClock()
+    policy = AdaptivePollPolicy(
+        initial_interval=1,
+        min_interval=0.5,
+        max_interval=600,
+        eta_fraction=0.5,
+        smoothing=1,
+        clock=clock,
+    )
+    task = CoreTask(name="moving")
+
+    poll(policy, task, clock, 0, 0.0)
+    early = poll(policy, task, clock, 10, 0.1)
+    late = poll(policy, task, clock, 80, 0.9)
+    last = poll(policy, task, clock, 9, 0.99)
+
+    assert task.poll_state["eta"] == pytest.approx(1)
+    assert early == pytest.approx(45)
+    assert late == pytest.approx(5)
+    assert last == pytest.approx(0.5)
+
+
+def test_task_and_context_policy_override():
+    """Task policy wins over the context's, which wins over the default."""
+    task = CoreTask(name="override")
+    Context.poll_policy = FixedPollPolicy(7)
+    try:
+        assert task.next_poll_interval() == 7
+        task.poll_policy = FixedPollPolicy(2)
+        assert task.next_poll_interval() == 2
+    finally:
+        Context.poll_policy = None
@@ -0,0 +1,113 @@
+# pylint: disable=redefined-outer-name
+"""Test related method and functionality of TaskPoller."""
+import asyncio
+
+import pytest
+import responses
+
+from decanter.core import Context
+from decanter.core.extra import CoreStatus
+from decanter.core.jobs import FixedPollPolicy, TaskPoller
+from decanter.core.jobs.task import CoreTask
+
+HOST = "http://mobagel.test"
+TASK_IDS = ["4taskid0", "4taskid1", "4taskid2"]
+
+
+class FakeJob:
+    """Job holding a running task only."""
+
+    def __init__(self, task_id):
+        self.task = CoreTask(name=task_id)
+        self.task.id = task_id
+        self.task.status = CoreStatus.RUNNING
+
+
+@pytest.fixture
+def poll_context():
+    """Set up a context with running jobs and a task poller."""
+    Context.LOOP = asyncio.new_event_loop()
+    asyncio.set_event_loop(Context.LOOP)
+    Context.HOST = HOST
+    Context.USERNAME, Context.PASSWORD = "usr", "pwd"
+    Context.JOBS = [FakeJob(task_id) for task_id in TASK_IDS]
+    Context.task_poller = TaskPoller(interval=0)
+
+    yield Context
+
+    Context.LOOP.close()
+    Context.LOOP = Context.HOST = Context.task_poller = None
+    Context.USERNAME = Context.PASSWORD = None
+    Context.JOBS = []
+
+
+@responses.activate
+def test_one_request_refreshes_all_tasks(poll_context):
+    """All pending tasks are updated by a single /tasks request."""
+    responses.add(
+        responses.GET,
+        HOST + "/tasks",
+        json=[
+            {"_id": task_id, "status": CoreStatus.DONE, "result": {"_id": task_id}}
+            for task_id in TASK_IDS
+        ],
+        status=200,
+    )
+    tasks = [job.task for job in poll_context.JOBS]
+
+    poll_context.LOOP.run_until_complete(
+        asyncio.gather(*[task.update() for task in tasks])
+    )
+
+    assert len(responses.calls) == 1
+    assert poll_context.task_poller.ticks == 1
+    assert all(task.status == CoreStatus.DONE for task in tasks)
+    assert [task.result["_id"] for task in tasks] == TASK_IDS
+
+
+@responses.activate
+def test_bulk_endpoint_and_missing_fallback(poll_context):
+    """Tasks missing in the bulk response are polled by their own id."""
+    poll_context.task_poller.bulk_endpoint = "/v2/tasks/bulk"
+    responses.add(
+        responses.POST,
+        HOST + "/v2/tasks/bulk",
+        json={"data": [{"_id": TASK_IDS[0], "status": CoreStatus.DONE}]},
+        status=200,
+    )
+    for task_id in TASK_IDS[1:]:
+        responses.add(
+            responses.GET,
+            HOST + "/v2/tasks/" + task_id,
+            json={"_id": task_id, "status": CoreStatus.FAIL},
+            status=200,
+        )
+    tasks = [job.task for job in poll_context.JOBS]
+
+    poll_context.LOOP.run_until_complete(tasks[0].update())
+
+    assert len(responses.calls) == 3
+    assert [task.status for task in tasks] == [
+        CoreStatus.DONE,
+        CoreStatus.FAIL,
+        CoreStatus.FAIL,
+    ]
+
+
+@responses.activate
+def test_default_poller_follows_task_policy(poll_context):
+    """Without an interval, a task without id waits by its poll policy."""
+    poll_context.task_poller = TaskPoller()
+    task = CoreTask(name="no-id")
+    task.status = CoreStatus.RUNNING
+    task.poll_policy = FixedPollPolicy(0.01)
+    responses.add(
+        responses.GET,
+        HOST + "/v2/tasks/None",
+        json={"_id": None, "status": CoreStatus.RUNNING},
+        status=200,
+    )
+
+    poll_context.LOOP.run_until_complete(task.update())
+
+    assert len(responses.calls) == 1
@@ -0,0 +1,158 @@
+# pylint: disable=redefined-outer-name
+"""Test related method and functionality of batch prediction."""
+import json
+import re
+import time
+from types import SimpleNamespace
+
+import pytest
+import responses
+
+from decanter.core import CoreClient
+from decanter.core.core_api import PredictTemplate
+from decanter.core.extra import CoreStatus
+from decanter.core.jobs import FixedPollPolicy, RateLimiter
+from decanter.core.jobs.job import Job
+from decanter.core.jobs.task import Task
+
+HOST = "http://core.test"
+
+
+class DoneJob(Job):
+    """Job already done successfully, standing for data or experiment."""
+
+    def __init__(self, name, **attrs):
+        super().__init__(task=Task(name=name), name=name)
+        self.id = name
+        self.result = {"_id": name}
+        self.status = CoreStatus.DONE
+        self.__dict__.update(attrs)
+
+    def update_result(self, task_result):
+        pass
+
+
+class CountingExperiment(DoneJob):
+    """Experiment counting how often its best model is looked up."""
+
+    def __init__(self):
+        super().__init__("exp")
+        self.lookups = 0
+
+    @property
+    def best_model(self):
+        """The best model."""
+        self.lookups += 1
+        return SimpleNamespace(id="model-best")
+
+
+@pytest.fixture
+def sent():
+    """Mock the predict api, recording each body and its sending time."""
+    bodies = []
+
+    def post_predict(request):
+        body = json.loads(request.body)
+        bodies.append((time.monotonic(), body))
+        return 200, {}, json.dumps({"_id": "task-" + body["data_id"]})
+
+    def get_task(request):
+        task_id = request.url.rsplit("/", 1)[1]
+        result = {"_id": "pred-" + task_id}
+        body = {"_id": task_id, "status": "done", "progress": 1, "result": result}
+        return 200, {}, json.dumps(body)
+
+    with responses.RequestsMock(assert_all_requests_are_fired=False) as mock:
+        mock.add(responses.GET, HOST + "/v2/worker/status", json={})
+        mock.add_callback(responses.POST, HOST + "/v2/tasks/predict", post_predict)
+        mock.add_callback(
+            responses.GET, re.compile(HOST + "/v2/tasks/task-.*"), get_task
+        )
+        yield bodies
+
+
+@pytest.fixture
+def client(sent):  # pylint: disable=unused-argument
+    """An isolated client of the mocked host."""
+    client_ = CoreClient(
+        username="usr",
+        password="pwd",
+        host=HOST,
+        poll_policy=FixedPollPolicy(0),
+        isolated=True,
+    )
+    yield client_
+    client_.close()
+
+
+def test_template_selects_model_once(sent, client):
+    """Each body differs by data_id only, the model is selected once."""
+    exp = CountingExperiment()
+    data = [DoneJob("data-%d" % i) for i in range(5)]
+    template = PredictTemplate(experiment=exp, keep_columns=["id"], threshold=0.5)
+
+    results = client.predict_batch(template, data, name="batch")
+    client.run()
+
+    assert [res.id for res in results] == ["pred-task-data-%d" % i for i in range(5)]
+    assert exp.lookups == 1 and template.model_id == "model-best"
+    assert sorted(body["data_id"] for _, body in sent) == [job.id for job in data]
+    for _, body in sent:
+        assert body == {
+            "data_id": body["data_id"],
+            "model_id": "model-best",
+            "keep_columns": ["id"],
+            "threshold": 0.5,
+        }
+
+
+def test_batch_on_shared_context(sent):  # pylint: disable=unused-argument
+    """predict_batch called on the class runs in the shared Context."""
+    client = CoreClient(
+        username="usr", password="pwd", host=HOST, poll_policy=FixedPollPolicy(0)
+    )
+    try:
+        data = [DoneJob("data-%d" % i) for i in range(2)]
+        template = PredictTemplate(experiment=CountingExperiment())
+
+        results = CoreClient.predict_batch(template, data)
+        CoreClient.run()
+
+        assert [res.id for res in results] == ["pred-task-data-0", "pred-task-data-1"]
+        assert CoreClient.get_all_jobs() == results
+    finally:
+        client.close()
+
+
+def test_predict_rejects_template(client):
+    """A template has no test data, predict tells to use predict_batch."""
+    template = PredictTemplate(experiment=CountingExperiment())
+
+    with pytest.raises(TypeError, match="predict_batch"):
+        client.predict(template)
+    assert client.get_all_jobs() == []
+
+
+def test_batch_is_sent_at_rate(sent, client):
+    """Predict tasks are spaced by the rate once the burst is spent."""
+    template = PredictTemplate(experiment=CountingExperiment())
+    data = [DoneJob("data-%d" % i) for i in range(4)]
+
+    client.predict_batch(template, data, rate=20, burst=2)
+    client.run()
+
+    times = sorted(sent_at for sent_at, _ in sent)
+    assert len(times) == 4
+    assert times[-1] - times[0] >= 2 / 20 * 0.9
+
+
+def test_rate_limiter_borrows_tokens_in_order():
+    """Tokens refill at rate up to burst, waits grow for later callers."""
+    now = [0.0]
+    limiter = RateLimiter(rate=10, burst=2, clock=lambda: now[0])
+
+    assert [limiter.reserve() for _ in range(4)] == pytest.approx([0, 0, 0.1, 0.2])
+    now[0] = 1.0
+    assert limiter.reserve() == 0
+    with pytest.raises(ValueError):
+        RateLimiter(rate=0)
@@ -0,0 +1,214 @@
+"""Test related method and functionality of the job scheduler."""
+import asyncio
+import json
+import threading
+
+import responses
+
+from decanter.core import Context
+from decanter.core.extra import CoreStatus
+from decanter.core.jobs import JobScheduler, WorkerMonitor
+from decanter.core.jobs.job import Job
+from decanter.core.jobs.task import Task
+
+HOST = "http://mobagel.test"
+
+
+class TimedTask(Task):
+    """Task of a type, done after a number of updates."""
+
+    def __init__(self, name, task_type, updates=3):
+        super().__init__(name=name)
+        self.task_type = task_type
+        self.updates = updates
+
+    def run(self):
+        self.status = CoreStatus.RUNNING
+
+    async def update(self):
+        self.updates -= 1
+        if self.updates <= 0:
+            self.status = CoreStatus.DONE
+            self.result = {"_id": self.name}
+
+    def next_poll_interval(self):
+        return 0.01
+
+
+class TimedJob(Job):
+    """Job recording the order its task starts in."""
+
+    def __init__(self, name, task_type, started, priority=0):
+        super().__init__(task=TimedTask(name, task_type), name=name)
+        self.priority = priority
+        self.started = started
+
+    async def update(self):
+        if self.name not in self.started:
+            self.started.append(self.name)
+        await super().update()
+
+    def update_result(self, task_result):
+        self.result = task_result
+
+
+def run_jobs(scheduler, jobs):
+    """Run the jobs under the scheduler, tracking the running peak."""
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    Context.scheduler, peaks = scheduler, []
+
+    async def watch():
+        while not all(job.is_done() for job in jobs):
+            peaks.append(dict(scheduler.running))
+            await asyncio.sleep(0.005)
+
+    try:
+        loop.run_until_complete(asyncio.gather(watch(), *[job.wait() for job in jobs]))
+    finally:
+        Context.scheduler = None
+        loop.close()
+    return peaks
+
+
+def test_bounded_overall_and_per_type():
+    """Running tasks never exceed the overall and per type limits."""
+    started = []
+    jobs = [TimedJob("train%d" % i, "train", started) for i in range(4)]
+    jobs += [TimedJob("predict%d" % i, "predict", started) for i in range(6)]
+    scheduler = JobScheduler(max_running=3, max_per_type={"train": 1})
+
+    peaks = run_jobs(scheduler, jobs)
+
+    assert all(job.status == CoreStatus.DONE for job in jobs)
+    assert max(sum(peak.values()) for peak in peaks) == 3
+    assert max(peak.get("train", 0) for peak in peaks) == 1
+    assert scheduler.started == 10 and scheduler.total_running == 0
+
+
+def test_queued_jobs_start_by_priority():
+    """Waiting jobs start in priority order, then in submission order."""
+    started = []
+    jobs = [
+        TimedJob("low", "predict", started, priority=5),
+        TimedJob("first", "predict", started),
+        TimedJob("high", "predict", started, priority=-1),
+        TimedJob("second", "predict", started),
+    ]
+
+    run_jobs(JobScheduler(max_running=1), jobs)
+
+    assert started == ["low", "high", "first", "second"]
+
+
+def test_deadline_leaves_the_queue():
+    """A job past its deadline while queued gives up its place."""
+    started = []
+    blocker = TimedJob("blocker", "train", started)
+    blocker.task.updates = 20
+    queued = TimedJob("queued", "train", started)
+    queued.set_deadline(0.05)
+    scheduler = JobScheduler(max_running=1)
+
+    run_jobs(scheduler, [blocker, queued])
+
+    assert queued.status == CoreStatus.FAIL and started == ["blocker"]
+    assert scheduler.queued == 0 and scheduler.total_running == 0
+
+
+@responses.activate
+def test_sized_from_worker_count():
+    """Limits follow the count of each type of worker."""
+    Context.HOST, Context.USERNAME, Context.PASSWORD = HOST, "usr", "pwd"
+    responses.add(
+        responses.GET,
+        HOST + "/v2/worker/count",
+        json={"data": {"train": 2, "predict": 3, "version": "x"}},
+    )
+    try:
+        scheduler = JobScheduler.from_workers(per_worker=2)
+    finally:
+        Context.HOST = Context.USERNAME = Context.PASSWORD = None
+
+    assert scheduler.max_running == 10
+    assert scheduler.max_per_type == {"train": 4, "predict": 6}
+
+
+@responses.activate
+def test_admission_waits_for_idle_workers():
+    """Monitored tasks start only on idle workers, others aren't held back."""
+    Context.HOST, Context.USERNAME, Context.PASSWORD = HOST, "usr", "pwd"
+    monitor = WorkerMonitor(interval=0.02)
+    scheduler = JobScheduler(monitor=monitor)
+
+    def worker_status(_):
+        busy = scheduler.running.get("train", 0)
+        workers = [
+            {"type": "train", "status": "busy" if i < busy else "idle"}
+            for i in range(2)
+        ]
+        return (200, {}, json.dumps({"data": workers}))
+
+    responses.add_callback(
+        responses.GET, HOST + "/v2/worker/status", callback=worker_status
+    )
+    started = []
+    jobs = [TimedJob("train%d" % i, "train", started) for i in range(5)]
+    jobs.append(TimedJob("upload", "upload", started))
+    try:
+        peaks = run_jobs(scheduler, jobs)
+    finally:
+        Context.HOST = Context.USERNAME = Context.PASSWORD = None
+
+    assert all(job.status == CoreStatus.DONE for job in jobs)
+    assert max(peak.get("train", 0) for peak in peaks) == 2
+    assert started[0] == "upload"
+    assert monitor.polls > 1
+
+
+class ScriptedMonitor(WorkerMonitor):
+    """Monitor fetching the next idle train workers of a script."""
+
+    def __init__(self, idle_trainers):
+        super().__init__(task_types=["train"])
+        self.idle_trainers = list(idle_trainers)
+        self.fetching = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+
+    def fetch(self):
+        self.fetching.set()
+        self.release.wait()
+        return {"train": self.idle_trainers.pop(0)}
+
+
+def test_reservations_are_reconciled_with_polls():
+    """Admit, poll, admit: a task is counted by the poll or its reservation."""
+    monitor = ScriptedMonitor([2, 1, 1])
+    monitor.refresh()
+    monitor.reserve("train")
+    assert monitor.capacity("train") == 1
+
+    # the status after the admission shows the busy worker
+    monitor.refresh()
+    assert monitor.capacity("train") == 1
+    monitor.reserve("train")
+    assert monitor.capacity("train") == 0
+
+    async def admit_while_polling():
+        monitor.release.clear()
+        monitor.fetching.clear()
+        poll = asyncio.ensure_future(monitor.poll())
+        await asyncio.get_event_loop().run_in_executor(None, monitor.fetching.wait)
+        # the status in flight doesn't show this task yet
+        monitor.reserve("train")
+        monitor.release.set()
+        await poll
+
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(admit_while_polling())
+    finally:
+        loop.close()
+    assert monitor.capacity("train") == 0
+    assert monitor.polls == 3
@@ -0,0 +1,150 @@
+# pylint: disable=redefined-outer-name
+"""Test related method and functionality of in-memory scoring."""
+import asyncio
+import json
+import threading
+
+import numpy as np
+import pandas as pd
+import pytest
+import responses
+
+from decanter.core import CoreClient
+from decanter.core.extra.micro_batch import MicroBatcher
+
+HOST = "http://core.test"
+
+
+@pytest.fixture
+def batches():
+    """Mock batch predict doubling feature x, recording each features list."""
+    sent = []
+
+    def batch_predict(request):
+        body = json.loads(request.body)
+        sent.append(body)
+        results = [
+            {
+                "index": i,
+                "predict_status": "success",
+                "result": {"prediction": row.get("x", 0) * 2},
+            }
+            for i, row in enumerate(body["featuresList"])
+        ]
+        # order of results isn't guaranteed
+        return 200, {}, json.dumps(results[::-1])
+
+    with responses.RequestsMock(assert_all_requests_are_fired=False) as mock:
+        mock.add(responses.GET, HOST + "/v2/worker/status", json={})
+        mock.add_callback(
+            responses.POST, HOST + "/v2/models/model-1/batch_predict", batch_predict
+        )
+        yield sent
+
+
+@pytest.fixture
+def client(batches):  # pylint: disable=unused-argument
+    """An isolated client of the mocked host."""
+    client_ = CoreClient(username="usr", password="pwd", host=HOST, isolated=True)
+    yield client_
+    client_.close()
+
+
+def test_concurrent_callers_share_batches(batches, client):
+    """Rows of concurrent callers are sent together and split back."""
+    scores = {}
+
+    def score(caller):
+        rows = [{"x": caller * 10 + i} for i in range(3)]
+        scores[caller] = client.score(
+            "model-1", rows, max_batch_size=12, max_latency=0.2
+        )
+
+    threads = [threading.Thread(target=score, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(batches) < 8
+    assert all(len(body["featuresList"]) <= 12 for body in batches)
+    for caller, frame in scores.items():
+        assert list(frame["prediction"]) == [(caller * 10 + i) * 2 for i in range(3)]
+        assert list(frame["predict_status"]) == ["success"] * 3
+
+
+def test_dataframe_rows_keep_index_and_drop_missing(batches, client):
+    """DataFrame rows are sent without NaN and scored under their index."""
+    rows = pd.DataFrame({"x": [1, np.nan], "y": ["a", "b"]}, index=[10, 11])
+
+    frame = asyncio.run(client.score_async("model-1", rows, threshold=0.3))
+
+    assert batches == [
+        {
+            "featuresList": [{"x": 1.0, "y": "a"}, {"y": "b"}],
+            "threshold": 0.3,
+            "timestamp_format": "yyyy-MM-dd HH:mm:ss",
+            "version": "v2",
+        }
+    ]
+    assert list(frame.index) == [10, 11]
+    assert list(frame["prediction"]) == [2, 0]
+
+
+def test_datetime_features_are_sent_as_timestamps(batches, client):
+    """Datetimes match the timestamp format, NumPy scalars become numbers."""
+    rows = pd.DataFrame(
+        {
+            "t": pd.to_datetime(["2020-01-01 08:30:00", None]),
+            "x": np.array([1, 2], dtype="int32"),
+            "flag": [True, False],
+        }
+    )
+
+    frame = client.score("model-1", rows)
+
+    assert batches[0]["featuresList"] == [
+        {"t": "2020-01-01 08:30:00", "x": 1, "flag": True},
+        {"x": 2, "flag": False},
+    ]
+    assert batches[0]["timestamp_format"] == "yyyy-MM-dd HH:mm:ss"
+    assert list(frame["prediction"]) == [2, 4]
+
+
+def test_batcher_splits_large_submissions_and_propagates_errors():
+    """Items over max_batch_size span batches, failures reach the callers."""
+    sizes = []
+
+    def double(items):
+        sizes.append(len(items))
+        if any(item < 0 for item in items):
+            raise ValueError("negative")
+        return [item * 2 for item in items]
+
+    batcher = MicroBatcher(double, max_batch_size=4, max_latency=0)
+    assert batcher.submit(range(10)).result(5) == [i * 2 for i in range(10)]
+    with pytest.raises(ValueError):
+        batcher.submit([-1]).result(5)
+    batcher.close()
+
+    assert max(sizes) <= 4 and batcher.items == 11
+    with pytest.raises(RuntimeError):
+        batcher.submit([1])
+
+
+@pytest.mark.parametrize(
+    "results",
+    [
+        [{"index": 0, "result": {}}],
+        [{"result": {}}, {"result": {}}],
+        [{"index": 0, "result": {}}, {"index": 0, "result": {}}],
+    ],
+)
+def test_results_must_match_rows_by_index(client, results):
+    """Results missing, without index or of other rows fail the scoring."""
+    with responses.RequestsMock() as mock:
+        mock.add(
+            responses.POST, HOST + "/v2/models/model-2/batch_predict", json=results
+        )
+        with pytest.raises(ValueError):
+            client.score("model-2", [{"x": 1}, {"x": 2}])
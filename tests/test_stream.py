@@ -0,0 +1,190 @@
+# pylint: disable=redefined-outer-name
+"""Test related method and functionality of streaming data."""
+from functools import partial
+
+import pandas as pd
+import pytest
+import responses
+from requests_toolbelt import MultipartEncoder
+
+from decanter.core import Context
+from decanter.core.core_api import CoreAPI
+from decanter.core.extra.stream import (
+    DataFrameCSVReader,
+    download_to_file,
+    merge_read_kwargs,
+    parse_content_range,
+    read_csv_stream,
+)
+
+HOST = "http://mobagel.test"
+DATA_ID = "4dataid"
+CSV = b"".join(b"%d,%d\n" % (i, i * i) for i in range(5000))
+
+
+@pytest.fixture
+def file_url():
+    """Point the Context at the fake host and return the data file url."""
+    Context.HOST = HOST
+    Context.USERNAME, Context.PASSWORD = "usr", "pwd"
+    yield HOST + "/v2/data/%s/file" % DATA_ID
+    Context.HOST = Context.USERNAME = Context.PASSWORD = None
+
+
+def ranged_file(request):
+    """Serve CSV, honoring the Range header."""
+    range_ = request.headers.get("Range")
+    if range_ is None:
+        return (200, {"Content-Length": str(len(CSV))}, CSV)
+    start = int(range_[len("bytes=") : -1])
+    if start >= len(CSV):
+        return (416, {}, b"")
+    headers = {
+        "Content-Length": str(len(CSV) - start),
+        "Content-Range": "bytes %d-%d/%d" % (start, len(CSV) - 1, len(CSV)),
+    }
+    return (206, headers, CSV[start:])
+
+
+@responses.activate
+def test_download_in_chunks(tmp_path, file_url):
+    """The file is written chunk by chunk and matches the response body."""
+    responses.add_callback(responses.GET, file_url, callback=ranged_file)
+    path = str(tmp_path / "data.csv")
+    get_file = partial(CoreAPI().get_data_file_by_id, DATA_ID, stream=True)
+
+    size = download_to_file(get_file, path, chunk_size=1024, progress=False)
+
+    assert size == len(CSV)
+    with open(path, "rb") as file:
+        assert file.read() == CSV
+
+
+@responses.activate
+def test_resume_partial_download(tmp_path, file_url):
+    """Only the missing bytes are requested when resuming."""
+    responses.add_callback(responses.GET, file_url, callback=ranged_file)
+    path = tmp_path / "data.csv"
+    path.write_bytes(CSV[:1000])
+    get_file = partial(CoreAPI().get_data_file_by_id, DATA_ID, stream=True)
+
+    size = download_to_file(get_file, str(path), resume=True, progress=False)
+
+    assert responses.calls[0].request.headers["Range"] == "bytes=1000-"
+    assert size == len(CSV)
+    assert path.read_bytes() == CSV
+
+    assert download_to_file(get_file, str(path), resume=True, progress=False) == len(
+        CSV
+    )
+    assert path.read_bytes() == CSV
+
+
+@responses.activate
+def test_resume_without_range_support(tmp_path, file_url):
+    """The whole file is downloaded again if the server ignores Range."""
+    responses.add(responses.GET, file_url, body=CSV, status=200)
+    path = tmp_path / "data.csv"
+    path.write_bytes(b"stale")
+    get_file = partial(CoreAPI().get_data_file_by_id, DATA_ID, stream=True)
+
+    download_to_file(get_file, str(path), resume=True, progress=False)
+
+    assert path.read_bytes() == CSV
+
+
+@responses.activate
+def test_resume_with_other_range(tmp_path, file_url):
+    """A range not starting at the partial file's end isn't appended."""
+
+    def other_range(request):
+        if "Range" not in request.headers:
+            return (200, {"Content-Length": str(len(CSV))}, CSV)
+        headers = {"Content-Range": "bytes 500-%d/%d" % (len(CSV) - 1, len(CSV))}
+        return (206, headers, CSV[500:])
+
+    responses.add_callback(responses.GET, file_url, callback=other_range)
+    path = tmp_path / "data.csv"
+    path.write_bytes(CSV[:1000])
+    get_file = partial(CoreAPI().get_data_file_by_id, DATA_ID, stream=True)
+
+    size = download_to_file(get_file, str(path), resume=True, progress=False)
+
+    assert size == len(CSV)
+    assert path.read_bytes() == CSV
+    assert [call.request.headers.get("Range") for call in responses.calls] == [
+        "bytes=1000-",
+        None,
+    ]
+    assert parse_content_range("bytes 0-9/*") == (0, 9, None)
+    assert parse_content_range("items 0-9/10") is None
+
+
+@responses.activate
+def test_read_csv_stream_chunks_with_schema(file_url):
+    """The csv is parsed from the stream in chunks with dtypes from schema."""
+    responses.add(responses.GET, file_url, body=b"a,b\n" + CSV, status=200)
+    schema = {
+        "columns": [
+            {"id": "a", "data_type": "categorical"},
+            {"id": "b", "data_type": "numerical"},
+        ]
+    }
+    get_file = partial(CoreAPI().get_data_file_by_id, DATA_ID, stream=True)
+
+    chunks = list(read_csv_stream(get_file, schema=schema, chunksize=2000))
+
+    assert [len(chunk) for chunk in chunks] == [2000, 2000, 1000]
+    assert str(chunks[0]["a"].dtype) == "category"
+    assert str(chunks[0]["b"].dtype) == "float64"
+    assert chunks[2]["b"].iloc[-1] == 4999 * 4999
+
+
+@responses.activate
+def test_read_csv_stream_kwargs_override_schema(file_url):
+    """The caller's dtype and parse_dates win over the schema's."""
+    body = b"a,b,c\n1,2,2021-01-01\n3,4,2021-01-02\n"
+    responses.add(responses.GET, file_url, body=body, status=200)
+    schema = {"a": "categorical", "b": "numerical", "c": "datetime"}
+    get_file = partial(CoreAPI().get_data_file_by_id, DATA_ID, stream=True)
+
+    df = read_csv_stream(get_file, schema=schema, dtype={"a": "int64", "c": str})
+
+    assert [str(dtype) for dtype in df.dtypes] == ["int64", "float64", "str"]
+    assert merge_read_kwargs(
+        {"dtype": {"a": "category"}, "parse_dates": ["c"]},
+        {"dtype": str, "parse_dates": False},
+    ) == {"dtype": str, "parse_dates": False}
+
+
+@pytest.mark.parametrize("chunk_rows", [1, 7, 5000, 100000])
+def test_dataframe_reader_matches_to_csv(chunk_rows):
+    """DataFrameCSVReader produces the same bytes as DataFrame.to_csv."""
+    df = pd.DataFrame({"a": range(5000), "b": ["x,y", "z"] * 2500})
+    expected = df.to_csv(index=False).encode("utf-8")
+    reader = DataFrameCSVReader(df, chunk_rows=chunk_rows)
+
+    assert len(reader) == len(expected)
+    data = reader.read(10) + reader.read(4096)
+    assert len(reader) == len(expected) - len(data)
+    data += reader.read()
+
+    assert data == expected
+    assert reader.read(10) == b""
+
+    spooled = DataFrameCSVReader(df, chunk_rows=chunk_rows)
+    assert b"".join(spooled.spool(max_size=1024)) == expected
+    assert len(spooled) == len(expected) and spooled.read() == expected
+    assert len(reader) == 0
+
+
+def test_dataframe_reader_in_multipart_upload():
+    """MultipartEncoder streams the reader without copying it whole."""
+    df = pd.DataFrame({"a": range(100), "b": range(100)})
+    reader = DataFrameCSVReader(df, name="df.csv", chunk_rows=30)
+    encoder = MultipartEncoder(fields={"csv": (reader.name, reader, "text/plain")})
+
+    body = encoder.to_string()
+
+    assert encoder.len == len(body)
+    assert df.to_csv(index=False).encode("utf-8") in body
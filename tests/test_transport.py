@@ -0,0 +1,96 @@
+# pylint: disable=redefined-outer-name
+"""Test related method and functionality of transport settings."""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+from urllib3.util.retry import Retry
+
+from decanter.core import Context
+from decanter.core.core_api import CoreAPI, TransportSettings
+from decanter.core.core_api.transport import create_session
+
+
+class SlowHandler(BaseHTTPRequestHandler):
+    """Answer after a short delay, keeping connections alive."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):  # pylint: disable=invalid-name
+        """Reply to any GET, or never if the path asks to be slow."""
+        if self.path.startswith("/slow"):
+            time.sleep(0.5)
+            self.close_connection = True
+            return
+        time.sleep(0.05)
+        body = b"{}"
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):  # pylint: disable=arguments-differ
+        pass
+
+
+@pytest.fixture
+def host():
+    """Run the slow server and point the Context at it."""
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), SlowHandler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    Context.HOST = "http://127.0.0.1:%d" % httpd.server_port
+    Context.USERNAME, Context.PASSWORD = "usr", "pwd"
+    yield "127.0.0.1:%d" % httpd.server_port
+    if Context.session is not None:
+        Context.session.close()
+    Context.session = None
+    Context.HOST = Context.USERNAME = Context.PASSWORD = None
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_requests_per_host_are_bounded_and_metered(host):
+    """Requests beyond max_per_host wait for a slot over pooled connections."""
+    Context.session = create_session(TransportSettings(pool_maxsize=3))
+    api = CoreAPI()
+
+    with ThreadPoolExecutor(max_workers=12) as executor:
+        resps = list(executor.map(lambda _: api.get_info(), range(12)))
+
+    metrics = Context.transport_metrics()[host]
+    assert all(resp.status_code == 200 for resp in resps)
+    assert metrics["requests"] == 12
+    assert metrics["max_in_flight"] == 3
+    assert metrics["in_flight"] == 0
+    assert metrics["waits"] > 0 and metrics["wait_time"] > 0
+    assert metrics["checkouts"] == 12
+    assert metrics["connections"] <= 3
+
+
+def test_read_timeout_and_keep_alive(host):
+    """The read timeout applies to requests sent without one."""
+    Context.session = create_session(
+        TransportSettings(
+            keep_alive=False, connect_timeout=1, read_timeout=0.1, max_retries=Retry(0)
+        )
+    )
+    assert Context.session.headers["Connection"] == "close"
+
+    with pytest.raises(Exception) as err:
+        CoreAPI().requests_(http="GET", url="/slow")
+    assert isinstance(err.value.args[0], requests.exceptions.ConnectionError)
+
+
+def test_per_call_timeout_overrides_default(host):
+    """A request's own timeout wins over the default of the transport."""
+    assert TransportSettings().timeout == (10, 300)
+    Context.session = create_session(TransportSettings(max_retries=Retry(0)))
+
+    with pytest.raises(Exception) as err:
+        CoreAPI(timeout=(1, 0.1)).requests_(http="GET", url="/slow")
+    assert isinstance(err.value.args[0], requests.exceptions.ConnectionError)
+    assert CoreAPI().requests_(http="GET", url="/info", timeout=5).status_code == 200
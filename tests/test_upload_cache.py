@@ -0,0 +1,151 @@
+# pylint: disable=redefined-outer-name
+"""Test related method and functionality of upload cache."""
+import asyncio
+import io
+import json
+
+import pandas as pd
+import pytest
+import responses
+
+from decanter.core import Context, CoreClient
+from decanter.core.extra.stream import DataFrameCSVReader
+from decanter.core.extra.upload_cache import UploadCache, content_hash
+from decanter.core.jobs import FixedPollPolicy
+
+HOST = "http://mobagel.test"
+DATA_ID = "4dataid"
+TASK_ID = "4uploadid"
+DF = pd.DataFrame({"a": range(1000), "b": ["x", "y"] * 500})
+OPTIONS = {"eda": True, "filename": "no_name"}
+
+
+@pytest.fixture
+def context():
+    """Set up the Context without checking the fake host."""
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    Context.HOST, Context.LOOP = HOST, loop
+    Context.USERNAME, Context.PASSWORD = "usr", "pwd"
+    Context.poll_policy = FixedPollPolicy(0)
+    yield
+    loop.close()
+    Context.JOBS, Context.CORO_TASKS = [], []
+    Context.HOST = Context.USERNAME = Context.PASSWORD = Context.LOOP = None
+    Context.poll_policy = None
+
+
+def add_upload_responses():
+    """Serve the upload, its task and the uploaded data."""
+    responses.add(responses.POST, HOST + "/v2/upload", json={"_id": TASK_ID})
+    responses.add(
+        responses.GET,
+        HOST + "/v2/tasks/%s" % TASK_ID,
+        json={
+            "_id": TASK_ID,
+            "status": "done",
+            "progress": 1,
+            "result": {"_id": DATA_ID},
+        },
+    )
+
+
+def test_content_hash_of_file_and_dataframe():
+    """A DataFrame hashes like its csv file and files are seeked back."""
+    csv = DF.to_csv(index=False).encode("utf-8")
+    file = io.BytesIO(csv)
+
+    assert content_hash(file, chunk_size=100) == content_hash(DataFrameCSVReader(DF))
+    assert file.tell() == 0
+    assert content_hash(io.BytesIO(csv + b"1,x\n")) != content_hash(file)
+
+
+def test_cache_persists_per_host(tmp_path):
+    """Entries are read back from disk and kept apart by host."""
+    path = str(tmp_path / "cache" / "upload.json")
+    UploadCache(path).put(HOST, "key", DATA_ID)
+
+    cache = UploadCache(path)
+    assert cache.get(HOST, "key") == DATA_ID
+    assert cache.get("http://other.test", "key") is None
+    cache.discard(HOST, "key")
+    assert UploadCache(path).get(HOST, "key") is None
+
+
+@responses.activate
+def test_users_of_a_host_keep_their_own_entries(context):
+    """Content uploaded by one user is uploaded again by another user."""
+    add_upload_responses()
+    cache = UploadCache(path=None)
+
+    CoreClient.upload(DF, cache=cache)
+    Context.run()
+    Context.USERNAME = "other"
+    CoreClient.upload(DF, cache=cache)
+    Context.run()
+
+    uploads = [call for call in responses.calls if call.request.method == "POST"]
+    assert len(uploads) == 2
+    assert len(cache) == 2
+    key = content_hash(DataFrameCSVReader(DF), options=OPTIONS)
+    assert cache.get(HOST, key, user="usr") == cache.get(HOST, key, user="other")
+    assert cache.get(HOST, key) is None
+
+
+@responses.activate
+def test_upload_once_then_hit(tmp_path, context):
+    """The second upload of the same content sends no bytes."""
+    add_upload_responses()
+    responses.add(responses.GET, HOST + "/data/%s" % DATA_ID, json={"_id": DATA_ID})
+    cache = UploadCache(str(tmp_path / "upload.json"))
+
+    first = CoreClient.upload(DF, cache=cache)
+    Context.run()
+    second = CoreClient.upload(DF.copy(), name="again", cache=cache)
+
+    assert first.id == second.id == DATA_ID
+    assert second.is_success() and second.name == "again"
+    uploads = [call for call in responses.calls if call.request.method == "POST"]
+    assert len(uploads) == 1
+    with open(str(tmp_path / "upload.json"), encoding="utf-8") as file:
+        assert json.load(file)[UploadCache.scope(HOST, "usr")]
+
+
+@responses.activate
+def test_stale_entry_is_uploaded_again(context):
+    """A cached id whose data is gone is dropped and uploaded again."""
+    add_upload_responses()
+    responses.add(responses.GET, HOST + "/data/gone", status=404)
+    cache = UploadCache(path=None)
+    key = content_hash(DataFrameCSVReader(DF), options=OPTIONS)
+    cache.put(HOST, key, "gone", user="usr")
+
+    data = CoreClient.upload(DF, cache=cache)
+    Context.run()
+
+    assert data.id == DATA_ID
+    assert cache.get(HOST, key, user="usr") == DATA_ID
+
+
+@responses.activate
+def test_options_are_part_of_the_key(context, monkeypatch):
+    """Other upload options miss the cache, DataFrames serialize once."""
+    add_upload_responses()
+    cache = UploadCache(path=None)
+    to_csv = pd.DataFrame.to_csv
+    calls = []
+
+    def count_to_csv(df, *args, **kwargs):
+        calls.append(len(df))
+        return to_csv(df, *args, **kwargs)
+
+    monkeypatch.setattr(pd.DataFrame, "to_csv", count_to_csv)
+    CoreClient.upload(DF, cache=cache, chunk_rows=400)
+    Context.run()
+    CoreClient.upload(DF, eda=False, cache=cache, chunk_rows=400)
+    Context.run()
+
+    uploads = [call for call in responses.calls if call.request.method == "POST"]
+    assert len(uploads) == 2 and uploads[1].request.url.endswith("?eda=true")
+    assert len(cache) == 2
+    assert calls == [400, 400, 200] * 2